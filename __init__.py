@@ -1,8 +1,18 @@
-from .civic_data import CivicDataTool
-from .grant_finder import GrantFinderTool
-from .impact_simulator import ImpactSimulatorTool
-from .timeline_builder import TimelineBuilderTool
-from .calendar_stub import CalendarTool
+"""
+Tool package. Tools are imported on first attribute access, so importing the
+package (or a module that imports one tool) does not pay for the others.
+"""
+
+from importlib import import_module
+from typing import Any, List
+
+_TOOLS = {
+    "CivicDataTool": ".civic_data",
+    "GrantFinderTool": ".grant_finder",
+    "ImpactSimulatorTool": ".impact_simulator",
+    "TimelineBuilderTool": ".timeline_builder",
+    "CalendarTool": ".calendar_stub",
+}
 
 __all__ = [
     "CivicDataTool",
@@ -12,3 +22,15 @@ __all__ = [
     "CalendarTool",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    module = _TOOLS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
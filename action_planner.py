@@ -12,6 +12,13 @@ from ..tools import ImpactSimulatorTool, TimelineBuilderTool
 
 class ActionPlannerAgent(BaseAgent):
     name = "action-planner"
+    inputs = (
+        "persona.initiative",
+        "persona.scale",
+        "policy_summary",
+        "grants",
+        "funding_summary",
+    )
 
     def __init__(self, impact_tool: ImpactSimulatorTool, timeline_tool: TimelineBuilderTool):
         self.impact_tool = impact_tool
@@ -4,14 +4,20 @@ Base agent class providing common utilities.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from ..config import ConciergeConfig
+from ..deadline import Deadline, DeadlineExceeded
 from ..memory import LongTermMemory, SessionMemory
 from ..observability.logger import log_event
-from ..observability.metrics import MetricsRegistry
+from ..observability.metrics import LATENCY_BUCKETS, MetricsRegistry
+from ..observability.profiling import RunProfiler
 from ..observability.tracer import TraceRecorder
 
 
@@ -24,6 +30,8 @@ class AgentContext:
     tracer: TraceRecorder
     logger: Any
     llm: "LLMClient"
+    profiler: Optional[RunProfiler] = None
+    deadline: Optional[Deadline] = None
 
 
 @dataclass
@@ -35,11 +43,68 @@ class AgentResult:
 
 class BaseAgent:
     name: str = "base-agent"
+    # State paths (``"persona.city"``) the agent reads; used to fingerprint its
+    # inputs so unchanged agents can be skipped when re-planning a session.
+    inputs: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "run" in cls.__dict__:
+            cls.run = _instrument_run(cls.__dict__["run"])  # type: ignore[method-assign]
 
     def run(self, context: AgentContext, state: Dict[str, Any]) -> AgentResult:
         raise NotImplementedError
 
+    def input_fingerprint(self, state: Dict[str, Any]) -> Optional[str]:
+        if not self.inputs:
+            return None
+        selected = {path: _lookup(state, path) for path in self.inputs}
+        payload = json.dumps(selected, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     def _log(self, context: AgentContext, message: str, **kwargs) -> None:
         log_event(context.logger, f"[{self.name}] {message}", context=kwargs)
         context.tracer.record(self.name, message, kwargs)
 
+
+def _lookup(state: Dict[str, Any], path: str) -> Any:
+    value: Any = state
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _instrument_run(run: Callable[..., AgentResult]) -> Callable[..., AgentResult]:
+    """Trace ``run`` as an agent span and record its latency and outcome."""
+
+    @functools.wraps(run)
+    def wrapper(self: BaseAgent, context: AgentContext, state: Dict[str, Any]) -> AgentResult:
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            with context.tracer.span(self.name, kind="agent") as span:
+                if context.profiler is None:
+                    return run(self, context, state)
+                with context.profiler.section(self.name, span):
+                    return run(self, context, state)
+        except DeadlineExceeded:
+            outcome = "deadline"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            context.metrics.histogram(
+                "agent_run_seconds",
+                "Agent run latency in seconds",
+                LATENCY_BUCKETS,
+                labelnames=("agent", "outcome"),
+            ).labels(agent=self.name, outcome=outcome).observe(elapsed)
+            context.metrics.counter(
+                "agent_runs_total", "Number of agent runs", labelnames=("agent", "outcome")
+            ).labels(agent=self.name, outcome=outcome).inc()
+
+    return wrapper
@@ -0,0 +1,90 @@
+"""
+Cold-start import budget for the orchestrator.
+
+Each repeat imports the target module in a fresh interpreter under
+``python -X importtime`` and keeps the fastest run. The report has the
+total import time, the slowest top-level imports, and any forbidden modules
+that were loaded. Heavy dependencies (pandas, numpy and the Gemini SDK) must
+stay off the import path: they load on first use or in
+``ClimateConciergeOrchestrator.warmup()``. The command exits non-zero when
+the budget is exceeded or a forbidden module was imported::
+
+    python -m projects.climate_concierge.benchmarks.bench_import --budget-ms 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+TARGET = "projects.climate_concierge.src.orchestrator"
+FORBIDDEN = ("pandas", "numpy", "google.generativeai")
+
+
+def _import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for each import, in ``-X importtime`` order."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module: str = TARGET, repeats: int = 5, top: int = 10) -> Dict[str, Any]:
+    best: List[Tuple[str, int, int]] = []
+    for _ in range(repeats):
+        rows = _import_times(module)
+        if not best or rows[-1][2] < best[-1][2]:
+            best = rows
+    # Direct imports of the target are nested one level (two spaces) below it.
+    depth = len(best[-1][0]) - len(best[-1][0].lstrip()) + 2
+    direct = [
+        (name.strip(), cumulative)
+        for name, _, cumulative in best
+        if len(name) - len(name.lstrip()) == depth
+    ]
+    loaded = {name.strip() for name, _, _ in best}
+    return {
+        "module": module,
+        "total_ms": round(best[-1][2] / 1000, 2),
+        "slowest": [
+            {"module": name, "cumulative_ms": round(us / 1000, 2)}
+            for name, us in sorted(direct, key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "forbidden": sorted(name for name in FORBIDDEN if name in loaded),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure orchestrator cold-start import time")
+    parser.add_argument("--module", default=TARGET)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail above this import time")
+    args = parser.parse_args()
+
+    report = measure(args.module, args.repeats, args.top)
+    print(json.dumps(report, indent=2))
+    problems = []
+    if report["forbidden"]:
+        problems.append(f"forbidden modules imported: {', '.join(report['forbidden'])}")
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        problems.append(f"import took {report['total_ms']}ms (budget {args.budget_ms}ms)")
+    if problems:
+        print("\n".join(problems), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
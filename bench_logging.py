@@ -0,0 +1,69 @@
+"""
+Per-call overhead of the structured logger in sync and async modes.
+
+Run with ``python -m projects.climate_concierge.benchmarks.bench_logging``;
+prints a JSON report of nanoseconds per ``log_event`` call on the calling
+thread, plus how long the async listener took to drain its queue.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from projects.climate_concierge.src.observability.logger import (
+    get_logger,
+    log_event,
+    logging_stats,
+    stop_async_logging,
+)
+
+CONTEXT = {
+    "run_id": "0123456789ab",
+    "state": {"city": "Oakland", "state": "CA", "initiative": "Solarize the community center roof"},
+}
+WARMUP = 1_000
+
+
+def _measure(logger: logging.Logger, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        log_event(logger, "[community-liaison] Collecting organizer intent", context=CONTEXT)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def run(calls: int) -> Dict[str, object]:
+    report: Dict[str, object] = {"calls": calls}
+    modes: Dict[str, Dict[str, Any]] = {
+        "sync": {"async_mode": False},
+        # Queue sized to hold every record: measures pure hand-off cost.
+        "async": {"async_mode": True, "queue_size": calls + WARMUP},
+        # Undersized queue: shows the drop policy shedding records.
+        "async_drop": {"async_mode": True, "queue_size": 1_000, "overflow": "drop"},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, kwargs in modes.items():
+            logger = get_logger(f"bench-{mode}", Path(tmp) / f"{mode}.log", False, **kwargs)
+            _measure(logger, WARMUP)
+            report[f"{mode}_ns_per_call"] = round(_measure(logger, calls), 1)
+        drain_start = time.perf_counter()
+        stop_async_logging()
+        report["async_drain_seconds"] = round(time.perf_counter() - drain_start, 3)
+        report["queues"] = {key.split(":", 1)[0]: value for key, value in logging_stats().items()}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark structured logging overhead")
+    parser.add_argument("--calls", type=int, default=50_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.calls), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Per-worker memory of the pre-fork server, with and without preloading.
+
+Both modes serve the same synthetic dataset with a fast ``FakeGenerativeModel``.
+After a burst of requests has warmed every worker, the benchmark reads each
+process's ``/proc/<pid>/smaps_rollup``. ``private_mb`` is the memory a worker
+does not share with anyone; it is the cost of adding one more worker.
+``total_pss_mb`` is the proportional footprint of the master plus all
+workers. Linux only::
+
+    python -m projects.climate_concierge.benchmarks.bench_prefork --size medium --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
+
+from projects.climate_concierge.src.config import load_config
+from projects.climate_concierge.src.fake_llm import FakeGenerativeModel
+from projects.climate_concierge.src.prefork import PreforkServer, process_memory
+
+from .synthetic_data import PRESETS, city_names, generate
+
+
+def _mb(kb: float) -> float:
+    return round(kb / 1024, 1)
+
+
+def measure(
+    *, preload: bool, workers: int, requests: int, data_dir: Path, size: str, workdir: Path
+) -> Dict[str, Any]:
+    os.environ.setdefault("ALLOW_STUB_LLM", "true")
+    config = load_config()
+    civic_path, grants_path = generate(data_dir / size, PRESETS[size])
+    config.tools.civic_data_path = civic_path
+    config.tools.grant_catalog_path = grants_path
+    config.observability.logs_path = workdir / "logs"
+    config.observability.traces_path = workdir / "traces.jsonl"
+    config.observability.metrics_path = workdir / "latest.prom"
+    config.observability.enable_console_logs = False
+    config.memory.long_term_path = workdir / "memory.json"
+    config.memory.plan_store_path = workdir / "plans.db"
+    config.memory.run_dedup_window_seconds = 0
+
+    backend = FakeGenerativeModel(median_ms=1, sigma=0.1, seed=0)
+    server = PreforkServer(
+        config, workers=workers, host="127.0.0.1", port=0, preload=preload, llm_backend=backend
+    ).start()
+    cities = city_names(PRESETS[size].cities)
+    url = "http://%s:%s/generate" % server.address
+
+    def one(index: int) -> None:
+        city, state = cities[index % len(cities)]
+        body = json.dumps({"city": city, "state": state, "initiative": "Plant shade trees"})
+        request = urllib.request.Request(url, data=body.encode("utf-8"))
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            list(pool.map(one, range(requests)))
+        per_worker = list(server.worker_memory().values())
+        master = process_memory()
+    finally:
+        server.stop()
+
+    def mean(key: str) -> float:
+        return _mb(sum(usage.get(key, 0) for usage in per_worker) / max(1, len(per_worker)))
+
+    private = [
+        usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0) for usage in per_worker
+    ]
+    return {
+        "preload": preload,
+        "workers": workers,
+        "worker_rss_mb": mean("Rss"),
+        "worker_pss_mb": mean("Pss"),
+        "worker_private_mb": _mb(sum(private) / max(1, len(private))),
+        "total_pss_mb": _mb(
+            master.get("Pss", 0) + sum(usage.get("Pss", 0) for usage in per_worker)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare pre-fork worker memory with and without preload"
+    )
+    parser.add_argument("--size", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--data-dir", type=Path, default=Path(".bench_data"))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = []
+    for preload in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            results.append(
+                measure(
+                    preload=preload,
+                    workers=args.workers,
+                    requests=args.requests,
+                    data_dir=args.data_dir,
+                    size=args.size,
+                    workdir=Path(tmp),
+                )
+            )
+    baseline, preloaded = results
+    report = {
+        "size": args.size,
+        "modes": results,
+        "private_mb_saved_per_worker": round(
+            baseline["worker_private_mb"] - preloaded["worker_private_mb"], 1
+        ),
+        "total_pss_mb_saved": round(baseline["total_pss_mb"] - preloaded["total_pss_mb"], 1),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
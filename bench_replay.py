@@ -0,0 +1,92 @@
+"""
+End-to-end orchestrator latency against a recorded LLM cassette.
+
+Record a cassette once (``LLM_CASSETTE_MODE=record`` with a real
+``GEMINI_API_KEY``), then run
+``python -m projects.climate_concierge.benchmarks.bench_replay --cassette PATH``.
+Runs are served offline from the cassette with latency drawn from the recorded
+distribution, so results are reproducible without network access.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from projects.climate_concierge.src.config import load_config
+from projects.climate_concierge.src.orchestrator import ClimateConciergeOrchestrator
+
+REQUEST: Dict[str, Any] = dict(
+    organizer="Neighborhood Climate Team",
+    city="Oakland",
+    state="CA",
+    initiative="Solarize the community center roof",
+    scale="Pilot",
+    community_profile="Frontline neighborhood seeking resilient infrastructure upgrades.",
+)
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(cassette: Path, runs: int, latency: str, scale: float) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            LLM_CASSETTE_MODE="replay",
+            LLM_CASSETTE_PATH=str(cassette),
+            LLM_CASSETTE_LATENCY=latency,
+            LLM_CASSETTE_LATENCY_SCALE=str(scale),
+        )
+        config = load_config()
+        config.observability.logs_path = Path(tmp) / "logs"
+        config.observability.traces_path = Path(tmp) / "traces.jsonl"
+        config.observability.metrics_path = Path(tmp) / "latest.prom"
+        config.observability.enable_console_logs = False
+        config.memory.long_term_path = Path(tmp) / "memory.json"
+        config.memory.plan_store_path = Path(tmp) / "plans.db"
+        config.memory.run_dedup_window_seconds = 0
+        orchestrator = ClimateConciergeOrchestrator(config)
+        replay = orchestrator.llm_client.cassette
+        if replay is None:
+            raise RuntimeError("LLM_CASSETTE_MODE=replay did not load a cassette")
+        durations = []
+        try:
+            for _ in range(runs):
+                start = time.perf_counter()
+                orchestrator.run(**REQUEST)
+                durations.append(time.perf_counter() - start)
+        finally:
+            orchestrator.close()
+        return {
+            "runs": runs,
+            "latency": latency,
+            "mean_seconds": round(statistics.fmean(durations), 4),
+            "p50_seconds": round(_percentile(durations, 0.50), 4),
+            "p95_seconds": round(_percentile(durations, 0.95), 4),
+            "cassette_hits": replay.hits,
+            "cassette_misses": replay.misses,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark orchestrator runs from an LLM cassette")
+    parser.add_argument("--cassette", type=Path, required=True)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--latency", choices=("none", "recorded", "distribution"), default="distribution"
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply injected latencies")
+    args = parser.parse_args()
+    print(json.dumps(run(args.cassette, args.runs, args.latency, args.scale), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Microbenchmarks for the tools layer across synthetic dataset sizes.
+
+For each size preset the suite measures the following, using data from
+``synthetic_data``:
+- ``CivicDataTool`` and ``GrantFinderTool``: load time, traced peak memory
+  during load, and per-query latency
+- ``ImpactSimulatorTool``, ``TimelineBuilderTool`` and ``CalendarTool``:
+  per-call latency
+
+With ``--baseline`` the run exits non-zero when any latency or memory metric
+regresses by more than ``--tolerance`` against the earlier report::
+
+    python -m projects.climate_concierge.benchmarks.bench_tools --sizes small medium \\
+        --output tools.json --baseline previous.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from projects.climate_concierge.src.tools import (
+    CalendarTool,
+    CivicDataTool,
+    GrantFinderTool,
+    ImpactSimulatorTool,
+    TimelineBuilderTool,
+)
+
+from .synthetic_data import GRANT_TAGS, PRESETS, city_names, generate
+
+# Differences below this many milliseconds are treated as timer noise.
+MIN_DELTA_MS = 0.05
+INITIATIVES = ["Solarize the community center roof", "Plant shade trees", "E-bike lending library"]
+
+
+def _latencies_ms(func: Callable[[], Any], calls: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+    }
+
+
+def _load(factory: Callable[[], Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    tool = factory()
+    load_ms = (time.perf_counter() - start) * 1000
+    del tool
+    # Measure memory in a second load so tracemalloc overhead doesn't skew timing.
+    tracemalloc.start()
+    tool = factory()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"tool": tool, "load_ms": round(load_ms, 2), "peak_mb": round(peak / 2**20, 2)}
+
+
+def bench_size(
+    name: str, data_dir: Path, queries: int, seed: int = 0
+) -> Dict[str, Dict[str, float]]:
+    size = PRESETS[name]
+    civic_path, grants_path = generate(data_dir / name, size, seed)
+    rng = random.Random(seed)
+    cities = city_names(size.cities, seed)
+    results: Dict[str, Dict[str, float]] = {}
+
+    civic = _load(lambda: CivicDataTool(civic_path))
+    civic_tool = civic.pop("tool")
+
+    def civic_query() -> None:
+        city, state = rng.choice(cities)
+        civic_tool.city_profile(city, state)
+
+    results["civic_data"] = {**civic, **_latencies_ms(civic_query, queries)}
+
+    grants = _load(lambda: GrantFinderTool(grants_path))
+    grant_tool = grants.pop("tool")
+
+    def grant_query() -> None:
+        _, state = rng.choice(cities)
+        grant_tool.search(city="", state=state, keywords=rng.sample(GRANT_TAGS, 2))
+
+    def grant_miss() -> None:
+        # Unknown keyword: the worst case, a full catalog scan with no early exit.
+        grant_tool.search(city="", state="CA", keywords=["no-such-tag"])
+
+    results["grant_finder"] = {
+        **grants,
+        **_latencies_ms(grant_query, queries),
+        **{f"miss_{k}": v for k, v in _latencies_ms(grant_miss, max(1, queries // 10)).items()},
+    }
+
+    impact, timeline, calendar = ImpactSimulatorTool(), TimelineBuilderTool(), CalendarTool()
+    results["impact_simulator"] = _latencies_ms(
+        lambda: impact.estimate(rng.choice(INITIATIVES), rng.choice(["Pilot", "Large"])), queries
+    )
+    results["timeline_builder"] = _latencies_ms(
+        lambda: timeline.build(rng.choice(INITIATIVES)), queries
+    )
+    milestones = timeline.build(INITIATIVES[0])
+    results["calendar"] = _latencies_ms(
+        lambda: calendar.create_events(milestones, "Oakland"), queries
+    )
+    return results
+
+
+def regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics that got slower (or bigger) than ``baseline`` by more than ``tolerance``."""
+    found = []
+    for size, tools in report["sizes"].items():
+        for tool, metrics in tools.items():
+            previous = baseline.get("sizes", {}).get(size, {}).get(tool, {})
+            for metric, value in metrics.items():
+                old = previous.get(metric)
+                if old is None:
+                    continue
+                if metric.endswith("_ms") and value - old < MIN_DELTA_MS:
+                    continue
+                if value > old * (1 + tolerance):
+                    found.append(f"{size}/{tool}/{metric}: {old} -> {value}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the tools layer on synthetic data")
+    parser.add_argument("--sizes", nargs="+", choices=sorted(PRESETS), default=["small", "medium"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--data-dir", type=Path, default=Path(".bench_data"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, help="Fail on regressions against this report")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    report = {
+        "queries": args.queries,
+        "sizes": {
+            size: bench_size(size, args.data_dir, args.queries, args.seed) for size in args.sizes
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        found = regressions(report, baseline, args.tolerance)
+        if found:
+            print("Regressions beyond tolerance:\n  " + "\n  ".join(found), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Calibrate the evaluation pre-scorer on the LLM scores stored in memory.
+
+Fits ``PreScorer`` to the ``evaluations`` list and saves it in the memory bank,
+where ``EvaluatorAgent`` picks it up. The report lists the leave-one-out
+RMSE per rubric dimension and the share of the calibration plans that would
+skip the LLM at ``EVAL_PRESCORE_MAX_ERROR``::
+
+    python -m projects.climate_concierge.src.evaluation.calibrate --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from ..config import load_config
+from ..memory import LongTermMemory
+from .prescorer import MEMORY_KEY, PreScorer, calibration_records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Calibrate the evaluation pre-scorer on stored LLM scores"
+    )
+    parser.add_argument("--min-samples", type=int, help="Default EVAL_PRESCORE_MIN_SAMPLES")
+    parser.add_argument(
+        "--ridge", type=float, default=1.0, help="L2 penalty on standardized features"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without saving the calibration"
+    )
+    args = parser.parse_args()
+
+    config = load_config()
+    memory = LongTermMemory(config.memory.long_term_path)
+    evaluations = memory.list("evaluations")
+    records = calibration_records(evaluations)
+    min_samples = args.min_samples or config.evaluation.prescore_min_samples
+    if len(records) < min_samples:
+        sys.exit(
+            f"Only {len(records)} of {len(evaluations)} evaluations are usable; "
+            f"need {min_samples}."
+        )
+    scorer = PreScorer.calibrate(records, ridge=args.ridge)
+    max_error = config.evaluation.prescore_max_error
+    confident = [scorer.predict(record["features"]).max_error <= max_error for record in records]
+    if not args.dry_run:
+        memory.set(MEMORY_KEY, scorer.to_dict())
+    report = {
+        "samples": scorer.samples,
+        "loo_rmse": {dimension: round(value, 3) for dimension, value in scorer.rmse.items()},
+        "max_error": max_error,
+        "expected_skip_rate": round(sum(confident) / len(confident), 3),
+        "saved": not args.dry_run,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,53 @@ Civic data tool: loads sample emissions dataset and returns summaries.
 
 from __future__ import annotations
 
-import pandas as pd
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class CivicDataTool:
     def __init__(self, csv_path):
-        self.df = pd.read_csv(csv_path)
+        self.csv_path = csv_path
+        self._df = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    @property
+    def df(self) -> "pd.DataFrame":
+        """The dataset, read (and pandas imported) on first use."""
+        if self._df is None:
+            with self._lock:
+                if self._df is None:
+                    import pandas as pd
+
+                    self._df = pd.read_csv(self.csv_path)
+        return self._df
+
+    @property
+    def dataset_version(self) -> str:
+        """Content hash of the CSV; changes whenever the dataset does."""
+        if self._version is None:
+            digest = hashlib.sha256()
+            with open(self.csv_path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._version = digest.hexdigest()[:12]
+        return self._version
+
+    def load(self) -> "CivicDataTool":
+        self.df
+        self.dataset_version
+        return self
+
+    def city_profiles(self) -> Iterator[dict]:
+        """``city_profile`` of every (city, state) in the dataset, in one pass."""
+        columns = ["sector", "metric", "unit", "value", "year"]
+        for (city, state), subset in self.df.groupby(["city", "state"], sort=False):
+            yield {"city": city, "state": state, "metrics": subset[columns].to_dict("records")}
 
     def city_profile(self, city: str, state: str) -> dict:
         subset = self.df[(self.df["city"].str.lower() == city.lower()) & (self.df["state"].str.upper() == state.upper())]
@@ -30,6 +30,18 @@ def main() -> None:
         default=False,
         help="Enable rule-based fallback instead of Gemini",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Capture cProfile/tracemalloc artifacts for this run",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Run deadline in seconds; agents past it are skipped and the plan is marked partial",
+    )
     args = parser.parse_args()
 
     if args.allow_stub_llm:
@@ -37,17 +49,28 @@ def main() -> None:
 
     config = load_config()
     orchestrator = ClimateConciergeOrchestrator(config)
-    result = orchestrator.run(
-        organizer=args.organizer,
-        city=args.city,
-        state=args.state,
-        initiative=args.initiative,
-        scale=args.scale,
-        community_profile=args.community_profile,
-    )
+    try:
+        result = orchestrator.run(
+            organizer=args.organizer,
+            city=args.city,
+            state=args.state,
+            initiative=args.initiative,
+            scale=args.scale,
+            community_profile=args.community_profile,
+            profile=args.profile or None,
+            timeout=args.timeout,
+        )
+    finally:
+        orchestrator.close()
 
     print(f"\n✅ Run completed. Run ID: {result.run_id}")
-    print(f"Plan saved to: {result.artifact_path}")
+    print(f"Plan stored in: {result.plan_store_path} (run ID {result.run_id})")
+    partial = result.plan.get("partial")
+    if partial:
+        skipped = ", ".join(partial["skipped_agents"]) or "none"
+        print(f"⚠️ Partial plan ({partial['reason']}); skipped agents: {skipped}")
+    if "profile" in result.plan:
+        print(f"Profile saved to: {result.plan['profile']['dir']}")
 
     highlights = {
         "Impact": result.plan.get("impact"),
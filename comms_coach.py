@@ -12,6 +12,7 @@ from ..tools import CalendarTool
 
 class CommunicationsCoachAgent(BaseAgent):
     name = "communications-coach"
+    inputs = ("persona.city", "persona.initiative", "timeline", "plan_text")
 
     def __init__(self, calendar_tool: CalendarTool):
         self.calendar_tool = calendar_tool
@@ -6,18 +6,47 @@ Handles environment variable parsing, default paths, and model selection.
 
 from __future__ import annotations
 
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
+# Created on first write by whichever sink needs it; importing config has no side effects.
 RUN_ARTIFACTS_DIR = PROJECT_ROOT / "run_artifacts"
-RUN_ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
-(RUN_ARTIFACTS_DIR / "logs").mkdir(exist_ok=True)
-(RUN_ARTIFACTS_DIR / "metrics").mkdir(exist_ok=True)
-(RUN_ARTIFACTS_DIR / "plans").mkdir(exist_ok=True)
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationProfile:
+    """
+    Model and generation limits for one agent's LLM calls; ``None`` inherits
+    from ``ModelConfig``.
+    """
+
+    model_name: Optional[str] = None
+    temperature: Optional[float] = None
+    max_output_tokens: Optional[int] = None
+    stop_sequences: Tuple[str, ...] = ()
+
+    def generation_config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = {
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_output_tokens,
+        }
+        if self.stop_sequences:
+            config["stop_sequences"] = list(self.stop_sequences)
+        return config
+
+
+def _default_agent_profiles() -> Dict[str, GenerationProfile]:
+    # Extraction-style calls: only a few bullets or one JSON object are used downstream.
+    return {
+        "policy-researcher": GenerationProfile(max_output_tokens=512),
+        "funding-scout": GenerationProfile(max_output_tokens=512),
+        "plan-evaluator": GenerationProfile(max_output_tokens=256, temperature=0.0),
+    }
 
 
 @dataclass(slots=True)
@@ -27,6 +56,32 @@ class ModelConfig:
     model_name: str = "models/gemini-1.5-flash"
     temperature: float = 0.2
     max_output_tokens: int = 2048
+    # Per-agent overrides keyed by agent name (e.g. "plan-evaluator").
+    agent_profiles: Dict[str, GenerationProfile] = field(default_factory=_default_agent_profiles)
+    input_cost_per_million_tokens: float = 0.075  # USD, used for run cost accounting
+    output_cost_per_million_tokens: float = 0.30
+    run_token_budget: Optional[int] = None  # prompt + output tokens per run
+    token_budget_policy: str = "degrade"  # degrade (stub responses) | abort
+    run_timeout_seconds: Optional[float] = None  # per-run deadline; later agents are skipped
+    llm_timeout_seconds: Optional[float] = 60.0  # per-call cap, further cut by the run deadline
+    batch_agents: Tuple[str, ...] = ()  # agents whose prompts are micro-batched across runs
+    batch_window_ms: float = 25.0  # how long a batch waits for more prompts
+    batch_max_items: int = 8
+    cassette_mode: str = "off"  # off | record | replay
+    cassette_path: Path = RUN_ARTIFACTS_DIR / "cassettes" / "llm.jsonl.gz"
+    cassette_latency: str = "none"  # none | recorded | distribution (replay only)
+    cassette_latency_scale: float = 1.0
+    cassette_strict: bool = False  # replay: fail on unrecorded prompts instead of reusing
+
+    def profile_for(self, agent: str) -> GenerationProfile:
+        """The agent's profile with unset fields filled from the defaults above."""
+        override = self.agent_profiles.get(agent, GenerationProfile())
+        return GenerationProfile(
+            model_name=override.model_name or self.model_name,
+            temperature=self.temperature if override.temperature is None else override.temperature,
+            max_output_tokens=override.max_output_tokens or self.max_output_tokens,
+            stop_sequences=override.stop_sequences,
+        )
 
 
 @dataclass(slots=True)
@@ -38,6 +93,21 @@ class ObservabilityConfig:
     metrics_path: Path = RUN_ARTIFACTS_DIR / "metrics" / "latest.prom"
     enable_console_logs: bool = True
     log_level: str = "INFO"
+    async_logging: bool = False
+    log_queue_size: int = 10_000
+    log_overflow_policy: str = "block"  # block | drop
+    metrics_host: str = "127.0.0.1"
+    metrics_port: Optional[int] = None  # serve /metrics when set
+    metrics_export_interval_seconds: float = 0.0  # 0 writes metrics_path only on close()
+    trace_buffer_size: int = 10_000
+    trace_export_interval_seconds: float = 1.0  # 0 writes traces only on close()
+    trace_sample_rate: float = 1.0  # head-sampling probability per run
+    tail_sample_slow_run_ms: Optional[float] = 10_000.0  # always keep slower runs
+    log_payload_max_chars: Optional[int] = 2_000
+    profile_sample_rate: float = 0.0  # fraction of runs profiled; run(profile=True) forces it
+    profile_cpu: bool = True
+    profile_memory: bool = True
+    profile_top_n: int = 25
 
 
 @dataclass(slots=True)
@@ -45,7 +115,19 @@ class MemoryConfig:
     """Configuration for session and long-term memory persistence."""
 
     long_term_path: Path = RUN_ARTIFACTS_DIR / "memory_bank.json"
+    policy_cache_path: Path = RUN_ARTIFACTS_DIR / "policy_summaries.json"
+    plan_store_path: Path = RUN_ARTIFACTS_DIR / "plans.db"
+    plan_store_write_behind: bool = True
+    plan_store_queue_size: int = 1000
     session_ttl_minutes: int = 1440  # 24h default
+    session_max_entries: Optional[int] = 10_000
+    session_max_bytes: Optional[int] = 256 * 1024 * 1024
+    session_backend: str = "memory"  # memory | socket | redis
+    session_backend_url: Optional[str] = None
+    plan_reuse: bool = False
+    plan_reuse_similarity: float = 0.9
+    plan_reuse_min_score: float = 4.0
+    run_dedup_window_seconds: float = 0.0  # opt in; 0 disables deduplication
 
 
 @dataclass(slots=True)
@@ -58,14 +140,42 @@ class ToolConfig:
     use_live_search: bool = False
 
 
+@dataclass(slots=True)
+class EvaluationConfig:
+    """Settings for the rubric evaluator and its heuristic pre-scorer."""
+
+    prescore: bool = False  # skip the LLM when the calibrated pre-scorer is confident
+    prescore_max_error: float = 0.5  # largest expected per-dimension error that counts as confident
+    prescore_min_samples: int = 30  # LLM-scored evaluations a calibration must be fit on
+    prescore_audit_rate: float = 0.05  # share of confident plans still sent to the LLM
+
+
+@dataclass(slots=True)
+class ServerConfig:
+    """Configuration for the HTTP service and its pre-fork workers."""
+
+    host: str = "0.0.0.0"
+    port: int = 8080
+    workers: int = 2
+    preload: bool = True  # load datasets and indexes once in the master, shared copy-on-write
+    max_in_flight: int = 8  # concurrent runs per process
+    max_queue: int = 16  # requests waiting for a run slot; beyond this, 429
+    queue_timeout_seconds: float = 10.0  # longest wait for a slot before 503
+    request_timeout_seconds: float = 120.0  # default and maximum per-request deadline (504)
+    retry_after_seconds: int = 2
+    drain_timeout_seconds: float = 30.0  # on SIGTERM, wait this long for in-flight runs
+
+
 @dataclass(slots=True)
 class ConciergeConfig:
     """Aggregate configuration object shared across the orchestrator."""
 
-    model: ModelConfig = ModelConfig()
-    observability: ObservabilityConfig = ObservabilityConfig()
-    memory: MemoryConfig = MemoryConfig()
-    tools: ToolConfig = ToolConfig()
+    model: ModelConfig = field(default_factory=ModelConfig)
+    observability: ObservabilityConfig = field(default_factory=ObservabilityConfig)
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
+    tools: ToolConfig = field(default_factory=ToolConfig)
+    evaluation: EvaluationConfig = field(default_factory=EvaluationConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
     allow_stub_llm: bool = False
 
     @property
@@ -79,39 +189,223 @@ class ConciergeConfig:
 
 def load_config() -> ConciergeConfig:
     """Factory to produce a fully-populated configuration instance."""
+    # Slotted dataclasses drop class-level defaults, so read them off instances.
+    defaults = ConciergeConfig()
     model = ModelConfig(
-        model_name=os.getenv("GEMINI_MODEL_NAME", ModelConfig.model_name),
-        temperature=float(os.getenv("GEMINI_TEMPERATURE", ModelConfig.temperature)),
-        max_output_tokens=int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", ModelConfig.max_output_tokens)),
+        model_name=os.getenv("GEMINI_MODEL_NAME", defaults.model.model_name),
+        temperature=float(os.getenv("GEMINI_TEMPERATURE", defaults.model.temperature)),
+        max_output_tokens=int(
+            os.getenv("GEMINI_MAX_OUTPUT_TOKENS", defaults.model.max_output_tokens)
+        ),
+        agent_profiles=_agent_profiles(
+            os.getenv("GEMINI_AGENT_PROFILES"), defaults.model.agent_profiles
+        ),
+        input_cost_per_million_tokens=float(
+            os.getenv("GEMINI_INPUT_COST_PER_MTOK", defaults.model.input_cost_per_million_tokens)
+        ),
+        output_cost_per_million_tokens=float(
+            os.getenv("GEMINI_OUTPUT_COST_PER_MTOK", defaults.model.output_cost_per_million_tokens)
+        ),
+        run_token_budget=_optional_int(
+            os.getenv("RUN_TOKEN_BUDGET"), defaults.model.run_token_budget
+        ),
+        token_budget_policy=os.getenv("TOKEN_BUDGET_POLICY", defaults.model.token_budget_policy),
+        run_timeout_seconds=_optional_float(
+            os.getenv("RUN_TIMEOUT_SECONDS"), defaults.model.run_timeout_seconds
+        ),
+        llm_timeout_seconds=_optional_float(
+            os.getenv("LLM_TIMEOUT_SECONDS"), defaults.model.llm_timeout_seconds
+        ),
+        batch_agents=tuple(
+            agent.strip()
+            for agent in os.getenv(
+                "LLM_BATCH_AGENTS", ",".join(defaults.model.batch_agents)
+            ).split(",")
+            if agent.strip()
+        ),
+        batch_window_ms=float(os.getenv("LLM_BATCH_WINDOW_MS", defaults.model.batch_window_ms)),
+        batch_max_items=int(os.getenv("LLM_BATCH_MAX_ITEMS", defaults.model.batch_max_items)),
+        cassette_mode=os.getenv("LLM_CASSETTE_MODE", defaults.model.cassette_mode),
+        cassette_path=Path(os.getenv("LLM_CASSETTE_PATH", str(defaults.model.cassette_path))),
+        cassette_latency=os.getenv("LLM_CASSETTE_LATENCY", defaults.model.cassette_latency),
+        cassette_latency_scale=float(
+            os.getenv("LLM_CASSETTE_LATENCY_SCALE", defaults.model.cassette_latency_scale)
+        ),
+        cassette_strict=os.getenv("LLM_CASSETTE_STRICT", "false").lower() == "true",
     )
     observability = ObservabilityConfig(
-        logs_path=Path(os.getenv("CONCIERGE_LOGS_PATH", str(ObservabilityConfig.logs_path))),
-        traces_path=Path(os.getenv("CONCIERGE_TRACES_PATH", str(ObservabilityConfig.traces_path))),
-        metrics_path=Path(os.getenv("CONCIERGE_METRICS_PATH", str(ObservabilityConfig.metrics_path))),
+        logs_path=Path(os.getenv("CONCIERGE_LOGS_PATH", str(defaults.observability.logs_path))),
+        traces_path=Path(
+            os.getenv("CONCIERGE_TRACES_PATH", str(defaults.observability.traces_path))
+        ),
+        metrics_path=Path(
+            os.getenv("CONCIERGE_METRICS_PATH", str(defaults.observability.metrics_path))
+        ),
         enable_console_logs=os.getenv("ENABLE_CONSOLE_LOGS", "true").lower() == "true",
-        log_level=os.getenv("LOG_LEVEL", ObservabilityConfig.log_level),
+        log_level=os.getenv("LOG_LEVEL", defaults.observability.log_level),
+        async_logging=os.getenv("ASYNC_LOGGING", "false").lower() == "true",
+        log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", defaults.observability.log_queue_size)),
+        log_overflow_policy=os.getenv(
+            "LOG_OVERFLOW_POLICY", defaults.observability.log_overflow_policy
+        ),
+        metrics_host=os.getenv("METRICS_HOST", defaults.observability.metrics_host),
+        metrics_port=_optional_int(os.getenv("METRICS_PORT"), defaults.observability.metrics_port),
+        metrics_export_interval_seconds=float(
+            os.getenv(
+                "METRICS_EXPORT_INTERVAL_SECONDS",
+                defaults.observability.metrics_export_interval_seconds,
+            )
+        ),
+        trace_buffer_size=int(
+            os.getenv("TRACE_BUFFER_SIZE", defaults.observability.trace_buffer_size)
+        ),
+        trace_export_interval_seconds=float(
+            os.getenv(
+                "TRACE_EXPORT_INTERVAL_SECONDS",
+                defaults.observability.trace_export_interval_seconds,
+            )
+        ),
+        trace_sample_rate=float(
+            os.getenv("TRACE_SAMPLE_RATE", defaults.observability.trace_sample_rate)
+        ),
+        tail_sample_slow_run_ms=_optional_float(
+            os.getenv("TAIL_SAMPLE_SLOW_RUN_MS"), defaults.observability.tail_sample_slow_run_ms
+        ),
+        log_payload_max_chars=_optional_int(
+            os.getenv("LOG_PAYLOAD_MAX_CHARS"), defaults.observability.log_payload_max_chars
+        ),
+        profile_sample_rate=float(
+            os.getenv("PROFILE_SAMPLE_RATE", defaults.observability.profile_sample_rate)
+        ),
+        profile_cpu=os.getenv("PROFILE_CPU", "true").lower() == "true",
+        profile_memory=os.getenv("PROFILE_MEMORY", "true").lower() == "true",
+        profile_top_n=int(os.getenv("PROFILE_TOP_N", defaults.observability.profile_top_n)),
     )
     memory = MemoryConfig(
-        long_term_path=Path(os.getenv("CONCIERGE_MEMORY_PATH", str(MemoryConfig.long_term_path))),
-        session_ttl_minutes=int(os.getenv("SESSION_TTL_MINUTES", MemoryConfig.session_ttl_minutes)),
+        long_term_path=Path(
+            os.getenv("CONCIERGE_MEMORY_PATH", str(defaults.memory.long_term_path))
+        ),
+        policy_cache_path=Path(
+            os.getenv("POLICY_CACHE_PATH", str(defaults.memory.policy_cache_path))
+        ),
+        plan_store_path=Path(os.getenv("PLAN_STORE_PATH", str(defaults.memory.plan_store_path))),
+        plan_store_write_behind=os.getenv("PLAN_STORE_WRITE_BEHIND", "true").lower() == "true",
+        plan_store_queue_size=int(
+            os.getenv("PLAN_STORE_QUEUE_SIZE", defaults.memory.plan_store_queue_size)
+        ),
+        session_ttl_minutes=int(
+            os.getenv("SESSION_TTL_MINUTES", defaults.memory.session_ttl_minutes)
+        ),
+        session_max_entries=_optional_int(
+            os.getenv("SESSION_MAX_ENTRIES"), defaults.memory.session_max_entries
+        ),
+        session_max_bytes=_optional_int(
+            os.getenv("SESSION_MAX_BYTES"), defaults.memory.session_max_bytes
+        ),
+        session_backend=os.getenv("SESSION_BACKEND", defaults.memory.session_backend),
+        session_backend_url=os.getenv("SESSION_BACKEND_URL", defaults.memory.session_backend_url),
+        plan_reuse=os.getenv("PLAN_REUSE", "false").lower() == "true",
+        plan_reuse_similarity=float(
+            os.getenv("PLAN_REUSE_SIMILARITY", defaults.memory.plan_reuse_similarity)
+        ),
+        plan_reuse_min_score=float(
+            os.getenv("PLAN_REUSE_MIN_SCORE", defaults.memory.plan_reuse_min_score)
+        ),
+        run_dedup_window_seconds=float(
+            os.getenv("RUN_DEDUP_WINDOW_SECONDS", defaults.memory.run_dedup_window_seconds)
+        ),
     )
     tools = ToolConfig(
-        civic_data_path=Path(os.getenv("CIVIC_DATA_PATH", str(ToolConfig.civic_data_path))),
-        grant_catalog_path=Path(os.getenv("GRANT_CATALOG_PATH", str(ToolConfig.grant_catalog_path))),
+        civic_data_path=Path(os.getenv("CIVIC_DATA_PATH", str(defaults.tools.civic_data_path))),
+        grant_catalog_path=Path(
+            os.getenv("GRANT_CATALOG_PATH", str(defaults.tools.grant_catalog_path))
+        ),
         google_search_api_key=os.getenv("GOOGLE_API_KEY"),
         use_live_search=os.getenv("ENABLE_LIVE_SEARCH", "false").lower() == "true",
     )
+    evaluation = EvaluationConfig(
+        prescore=os.getenv("EVAL_PRESCORE", "false").lower() == "true",
+        prescore_max_error=float(
+            os.getenv("EVAL_PRESCORE_MAX_ERROR", defaults.evaluation.prescore_max_error)
+        ),
+        prescore_min_samples=int(
+            os.getenv("EVAL_PRESCORE_MIN_SAMPLES", defaults.evaluation.prescore_min_samples)
+        ),
+        prescore_audit_rate=float(
+            os.getenv("EVAL_PRESCORE_AUDIT_RATE", defaults.evaluation.prescore_audit_rate)
+        ),
+    )
+    server = ServerConfig(
+        host=os.getenv("CONCIERGE_HOST", defaults.server.host),
+        port=int(os.getenv("PORT", defaults.server.port)),
+        workers=int(os.getenv("CONCIERGE_WORKERS", defaults.server.workers)),
+        preload=os.getenv("CONCIERGE_PRELOAD", "true").lower() == "true",
+        max_in_flight=int(os.getenv("CONCIERGE_MAX_IN_FLIGHT", defaults.server.max_in_flight)),
+        max_queue=int(os.getenv("CONCIERGE_MAX_QUEUE", defaults.server.max_queue)),
+        queue_timeout_seconds=float(
+            os.getenv("CONCIERGE_QUEUE_TIMEOUT_SECONDS", defaults.server.queue_timeout_seconds)
+        ),
+        request_timeout_seconds=float(
+            os.getenv("CONCIERGE_REQUEST_TIMEOUT_SECONDS", defaults.server.request_timeout_seconds)
+        ),
+        retry_after_seconds=int(
+            os.getenv("CONCIERGE_RETRY_AFTER_SECONDS", defaults.server.retry_after_seconds)
+        ),
+        drain_timeout_seconds=float(
+            os.getenv("CONCIERGE_DRAIN_TIMEOUT_SECONDS", defaults.server.drain_timeout_seconds)
+        ),
+    )
     cfg = ConciergeConfig(
         model=model,
         observability=observability,
         memory=memory,
         tools=tools,
+        evaluation=evaluation,
+        server=server,
         allow_stub_llm=os.getenv("ALLOW_STUB_LLM", "false").lower() == "true",
     )
-    if not cfg.gemini_api_key and not cfg.allow_stub_llm:
+    if not cfg.gemini_api_key and not cfg.allow_stub_llm and model.cassette_mode != "replay":
         raise EnvironmentError(
             "GEMINI_API_KEY must be set to run the Concierge. "
             "Set ALLOW_STUB_LLM=true to use the offline rule-based fallback."
         )
     return cfg
 
+
+def _agent_profiles(
+    raw: Optional[str], default: Dict[str, GenerationProfile]
+) -> Dict[str, GenerationProfile]:
+    """
+    Merge a JSON object of per-agent overrides over the defaults, e.g.
+    ``{"plan-evaluator": {"model_name": "models/gemini-1.5-flash-8b"}}``.
+    Fields an override omits keep the agent's default.
+    """
+    if not raw:
+        return dict(default)
+    profiles = dict(default)
+    for agent, fields in json.loads(raw).items():
+        if "stop_sequences" in fields:
+            fields["stop_sequences"] = tuple(fields["stop_sequences"])
+        try:
+            profiles[agent] = replace(profiles.get(agent, GenerationProfile()), **fields)
+        except TypeError as exc:
+            raise ValueError(f"Invalid GEMINI_AGENT_PROFILES entry for {agent}: {exc}") from exc
+    return profiles
+
+
+def _optional_int(raw: Optional[str], default: Optional[int]) -> Optional[int]:
+    """Parse an integer env var where ``0`` or ``none`` disables the limit."""
+    if raw is None:
+        return default
+    if raw.strip().lower() in {"", "0", "none"}:
+        return None
+    return int(raw)
+
+
+def _optional_float(raw: Optional[str], default: Optional[float]) -> Optional[float]:
+    """Parse a float env var where ``0`` or ``none`` disables the threshold."""
+    if raw is None:
+        return default
+    if raw.strip().lower() in {"", "0", "none"}:
+        return None
+    return float(raw)
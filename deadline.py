@@ -0,0 +1,96 @@
+"""
+Run deadlines and cooperative cancellation.
+
+A ``Deadline`` belongs to one run. It is carried on ``AgentContext`` and is
+also active in the run's context, for code with no agent context such as
+``LLMClient`` and ``InstrumentedTool``. Nothing is interrupted
+preemptively. Instead, work checks the deadline at its boundaries:
+- The orchestrator skips agents that have not started when time runs out.
+- LLM calls get a timeout derived from the remaining budget. Past the
+  deadline they return stub output, and the agent counts as degraded.
+- Tool calls raise ``DeadlineExceeded``, which skips the calling agent.
+
+``cancel()`` expires a deadline early, e.g. when the HTTP caller has
+already given up.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from typing import Callable, List, Optional
+
+_active: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar(
+    "concierge_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work starts after its run's deadline or cancellation."""
+
+
+class Deadline:
+    """``timeout=None`` never expires on its own but can still be cancelled."""
+
+    def __init__(
+        self, timeout: Optional[float] = None, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._clock = clock
+        self.timeout = timeout
+        self.expires_at = None if timeout is None else clock() + timeout
+        self.cancel_reason: Optional[str] = None
+        self.degraded_agents: List[str] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), ``0`` once cancelled, ``None`` if unbounded."""
+        if self.cancel_reason is not None:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self.cancel_reason is not None:
+            return self.cancel_reason
+        return "deadline" if self.expired else None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self.cancel_reason is None:
+                self.cancel_reason = reason
+
+    def check(self, what: str) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"{what}: run {self.reason}")
+
+    def timeout_for(self, cap: Optional[float] = None) -> Optional[float]:
+        """Per-call timeout: the remaining budget, capped at ``cap``."""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        return remaining if cap is None else min(cap, remaining)
+
+    def mark_degraded(self, agent: str) -> None:
+        with self._lock:
+            if agent not in self.degraded_agents:
+                self.degraded_agents.append(agent)
+
+
+def activate(deadline: Deadline) -> contextvars.Token:
+    return _active.set(deadline)
+
+
+def reset(token: contextvars.Token) -> None:
+    _active.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _active.get()
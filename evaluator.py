@@ -5,12 +5,18 @@ Evaluator agent producing rubric-based scores using LLM or heuristics.
 from __future__ import annotations
 
 import json
+import random
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Dict, Optional
 
 from ..agents.base import AgentContext, AgentResult, BaseAgent
+from .prescorer import MEMORY_KEY, RUBRIC, Prediction, PreScorer, plan_features
 from .prompts import EVALUATOR_PROMPT
 
+PRESCORED_COMMENT = "Scored by the calibrated heuristic pre-scorer; no LLM review."
+AGREEMENT_TOLERANCE = 1.0  # rubric points per dimension
+_ERROR_BUCKETS = (0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0)
+
 
 @dataclass
 class EvaluationScores:
@@ -26,19 +32,61 @@ class EvaluationScores:
 
 
 class EvaluatorAgent(BaseAgent):
+    """
+    Scores plans against the rubric with the LLM. With a calibrated
+    ``PreScorer`` and ``EvaluationConfig.prescore`` on, confident plans are
+    scored from their structured fields instead, except for a small audit
+    sample. Whenever a prediction and a real model score both exist, their
+    agreement is recorded. Evaluations whose response was not a real model
+    answer (stub, fallback or a reused plan's replay) are stored with that
+    outcome as their source, so calibration never learns from them.
+    """
+
     name = "plan-evaluator"
+    inputs = (
+        "plan_text",
+        "impact",
+        "timeline",
+        "grants",
+        "civic_profile",
+        "persona.community_profile",
+    )
+
+    def __init__(self) -> None:
+        self._calibration: Optional[Dict[str, Any]] = None
+        self._prescorer: Optional[PreScorer] = None
 
     def run(self, context: AgentContext, state: Dict[str, Dict]) -> AgentResult:
         plan_text = state["plan_text"]
         self._log(context, "Scoring plan against rubric")
-        prompt = EVALUATOR_PROMPT.format(plan=plan_text)
-        raw = context.llm.generate(prompt, agent=self.name)
-        scores = self._parse_scores(raw)
+        features = plan_features(state)
+        prediction = self._predict(context, features)
+        decision = self._decide(context, prediction)
+        context.metrics.counter(
+            "evaluator_prescore_total",
+            "Evaluations by pre-scorer decision",
+            labelnames=("decision",),
+        ).labels(decision=decision).inc()
+        if decision == "skipped" and prediction is not None:
+            scores = EvaluationScores(**prediction.rounded(), comments=PRESCORED_COMMENT)
+            raw = json.dumps(scores.__dict__)
+            scored_by = "prescorer"
+        else:
+            prompt = EVALUATOR_PROMPT.format(plan=plan_text)
+            raw = context.llm.generate(prompt, agent=self.name)
+            scores = self._parse_scores(raw)
+            scored_by = context.llm.last_outcome() or "unknown"
+            if scored_by == "ok":
+                scored_by = "llm"
+                if prediction is not None:
+                    self._record_agreement(context, prediction, scores)
         context.long_term_memory.append_to_list(
             "evaluations",
             {
                 "plan_text": plan_text[:5000],
                 "scores": scores.__dict__,
+                "features": features,
+                "source": scored_by,
             },
         )
         return AgentResult(
@@ -47,9 +95,57 @@ class EvaluatorAgent(BaseAgent):
                 "scores": scores.__dict__,
                 "average_score": round(scores.average, 2),
                 "raw_response": raw,
+                "scored_by": scored_by,
             },
         )
 
+    def _predict(self, context: AgentContext, features: Dict[str, float]) -> Optional[Prediction]:
+        calibration = context.long_term_memory.get(MEMORY_KEY)
+        if calibration is not self._calibration:
+            self._calibration = calibration
+            self._prescorer = PreScorer.from_dict(calibration)
+        scorer = self._prescorer
+        if scorer is None or scorer.samples < context.config.evaluation.prescore_min_samples:
+            return None
+        return scorer.predict(features)
+
+    @staticmethod
+    def _decide(context: AgentContext, prediction: Optional[Prediction]) -> str:
+        settings = context.config.evaluation
+        if prediction is None:
+            return "uncalibrated"
+        if not settings.prescore:
+            return "shadow"  # predicted for the agreement metrics only
+        if prediction.max_error > settings.prescore_max_error:
+            return "low_confidence"
+        if random.random() < settings.prescore_audit_rate:
+            return "audit"
+        return "skipped"
+
+    @staticmethod
+    def _record_agreement(
+        context: AgentContext, prediction: Prediction, scores: EvaluationScores
+    ) -> None:
+        errors = {
+            dimension: abs(prediction.scores[dimension] - getattr(scores, dimension))
+            for dimension in RUBRIC
+        }
+        histogram = context.metrics.histogram(
+            "evaluator_prescore_abs_error",
+            "Pre-scorer error against LLM scores",
+            _ERROR_BUCKETS,
+            labelnames=("dimension",),
+        )
+        for dimension, error in errors.items():
+            histogram.labels(dimension=dimension).observe(error)
+        agree = all(error <= AGREEMENT_TOLERANCE for error in errors.values())
+        confident = prediction.max_error <= context.config.evaluation.prescore_max_error
+        context.metrics.counter(
+            "evaluator_prescore_agreement_total",
+            "LLM-scored evaluations by pre-scorer agreement",
+            labelnames=("confident", "agreement"),
+        ).labels(confident=str(confident).lower(), agreement="agree" if agree else "disagree").inc()
+
     @staticmethod
     def _parse_scores(raw: str) -> EvaluationScores:
         try:
@@ -62,5 +158,7 @@ class EvaluatorAgent(BaseAgent):
                 comments=str(data.get("comments", "")),
             )
         except json.JSONDecodeError:
-            return EvaluationScores(feasibility=3, equity=3, impact=3, readiness=3, comments=raw[:200])
+            return EvaluationScores(
+                feasibility=3, equity=3, impact=3, readiness=3, comments=raw[:200]
+            )
 
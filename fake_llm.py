@@ -0,0 +1,155 @@
+"""
+Latency-simulating stand-in for ``google.generativeai.GenerativeModel``.
+
+``FakeGenerativeModel`` is passed to the orchestrator as its LLM backend in
+load tests. ``LLMClient`` then runs its real code paths: metrics, token
+accounting, and the stub fallback when a call fails. Nothing touches the
+network. Latencies are drawn from a log-normal distribution. Calls can fail
+at a configurable rate, or be throttled by a token bucket with the same
+``429 Resource exhausted`` shape as Gemini's quota errors. A
+``request_options={"timeout": ...}`` shorter than the drawn latency fails
+the call once the timeout has elapsed.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .llm_batcher import split_batch_prompt
+from .observability.token_usage import estimate_tokens
+
+_FILLER = (
+    "Coordinate with neighborhood partners to phase the rollout, track installed capacity, "
+    "and report household savings to the community each quarter."
+)
+
+
+class FakeLLMError(RuntimeError):
+    """A simulated transient backend failure."""
+
+
+class FakeThrottled(FakeLLMError):
+    """A simulated quota rejection (HTTP 429)."""
+
+
+class FakeTimeout(FakeLLMError):
+    """A simulated call that outlived its ``request_options`` timeout (HTTP 504)."""
+
+
+@dataclass
+class _UsageMetadata:
+    prompt_token_count: int
+    candidates_token_count: int
+
+
+@dataclass
+class _FakeResponse:
+    text: str
+    usage_metadata: _UsageMetadata
+
+
+class FakeGenerativeModel:
+    """
+    ``median_ms``/``sigma`` parameterise the log-normal latency; ``max_qps``
+    caps admitted calls per second (burst of one second's worth) before
+    throttling; ``output_tokens`` sizes the generated text, capped by the
+    call's ``generation_config["max_output_tokens"]``. A batched prompt
+    (``llm_batcher.batch_prompt``) is answered item by item in one call.
+    """
+
+    model_name = "fake"
+
+    def __init__(
+        self,
+        *,
+        median_ms: float = 800.0,
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        max_qps: Optional[float] = None,
+        output_tokens: int = 300,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.max_qps = max_qps
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max_qps or 0.0
+        self._refilled = time.monotonic()
+
+    def generate_content(
+        self,
+        prompt: str,
+        *,
+        generation_config: Optional[Dict[str, Any]] = None,
+        request_options: Optional[Dict[str, Any]] = None,
+        **_: Any,
+    ) -> _FakeResponse:
+        timeout = (request_options or {}).get("timeout")
+        max_tokens = (generation_config or {}).get("max_output_tokens")
+        with self._lock:
+            self.calls += 1
+            if not self._admit():
+                self.throttled += 1
+                raise FakeThrottled("429 Resource has been exhausted (simulated)")
+            delay = self._rng.lognormvariate(math.log(self.median_ms / 1000), self.sigma)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeTimeout("504 Deadline Exceeded (simulated)")
+        time.sleep(delay)
+        if failed:
+            raise FakeLLMError("503 Service unavailable (simulated)")
+        text = self._respond(prompt, max_tokens)
+        return _FakeResponse(text, _UsageMetadata(estimate_tokens(prompt), estimate_tokens(text)))
+
+    def _admit(self) -> bool:
+        if self.max_qps is None:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.max_qps, self._tokens + (now - self._refilled) * self.max_qps)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _respond(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        items = split_batch_prompt(prompt)
+        if items is not None:
+            cap = None if max_tokens is None else max_tokens // len(items)
+            answers = {}
+            for index, item in enumerate(items, start=1):
+                text = self._respond(item, cap)
+                answers[str(index)] = json.loads(text) if "Respond in JSON" in item else text
+            return json.dumps(answers)
+        if "Respond in JSON" in prompt:
+            scores = {
+                key: self._rng.randint(3, 5)
+                for key in ("feasibility", "equity", "impact", "readiness")
+            }
+            return json.dumps({**scores, "comments": _FILLER})
+        words = _FILLER.split()
+        # ~1.3 estimated tokens per filler word.
+        count = max(1, int(self.output_tokens / 1.3))
+        output = [words[i % len(words)] for i in range(count)]
+        # Like a real model, stop at the hard cap: the output is cut off.
+        while max_tokens is not None and len(output) > 1:
+            estimated = estimate_tokens(" ".join(output))
+            if estimated <= max_tokens:
+                break
+            del output[max(1, len(output) * max_tokens // estimated) :]
+        return " ".join(output)
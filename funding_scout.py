@@ -12,6 +12,7 @@ from ..tools import GrantFinderTool
 
 class FundingScoutAgent(BaseAgent):
     name = "funding-scout"
+    inputs = ("persona.city", "persona.state", "persona.initiative")
 
     def __init__(self, grant_tool: GrantFinderTool):
         self.grant_tool = grant_tool
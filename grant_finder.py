@@ -5,14 +5,29 @@ Grant finder tool uses a JSON catalogue of grants to match initiatives.
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 class GrantFinderTool:
     def __init__(self, catalog_path: Path):
         self.catalog_path = catalog_path
-        self.grants: List[Dict] = json.loads(catalog_path.read_text(encoding="utf-8"))
+        self._grants: Optional[List[Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def grants(self) -> List[Dict]:
+        """The catalog, parsed on first use."""
+        if self._grants is None:
+            with self._lock:
+                if self._grants is None:
+                    self._grants = json.loads(self.catalog_path.read_text(encoding="utf-8"))
+        return self._grants
+
+    def load(self) -> "GrantFinderTool":
+        self.grants
+        return self
 
     def search(self, *, city: str, state: str, keywords: List[str], max_results: int = 5) -> List[Dict]:
         geography_tokens = {state.upper(), f"US-{state.upper()}"}
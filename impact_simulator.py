@@ -16,24 +16,36 @@ class ImpactScenario:
     assumptions: str
 
 
+def initiative_category(initiative: str) -> str:
+    """solar | tree_canopy | mobility | general, as modelled by ``ImpactSimulatorTool``."""
+    initiative_lower = initiative.lower()
+    if "solar" in initiative_lower:
+        return "solar"
+    if "tree" in initiative_lower or "canopy" in initiative_lower:
+        return "tree_canopy"
+    if "mobility" in initiative_lower or "bike" in initiative_lower:
+        return "mobility"
+    return "general"
+
+
 class ImpactSimulatorTool:
     def estimate(self, initiative: str, scale: str) -> Dict:
-        initiative_lower = initiative.lower()
-        if "solar" in initiative_lower:
+        category = initiative_category(initiative)
+        if category == "solar":
             base = ImpactScenario(
                 co2_reduction_tonnes=25.0,
                 households_benefiting=120,
                 equity_score="High",
                 assumptions="3,000 sqft rooftop solar array; offsets ~25 tonnes CO₂ annually.",
             )
-        elif "tree" in initiative_lower or "canopy" in initiative_lower:
+        elif category == "tree_canopy":
             base = ImpactScenario(
                 co2_reduction_tonnes=8.0,
                 households_benefiting=200,
                 equity_score="Medium",
                 assumptions="50 shade trees planted; offsets ~8 tonnes CO₂ and reduces heat island effect.",
             )
-        elif "mobility" in initiative_lower or "bike" in initiative_lower:
+        elif category == "mobility":
             base = ImpactScenario(
                 co2_reduction_tonnes=15.0,
                 households_benefiting=300,
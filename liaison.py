@@ -22,6 +22,7 @@ class LiaisonInput:
 
 class CommunityLiaisonAgent(BaseAgent):
     name = "community-liaison"
+    inputs = ("organizer", "city", "state", "initiative", "scale", "community_profile")
 
     def run(self, context: AgentContext, state: Dict[str, Any]) -> AgentResult:
         self._log(context, "Collecting organizer intent", state=state)
@@ -0,0 +1,201 @@
+"""
+Cross-run micro-batching of LLM prompts.
+
+When many runs reach the same agent together (bulk scoring, load tests),
+each one otherwise pays a full request round trip for a small prompt. The
+first caller for a batch key (agent and generation profile) becomes the
+batch leader. It waits up to ``window_seconds``, or until ``max_items``
+prompts have joined, then sends all of them as one numbered multi-item
+prompt. The answer is a JSON object keyed by item number. The leader splits
+it and hands each caller its own answer. Callers whose answer is missing or
+malformed (e.g. text where the prompt asked for JSON), or whose batch
+request failed, get ``None`` and make their own call. So does a caller that
+was alone in its window, which then sends its prompt unchanged, and one
+whose timeout runs out before the batch returns. The batch's token usage
+is split between the answered items in proportion to their estimated
+prompt and answer sizes.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from .observability.token_usage import TokenUsage, estimate_tokens
+
+_ITEM_HEADER = "### Request {index}"
+_ITEM_PATTERN = re.compile(r"^### Request (\d+)$", re.MULTILINE)
+_END_MARKER = "### End of requests"
+_BATCH_PREAMBLE = (
+    "You will answer {count} independent requests. Each one starts with a line "
+    "'### Request <n>'. Answer each as if it were the only request."
+)
+_BATCH_INSTRUCTIONS = (
+    "Respond with one JSON object that maps each request number (as a string) to "
+    "that request's complete answer. When a request asks for JSON, its answer is "
+    "that JSON object; otherwise its answer is a string."
+)
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+K = TypeVar("K", bound=Hashable)
+
+# send(key, prompt, item_count, timeout) -> (text, usage), or None if the request failed.
+BatchSender = Callable[[K, str, int, Optional[float]], Optional[Tuple[str, TokenUsage]]]
+
+
+def batch_prompt(prompts: Sequence[str]) -> str:
+    parts = [_BATCH_PREAMBLE.format(count=len(prompts)), ""]
+    for index, prompt in enumerate(prompts, start=1):
+        parts += [_ITEM_HEADER.format(index=index), prompt.strip(), ""]
+    parts += [_END_MARKER, _BATCH_INSTRUCTIONS]
+    return "\n".join(parts)
+
+
+def split_batch_prompt(prompt: str) -> Optional[List[str]]:
+    """The item prompts of a ``batch_prompt``, or ``None`` for an ordinary prompt."""
+    if _END_MARKER not in prompt:
+        return None
+    body = prompt.split(_END_MARKER, 1)[0]
+    pieces = _ITEM_PATTERN.split(body)
+    # pieces: [preamble, "1", item, "2", item, ...]
+    return [item.strip() for item in pieces[2::2]]
+
+
+def _asks_for_json(prompt: str) -> bool:
+    return "respond in json" in prompt.lower()
+
+
+def split_batch_response(text: str, prompts: Sequence[str]) -> List[Optional[str]]:
+    """
+    One answer per prompt; ``None`` where an answer is missing, empty, or is
+    not a JSON object although its prompt asked for JSON.
+    """
+    try:
+        data = json.loads(_FENCE.sub("", text.strip()))
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return [None] * len(prompts)
+    answers: List[Optional[str]] = []
+    for index, prompt in enumerate(prompts, start=1):
+        value = data.get(str(index))
+        if isinstance(value, (dict, list)):
+            answers.append(json.dumps(value, ensure_ascii=False))
+        elif isinstance(value, str) and value.strip() and not _asks_for_json(prompt):
+            answers.append(value)
+        else:
+            answers.append(None)
+    return answers
+
+
+def _split_usage(
+    usage: TokenUsage, prompts: Sequence[str], answers: Sequence[str]
+) -> List[TokenUsage]:
+    prompt_sizes = [max(1, estimate_tokens(prompt)) for prompt in prompts]
+    output_sizes = [max(1, estimate_tokens(answer)) for answer in answers]
+    prompt_total, output_total = sum(prompt_sizes), sum(output_sizes)
+    return [
+        TokenUsage(
+            round(usage.prompt_tokens * p / prompt_total),
+            round(usage.output_tokens * o / output_total),
+            estimated=True,
+        )
+        for p, o in zip(prompt_sizes, output_sizes)
+    ]
+
+
+@dataclass
+class _Item:
+    prompt: str
+    expires_at: Optional[float]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[Tuple[str, TokenUsage]] = None
+
+
+class MicroBatcher(Generic[K]):
+    """
+    Collects prompts per key from concurrent callers and sends them through
+    ``send`` in batches of up to ``max_items``. ``on_batch(key, size,
+    answered)`` is called after every multi-item request.
+    """
+
+    def __init__(
+        self,
+        send: BatchSender[K],
+        *,
+        window_seconds: float,
+        max_items: int,
+        on_batch: Optional[Callable[[K, int, int], None]] = None,
+    ) -> None:
+        self.send = send
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.on_batch = on_batch
+        self._open: Dict[K, List[_Item]] = {}
+        self._cond = threading.Condition()
+
+    def submit(
+        self, key: K, prompt: str, timeout: Optional[float] = None
+    ) -> Optional[Tuple[str, TokenUsage]]:
+        """
+        Block until the batch holding ``prompt`` has been sent (or ``timeout``
+        runs out) and return its answer and usage share, or ``None`` when the
+        caller must send ``prompt`` itself.
+        """
+        item = _Item(prompt, None if timeout is None else time.monotonic() + timeout)
+        with self._cond:
+            batch = self._open.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = self._open[key] = []
+            batch.append(item)
+            if len(batch) >= self.max_items:
+                del self._open[key]
+                self._cond.notify_all()
+            if leader:
+                wait = self.window_seconds if timeout is None else min(self.window_seconds, timeout)
+                self._cond.wait_for(lambda: self._open.get(key) is not batch, wait)
+                if self._open.get(key) is batch:
+                    del self._open[key]
+        if leader:
+            self._flush(key, batch)
+        elif item.expires_at is None:
+            item.done.wait()
+        elif not item.done.wait(max(0.0, item.expires_at - time.monotonic())):
+            return None  # the batch is late; the caller's own call gets what time is left
+        return item.result
+
+    def _flush(self, key: K, batch: List[_Item]) -> None:
+        try:
+            if len(batch) == 1:
+                return
+            expiries = [item.expires_at for item in batch if item.expires_at is not None]
+            # The request must finish before the earliest caller's deadline.
+            timeout = max(0.0, min(expiries) - time.monotonic()) if expiries else None
+            prompts = [item.prompt for item in batch]
+            response = self.send(key, batch_prompt(prompts), len(batch), timeout)
+            answers: List[Optional[str]] = [None] * len(batch)
+            if response is not None:
+                answers = split_batch_response(response[0], prompts)
+            answered = [
+                (item, answer) for item, answer in zip(batch, answers) if answer is not None
+            ]
+            if response is not None and answered:
+                # Items that fall back pay for their own call, so answered items
+                # share the batch's usage.
+                shares = _split_usage(
+                    response[1],
+                    [item.prompt for item, _ in answered],
+                    [answer for _, answer in answered],
+                )
+                for (item, answer), usage in zip(answered, shares):
+                    item.result = (answer, usage)
+            if self.on_batch is not None:
+                self.on_batch(key, len(batch), len(answered))
+        finally:
+            for item in batch:
+                item.done.set()
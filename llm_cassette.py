@@ -0,0 +1,178 @@
+"""
+Record/replay cassettes for LLM calls.
+
+In ``record`` mode each prompt→response pair is captured together with its
+observed latency and token usage. Entries are keyed by agent and prompt
+hash, and repeat calls add latency samples to the same entry. Cassettes are
+gzip-compressed JSON lines. ``replay`` mode serves responses from a cassette
+with no network access. It can optionally sleep for the recorded latency
+(``recorded``) or for a latency drawn from the agent's recorded distribution
+(``distribution``), so benchmarks see realistic response sizes and timing.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+LATENCY_MODES = ("none", "recorded", "distribution")
+
+
+class CassetteMiss(KeyError):
+    """Raised in strict replay when a prompt was never recorded."""
+
+
+def _prompt_key(agent: str, prompt: str) -> str:
+    return hashlib.sha256(f"{agent}\0{prompt}".encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class CassetteEntry:
+    agent: str
+    key: str
+    prompt_chars: int
+    response: str
+    prompt_tokens: int
+    output_tokens: int
+    tokens_estimated: bool = False
+    latencies_ms: List[float] = field(default_factory=list)
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: Path,
+        mode: str,
+        *,
+        latency: str = "none",
+        latency_scale: float = 1.0,
+        strict: bool = False,
+        seed: Optional[int] = 0,
+    ) -> None:
+        if mode not in {"record", "replay"}:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown cassette latency mode: {latency}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, CassetteEntry] = {}
+        self._by_agent: Dict[str, List[CassetteEntry]] = {}
+        self._latency_pools: Dict[str, List[float]] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if path.exists():
+            self._load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {path}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self,
+        agent: str,
+        prompt: str,
+        response: str,
+        latency_seconds: float,
+        prompt_tokens: int,
+        output_tokens: int,
+        tokens_estimated: bool = False,
+    ) -> None:
+        key = _prompt_key(agent, prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = CassetteEntry(
+                    agent, key, len(prompt), response, prompt_tokens, output_tokens
+                )
+                self._add(entry)
+            entry.response = response
+            entry.prompt_tokens = prompt_tokens
+            entry.output_tokens = output_tokens
+            entry.tokens_estimated = tokens_estimated
+            entry.latencies_ms.append(round(latency_seconds * 1000, 3))
+
+    def replay(self, agent: str, prompt: str, timeout: Optional[float] = None) -> CassetteEntry:
+        """
+        Return the recording for ``prompt``, after sleeping for the injected
+        latency. A prompt that was never recorded gets one of the agent's
+        recordings, chosen deterministically from the prompt, unless the
+        cassette is strict. An injected latency longer than ``timeout``
+        sleeps for ``timeout`` and raises ``TimeoutError``, like a call that
+        timed out.
+        """
+        key = _prompt_key(agent, prompt)
+        entry, delay = self._select(agent, key)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Replayed latency {delay:.3f}s exceeds the {timeout:.3f}s timeout")
+        if delay > 0:
+            time.sleep(delay)
+        return entry
+
+    def save(self) -> None:
+        """Write the cassette atomically; a no-op outside record mode."""
+        if self.mode != "record":
+            return
+        with self._lock:
+            lines = [
+                json.dumps(asdict(entry), ensure_ascii=False) for entry in self._entries.values()
+            ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as fp:
+            fp.write("\n".join(lines) + "\n" if lines else "")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as fp:
+            for line in fp:
+                if line.strip():
+                    self._add(CassetteEntry(**json.loads(line)))
+
+    def _add(self, entry: CassetteEntry) -> None:
+        self._entries[entry.key] = entry
+        self._by_agent.setdefault(entry.agent, []).append(entry)
+
+    def _select(self, agent: str, key: str) -> Tuple[CassetteEntry, float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                candidates = self._by_agent.get(agent)
+                if self.strict or not candidates:
+                    raise CassetteMiss(f"No recording for {agent} prompt {key}")
+                entry = candidates[int(key, 16) % len(candidates)]
+            return entry, self._delay(entry) * self.latency_scale
+
+    def _delay(self, entry: CassetteEntry) -> float:
+        if self.latency == "recorded" and entry.latencies_ms:
+            return self._rng.choice(entry.latencies_ms) / 1000
+        if self.latency == "distribution":
+            pool = self._latency_pools.get(entry.agent)
+            if pool is None:
+                pool = self._latency_pools[entry.agent] = [
+                    ms for item in self._by_agent[entry.agent] for ms in item.latencies_ms
+                ]
+            if pool:
+                return self._rng.choice(pool) / 1000
+        return 0.0
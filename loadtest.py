@@ -0,0 +1,261 @@
+"""
+End-to-end load test for ``ClimateConciergeOrchestrator.run``.
+
+One orchestrator is driven from a thread pool, against either a
+``FakeGenerativeModel`` (simulated latency, errors and throttling) or a
+replayed LLM cassette. Arrivals are closed-loop by default: each worker
+starts its next request as soon as the previous one finishes. With
+``--rate`` they become an open-loop Poisson process, and a request's latency
+then includes the time it queued for a worker. The JSON report has
+throughput, p50/p95/p99 latency for runs, agents and LLM calls, LLM call
+outcomes, micro-batched prompts and peak RSS. Pass ``--baseline`` to compare
+against an earlier report::
+
+    python -m projects.climate_concierge.benchmarks.loadtest --requests 200 \\
+        --concurrency 16 --median-ms 400 --error-rate 0.02 --output report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from projects.climate_concierge.src.config import load_config
+from projects.climate_concierge.src.fake_llm import FakeGenerativeModel
+from projects.climate_concierge.src.orchestrator import ClimateConciergeOrchestrator
+
+CITIES = [("Oakland", "CA"), ("Fresno", "CA"), ("Austin", "TX"), ("Denver", "CO"), ("Boston", "MA")]
+INITIATIVES = [
+    "Solarize the community center roof",
+    "Plant street trees along the bus corridor",
+    "Launch an e-bike lending library",
+    "Weatherize low-income rental housing",
+]
+SCALES = ["Pilot", "Medium", "Large"]
+
+
+def _request(index: int) -> Dict[str, Any]:
+    city, state = CITIES[index % len(CITIES)]
+    return dict(
+        organizer=f"Load Test Team {index}",
+        city=city,
+        state=state,
+        initiative=INITIATIVES[index % len(INITIATIVES)],
+        scale=SCALES[index % len(SCALES)],
+        community_profile="Frontline neighborhood with high energy burden.",
+    )
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def _span_durations(traces_path: Path) -> Dict[str, Dict[str, List[float]]]:
+    """Agent and LLM span durations (seconds) by name, read from the OTLP export."""
+    durations: Dict[str, Dict[str, List[float]]] = {"agent": {}, "llm": {}}
+    if not traces_path.exists():
+        return durations
+    with traces_path.open(encoding="utf-8") as fp:
+        for line in fp:
+            for resource_spans in json.loads(line)["resourceSpans"]:
+                for scope in resource_spans["scopeSpans"]:
+                    for span in scope["spans"]:
+                        attributes = {a["key"]: a["value"] for a in span["attributes"]}
+                        kind = attributes["concierge.span_kind"]["stringValue"]
+                        if kind not in durations:
+                            continue
+                        name = span["name"]
+                        if kind == "llm":
+                            name = attributes["agent"]["stringValue"]
+                        start_ns = int(span["startTimeUnixNano"])
+                        elapsed = (int(span["endTimeUnixNano"]) - start_ns) / 1e9
+                        durations[kind].setdefault(name, []).append(elapsed)
+    return durations
+
+
+def run_load(
+    *,
+    requests: int,
+    concurrency: int,
+    rate: Optional[float] = None,
+    backend: Any = None,
+    workdir: Path,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    os.environ.setdefault("ALLOW_STUB_LLM", "true")
+    config = load_config()
+    config.observability.logs_path = workdir / "logs"
+    config.observability.traces_path = workdir / "traces.jsonl"
+    config.observability.metrics_path = workdir / "latest.prom"
+    config.observability.enable_console_logs = False
+    config.observability.trace_sample_rate = 1.0
+    config.observability.trace_buffer_size = max(
+        config.observability.trace_buffer_size, requests * 32
+    )
+    config.memory.long_term_path = workdir / "memory.json"
+    config.memory.plan_store_path = workdir / "plans.db"
+    config.memory.run_dedup_window_seconds = 0
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+
+    latencies: List[float] = []
+    failures: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(index: int, arrived: Optional[float]) -> None:
+        if arrived is None:  # closed loop: the request arrives when a worker frees up
+            arrived = time.perf_counter()
+        try:
+            orchestrator.run(**_request(index))
+        except Exception as exc:  # noqa: BLE001 - the report counts every failure type
+            with lock:
+                failures[type(exc).__name__] = failures.get(type(exc).__name__, 0) + 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - arrived)
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as pool:
+        next_arrival = start
+        for index in range(requests):
+            if rate:
+                next_arrival += rng.expovariate(rate)
+                time.sleep(max(0.0, next_arrival - time.perf_counter()))
+            pool.submit(one, index, time.perf_counter() if rate else None)
+    elapsed = time.perf_counter() - start
+    orchestrator.close()
+
+    spans = _span_durations(config.observability.traces_path)
+    outcomes: Dict[str, float] = {}
+    calls = orchestrator.metrics.counters.get("llm_calls_total")
+    for (_agent, _model, outcome), value in (calls.samples() if calls else {}).items():
+        outcomes[outcome] = outcomes.get(outcome, 0) + value
+    batched: Dict[str, float] = {}
+    items = orchestrator.metrics.counters.get("llm_batch_items_total")
+    for (_agent, outcome), value in (items.samples() if items else {}).items():
+        batched[outcome] = batched.get(outcome, 0) + value
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "arrival_rate": rate,
+        "completed": len(latencies),
+        "failed": failures,
+        "duration_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_seconds": {
+            "run": _summarize(latencies),
+            "agents": {name: _summarize(values) for name, values in sorted(spans["agent"].items())},
+            "llm": {name: _summarize(values) for name, values in sorted(spans["llm"].items())},
+        },
+        "llm_outcomes": outcomes,
+        "llm_batched_items": batched,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change (head vs. baseline) of throughput and run latency percentiles."""
+
+    def change(new: float, old: float) -> Optional[float]:
+        return round((new - old) / old * 100, 1) if old else None
+
+    run, base_run = report["latency_seconds"]["run"], baseline["latency_seconds"]["run"]
+    return {
+        "throughput_rps_pct": change(report["throughput_rps"], baseline["throughput_rps"]),
+        **{
+            f"run_{q}_pct": change(run.get(q, 0), base_run.get(q, 0))
+            for q in ("p50", "p95", "p99")
+        },
+        "peak_rss_mb_pct": change(report["peak_rss_mb"], baseline["peak_rss_mb"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Climate Concierge orchestrator")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop arrivals per second")
+    parser.add_argument("--median-ms", type=float, default=800.0, help="Fake LLM median latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Fake LLM log-normal spread")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-qps", type=float, default=None, help="Fake LLM quota (throttles)")
+    parser.add_argument("--output-tokens", type=int, default=300)
+    parser.add_argument(
+        "--cassette", type=Path, help="Replay this cassette instead of the fake LLM"
+    )
+    parser.add_argument(
+        "--batch-agents", help="Comma-separated agents whose prompts are micro-batched across runs"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    backend = None
+    if args.batch_agents:
+        os.environ["LLM_BATCH_AGENTS"] = args.batch_agents
+    if args.cassette:
+        os.environ.update(
+            LLM_CASSETTE_MODE="replay",
+            LLM_CASSETTE_PATH=str(args.cassette),
+            LLM_CASSETTE_LATENCY="distribution",
+        )
+    else:
+        backend = FakeGenerativeModel(
+            median_ms=args.median_ms,
+            sigma=args.sigma,
+            error_rate=args.error_rate,
+            max_qps=args.max_qps,
+            output_tokens=args.output_tokens,
+            seed=args.seed,
+        )
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run_load(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            backend=backend,
+            workdir=Path(tmp),
+            seed=args.seed,
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["vs_baseline"] = compare(report, baseline)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,34 @@
 Logging utilities for the Climate Concierge project.
 
 Provides structured logging to both console and file sinks to aid in
-debugging, observability, and reproducibility.
+debugging, observability, and reproducibility. In async mode records are
+handed to a bounded queue and formatted/written by a background listener, so
+a slow disk or blocked stdout never stalls agent execution.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .sampling import cap_payload, is_sampled
+
+_orjson_dumps: Optional[Callable[..., bytes]]
+try:  # Optional fast JSON encoder
+    from orjson import dumps as _orjson_dumps
+except ImportError:  # pragma: no cover - stdlib json fallback
+    _orjson_dumps = None
 
 _LOGGER_CACHE: Dict[str, logging.Logger] = {}
+_QUEUE_STATS: Dict[str, "LogQueueStats"] = {}
+_LISTENERS: Dict[str, Tuple[logging.Logger, "_BlockingSentinelListener"]] = {}
 
 
 def _ensure_parent(path: Path) -> None:
@@ -25,12 +41,19 @@ def get_logger(
     log_path: Path,
     enable_console: bool = True,
     level: str = "INFO",
+    *,
+    async_mode: bool = False,
+    queue_size: int = 10_000,
+    overflow: str = "block",
 ) -> logging.Logger:
     """
     Return a configured logger instance.
 
     The logger writes JSON-formatted logs to `log_path` (rotated at ~1MB)
-    and optionally streams human-readable logs to stdout.
+    and optionally streams human-readable logs to stdout. With `async_mode`
+    the handlers run on a `QueueListener` thread behind a queue of
+    `queue_size` records; `overflow` is "block" (wait for space) or "drop"
+    (discard and count the record) when the queue is full.
     """
 
     cache_key = f"{name}:{log_path}"
@@ -41,36 +64,180 @@ def get_logger(
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
     logger.propagate = False
 
+    handlers: List[logging.Handler] = []
     # File handler with JSON formatting
     _ensure_parent(log_path)
     file_handler = RotatingFileHandler(log_path, maxBytes=1_000_000, backupCount=3)
     file_handler.setFormatter(_JsonLogFormatter())
-    logger.addHandler(file_handler)
+    handlers.append(file_handler)
 
     if enable_console:
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    if async_mode:
+        if overflow not in {"block", "drop"}:
+            raise ValueError(f"Unknown log overflow policy: {overflow}")
+        stats = _QUEUE_STATS[cache_key] = LogQueueStats()
+        records: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        logger.addHandler(_BoundedQueueHandler(records, stats, block=overflow == "block"))
+        listener = _BlockingSentinelListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        if not _LISTENERS:
+            atexit.register(stop_async_logging)
+        _LISTENERS[cache_key] = (logger, listener)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     _LOGGER_CACHE[cache_key] = logger
     return logger
 
 
+def stop_async_logging() -> None:
+    """
+    Drain every async logger's queue and stop its listener thread; the
+    loggers keep working afterwards by writing synchronously.
+    """
+    while _LISTENERS:
+        _, (logger, listener) = _LISTENERS.popitem()
+        listener.stop()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+
+
+class _BlockingSentinelListener(QueueListener):
+    def __init__(
+        self, records: "queue.Queue[Any]", *handlers: logging.Handler, respect_handler_level: bool
+    ) -> None:
+        super().__init__(records, *handlers, respect_handler_level=respect_handler_level)
+        self.records = records
+
+    def enqueue_sentinel(self) -> None:
+        # The stock put_nowait raises when a bounded queue is full; None is its sentinel.
+        self.records.put(None)
+
+
+class LogQueueStats:
+    """Counters for an async logger's queue."""
+
+    def __init__(self) -> None:
+        self.queued = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, queued: bool) -> None:
+        with self._lock:
+            if queued:
+                self.queued += 1
+            else:
+                self.dropped += 1
+
+
+def logging_stats() -> Dict[str, Dict[str, int]]:
+    """Queued/dropped record counts per async logger."""
+    return {
+        key: {"queued": stats.queued, "dropped": stats.dropped}
+        for key, stats in _QUEUE_STATS.items()
+    }
+
+
+class _BoundedQueueHandler(QueueHandler):
+    def __init__(
+        self, records: "queue.Queue[logging.LogRecord]", stats: LogQueueStats, block: bool
+    ) -> None:
+        super().__init__(records)
+        self.records = records
+        self.stats = stats
+        self.block = block
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve what cannot cross threads safely (args, exc_info, the
+        # caller's context dict, which it may keep mutating); full formatting
+        # happens on the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        context = getattr(record, "context", None)
+        if isinstance(context, dict):
+            record.context = dict(context)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put(record, block=self.block)
+        except queue.Full:
+            self.stats.record(queued=False)
+            return
+        self.stats.record(queued=True)
+
+
+def _dumps(value: Any) -> str:
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(value, default=str).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
 class _JsonLogFormatter(logging.Formatter):
-    """Minimal JSON formatter to keep logs structured."""
+    """
+    Minimal JSON formatter to keep logs structured.
+
+    The level/logger fragment is pre-serialized per (logger, level) and the
+    timestamp prefix is cached per second, so each record only encodes its
+    message and context. The cache is one (second, text) tuple, replaced
+    whole, so handlers formatting on several threads never pair a second
+    with another second's text.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._static: Dict[Tuple[str, str], str] = {}
+        self._second_cache: Tuple[int, str] = (-1, "")
+
+    def formatTime(  # noqa: N802
+        self, record: logging.LogRecord, datefmt: Optional[str] = None
+    ) -> str:
+        second = int(record.created)
+        cached_second, text = self._second_cache
+        if second != cached_second:
+            text = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(record.created))
+            self._second_cache = (second, text)
+        return "%s,%03d" % (text, record.msecs)
 
     def format(self, record: logging.LogRecord) -> str:
-        payload: Dict[str, Any] = {
-            "timestamp": self.formatTime(record),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
-        if record.exc_info:
-            payload["exc_info"] = self.formatException(record.exc_info)
+        key = (record.name, record.levelname)
+        static = self._static.get(key)
+        if static is None:
+            static = self._static[key] = (
+                f',"level":{_dumps(record.levelname)},"logger":{_dumps(record.name)}'
+            )
+        parts = [
+            '{"timestamp":"',
+            self.formatTime(record),
+            '"',
+            static,
+            ',"message":',
+            _dumps(record.getMessage()),
+        ]
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self.formatException(record.exc_info)
+        if exc_text:
+            parts.append(',"exc_info":')
+            parts.append(_dumps(exc_text))
         if hasattr(record, "context"):
-            payload["context"] = record.context
-        return json.dumps(payload, ensure_ascii=False)
+            parts.append(',"context":')
+            parts.append(_dumps(record.context))
+        parts.append("}")
+        return "".join(parts)
 
 
 def log_event(
@@ -80,8 +247,14 @@ def log_event(
     level: str = "info",
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    """Helper to log with contextual metadata."""
+    """
+    Helper to log with contextual metadata.
 
-    extra = {"context": context or {}}
-    getattr(logger, level.lower(), logger.info)(message, extra=extra)
+    Info/debug calls from runs that were sampled out return before any work;
+    warnings and errors are always logged. Context payloads are capped.
+    """
 
+    if not is_sampled() and level.lower() in {"debug", "info"}:
+        return
+    extra = {"context": cap_payload(context) if context else {}}
+    getattr(logger, level.lower(), logger.info)(message, extra=extra)
@@ -5,9 +5,17 @@ Persistent memory backed by JSON file.
 from __future__ import annotations
 
 import json
+import os
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: no pre-fork workers to coordinate
+    fcntl = None  # type: ignore[assignment]
 
 
 @dataclass
@@ -19,11 +27,16 @@ class MemoryRecord:
 @dataclass
 class LongTermMemory:
     """
-    Simple key-value store persisted to disk.
+    Simple key-value store persisted to disk. Safe to share between threads:
+    updates are serialized and the file is replaced atomically. Each update
+    also holds an ``fcntl`` lock on a sidecar ``.lock`` file and first re-reads
+    the file, so processes sharing the path (pre-fork workers) merge their
+    writes instead of the last flush erasing the others'.
     """
 
     store_path: Path
     records: Dict[str, MemoryRecord] = field(default_factory=dict)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.store_path.exists():
@@ -37,26 +50,57 @@ class LongTermMemory:
         return default or {}
 
     def set(self, key: str, value: Dict[str, Any]) -> None:
-        self.records[key] = MemoryRecord(key=key, value=value)
-        self._flush()
+        with self._lock, self._file_lock():
+            self._reload()
+            self.records[key] = MemoryRecord(key=key, value=value)
+            self._flush()
 
     def append_to_list(self, key: str, value: Dict[str, Any]) -> None:
-        record = self.records.get(key)
-        if not record:
-            record = MemoryRecord(key=key, value={"items": []})
-            self.records[key] = record
-        record.value.setdefault("items", [])
-        record.value["items"].append(value)
-        self._flush()
+        with self._lock, self._file_lock():
+            self._reload()
+            record = self.records.get(key)
+            if not record:
+                record = MemoryRecord(key=key, value={"items": []})
+                self.records[key] = record
+            record.value.setdefault("items", [])
+            record.value["items"].append(value)
+            self._flush()
 
     def list(self, key: str) -> List[Dict[str, Any]]:
-        record = self.records.get(key)
-        if not record:
-            return []
-        return record.value.get("items", [])
+        with self._lock:
+            record = self.records.get(key)
+            if not record:
+                return []
+            return list(record.value.get("items", []))  # a snapshot; appends may follow
 
-    def _flush(self) -> None:
-        payload = {key: record.value for key, record in self.records.items()}
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
         self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        self.store_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.store_path.with_name(f"{self.store_path.name}.lock")
+        with open(lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)  # released when the handle closes
+            yield
+
+    def _reload(self) -> None:
+        """Picks up what other processes wrote; unchanged records keep their identity."""
+        if not self.store_path.exists():
+            return
+        raw = json.loads(self.store_path.read_text(encoding="utf-8"))
+        for key, value in raw.items():
+            record = self.records.get(key)
+            if record is None or record.value != value:
+                self.records[key] = MemoryRecord(key=key, value=value)
+
+    def _flush(self) -> None:
+        payload = json.dumps(
+            {key: record.value for key, record in self.records.items()},
+            ensure_ascii=False,
+            indent=2,
+        )
+        tmp = self.store_path.with_name(f"{self.store_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.store_path)  # readers never see a half-written file
 
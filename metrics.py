@@ -1,79 +1,294 @@
 """
 Lightweight metrics collection helpers.
+
+Counters are sharded per thread so increments never take a lock; shards are
+merged when the registry is rendered, and a finished thread's shard is folded
+into a shared total so short-lived request threads don't accumulate shards.
+Histograms keep precomputed sorted bounds and locate buckets with ``bisect``.
+Every metric type accepts label names, and label values are bound with ``.labels(...)``.
 """
 
 from __future__ import annotations
 
+import os
+import threading
 import time
-from dataclasses import dataclass, field
+import weakref
+from bisect import bisect_left
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from ..deadline import DeadlineExceeded, current_deadline
+
+LabelKey = Tuple[str, ...]
+
+# Default latency buckets (seconds) for agent, tool and LLM call histograms.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labelnames: LabelKey, values: Dict[str, Any]) -> LabelKey:
+    if set(values) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {tuple(values)}")
+    return tuple(str(values[name]) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: LabelKey, key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, key)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Bound:
+    """A metric with label values bound, returned by ``.labels(...)``."""
+
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric: Any, key: LabelKey) -> None:
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1) -> None:
+        self._metric._inc(self._key, amount)
+
+    def set(self, value: float) -> None:
+        self._metric._set(self._key, value)
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._key, value)
+
+
+class _ShardOwner:
+    """Held only by the owning thread's ``threading.local``; freed when it exits."""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self) -> None:
+        self.shard: Dict[LabelKey, float] = {}
 
 
-@dataclass
 class Counter:
-    name: str
-    description: str
-    value: int = 0
-    labels: Tuple[str, ...] = field(default_factory=tuple)
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames: LabelKey = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelKey, float]] = []
+        self._retired: Dict[LabelKey, float] = {}  # totals of threads that have exited
+        self._shards_lock = threading.Lock()
+
+    def labels(self, **values: Any) -> _Bound:
+        return _Bound(self, _label_key(self.labelnames, values))
+
+    def inc(self, amount: float = 1) -> None:
+        self._inc(_label_key(self.labelnames, {}), amount)
+
+    def _inc(self, key: LabelKey, amount: float) -> None:
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = self._local.owner = _ShardOwner()
+            with self._shards_lock:
+                self._shards.append(owner.shard)
+            weakref.finalize(owner, self._retire, owner.shard)
+        # Only the owning thread writes to its shard, so no lock is needed.
+        shard = owner.shard
+        shard[key] = shard.get(key, 0) + amount
+
+    def _retire(self, shard: Dict[LabelKey, float]) -> None:
+        with self._shards_lock:
+            self._shards = [live for live in self._shards if live is not shard]
+            for key, value in shard.items():
+                self._retired[key] = self._retired.get(key, 0) + value
+
+    def samples(self) -> Dict[LabelKey, float]:
+        # Merged under the lock so a shard being retired is counted exactly once.
+        with self._shards_lock:
+            merged = dict(self._retired)
+            for shard in self._shards:
+                for key, value in shard.copy().items():
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    @property
+    def value(self) -> float:
+        """Total across all label sets."""
+        return sum(self.samples().values())
+
+
+class Gauge:
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames: LabelKey = tuple(labelnames)
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
 
-    def inc(self, amount: int = 1) -> None:
-        self.value += amount
+    def labels(self, **values: Any) -> _Bound:
+        return _Bound(self, _label_key(self.labelnames, values))
+
+    def set(self, value: float) -> None:
+        self._set(_label_key(self.labelnames, {}), value)
+
+    def inc(self, amount: float = 1) -> None:
+        self._inc(_label_key(self.labelnames, {}), amount)
+
+    def _set(self, key: LabelKey, value: float) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def _inc(self, key: LabelKey, amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+    @property
+    def value(self) -> float:
+        return self.samples().get((), 0.0)
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.sum = 0.0
 
 
-@dataclass
 class Histogram:
-    name: str
-    description: str
-    buckets: Tuple[float, ...]
-    counts: Dict[float, int] = field(default_factory=dict)
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Iterable[float],
+        labelnames: Iterable[str] = (),
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames: LabelKey = tuple(labelnames)
+        finite = {float(bucket) for bucket in buckets} - {float("inf")}
+        self.buckets: Tuple[float, ...] = tuple(sorted(finite))
+        self._series: Dict[LabelKey, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **values: Any) -> _Bound:
+        return _Bound(self, _label_key(self.labelnames, values))
 
     def observe(self, value: float) -> None:
-        for bucket in sorted(self.buckets):
-            if value <= bucket:
-                self.counts[bucket] = self.counts.get(bucket, 0) + 1
-                break
-        else:
-            self.counts[float("inf")] = self.counts.get(float("inf"), 0) + 1
+        self._observe(_label_key(self.labelnames, {}), value)
+
+    def _observe(self, key: LabelKey, value: float) -> None:
+        # ``le`` buckets are inclusive, so the first bound >= value wins; the
+        # trailing slot counts observations above every bound (+Inf).
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.sum += value
+
+    def samples(self) -> Dict[LabelKey, Tuple[List[int], float]]:
+        with self._lock:
+            return {key: (list(s.counts), s.sum) for key, s in self._series.items()}
 
 
 class MetricsRegistry:
     """
-    Barebones metrics registry emitting Prometheus exposition format.
+    Thread-safe metrics registry emitting Prometheus exposition format.
     """
 
     def __init__(self, sink_path: Path) -> None:
         self.sink_path = sink_path
         self.counters: Dict[str, Counter] = {}
+        self.gauges: Dict[str, Gauge] = {}
         self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
 
-    def counter(self, name: str, description: str) -> Counter:
-        if name not in self.counters:
-            self.counters[name] = Counter(name=name, description=description)
-        return self.counters[name]
+    def counter(self, name: str, description: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = self.counters.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.counters.setdefault(name, Counter(name, description, labelnames))
+        return metric
 
-    def histogram(self, name: str, description: str, buckets: Iterable[float]) -> Histogram:
-        if name not in self.histograms:
-            self.histograms[name] = Histogram(name=name, description=description, buckets=tuple(buckets))
-        return self.histograms[name]
+    def gauge(self, name: str, description: str, labelnames: Iterable[str] = ()) -> Gauge:
+        metric = self.gauges.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.gauges.setdefault(name, Gauge(name, description, labelnames))
+        return metric
 
-    def emit(self) -> None:
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Iterable[float],
+        labelnames: Iterable[str] = (),
+    ) -> Histogram:
+        metric = self.histograms.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.histograms.setdefault(
+                    name, Histogram(name, description, buckets, labelnames)
+                )
+        return metric
+
+    def snapshot(self) -> Dict[str, List[Tuple[Any, Dict[LabelKey, Any]]]]:
+        """
+        Copy every metric's samples back to back, before any formatting, so a
+        scrape sees one consistent view and holds each lock only for a copy.
+        """
+        with self._lock:
+            counters = list(self.counters.values())
+            gauges = list(self.gauges.values())
+            histograms = list(self.histograms.values())
+        return {
+            "counter": [(metric, metric.samples()) for metric in counters],
+            "gauge": [(metric, metric.samples()) for metric in gauges],
+            "histogram": [(metric, metric.samples()) for metric in histograms],
+        }
+
+    def render(self) -> str:
+        snapshot = self.snapshot()
         lines = ["# Metrics emitted at {}".format(time.strftime("%Y-%m-%d %H:%M:%S"))]
-        for counter in self.counters.values():
-            lines.append(f"# HELP {counter.name} {counter.description}")
-            lines.append(f"# TYPE {counter.name} counter")
-            lines.append(f"{counter.name} {counter.value}")
-        for hist in self.histograms.values():
+        for kind in ("counter", "gauge"):
+            for metric, samples in snapshot[kind]:
+                lines.append(f"# HELP {metric.name} {metric.description}")
+                lines.append(f"# TYPE {metric.name} {kind}")
+                for key, value in sorted(samples.items()):
+                    lines.append(f"{metric.name}{_format_labels(metric.labelnames, key)} {value}")
+        for hist, samples in snapshot["histogram"]:
             lines.append(f"# HELP {hist.name} {hist.description}")
             lines.append(f"# TYPE {hist.name} histogram")
-            cumulative = 0
-            for bucket in sorted(hist.buckets):
-                cumulative += hist.counts.get(bucket, 0)
-                lines.append(f'{hist.name}_bucket{{le="{bucket}"}} {cumulative}')
-            cumulative += hist.counts.get(float("inf"), 0)
-            lines.append(f'{hist.name}_bucket{{le="+Inf"}} {cumulative}')
-            lines.append(f"{hist.name}_count {cumulative}")
-        self.sink_path.write_text("\n".join(lines), encoding="utf-8")
+            for key, (counts, total) in sorted(samples.items()):
+                cumulative = 0
+                for bound, count in zip(hist.buckets, counts):
+                    cumulative += count
+                    labels = _format_labels(hist.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{hist.name}_bucket{labels} {cumulative}")
+                cumulative += counts[-1]
+                labels = _format_labels(hist.labelnames, key, 'le="+Inf"')
+                lines.append(f"{hist.name}_bucket{labels} {cumulative}")
+                plain = _format_labels(hist.labelnames, key)
+                lines.append(f"{hist.name}_sum{plain} {total}")
+                lines.append(f"{hist.name}_count{plain} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def emit(self) -> None:
+        """Write the exposition text to ``sink_path`` via an atomic rename."""
+        self.sink_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.sink_path.with_name(
+            f".{self.sink_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, self.sink_path)
 
 
 def timer(registry: MetricsRegistry, histogram_name: str, description: str, buckets: Iterable[float]):
@@ -91,3 +306,61 @@ def timer(registry: MetricsRegistry, histogram_name: str, description: str, buck
 
     return decorator
 
+
+class InstrumentedTool:
+    """
+    Proxy that times every public method call of a tool into
+    ``tool_call_seconds{tool, method, outcome}`` and, when a tracer is given,
+    a ``tool`` span. Calls made after the active run's deadline raise
+    ``DeadlineExceeded`` instead of running.
+    """
+
+    def __init__(self, tool: Any, registry: MetricsRegistry, name: str, tracer: Any = None) -> None:
+        self._tool = tool
+        self._name = name
+        self._tracer = tracer
+        self._histogram = registry.histogram(
+            "tool_call_seconds",
+            "Tool call latency in seconds",
+            LATENCY_BUCKETS,
+            labelnames=("tool", "method", "outcome"),
+        )
+        self._wrapped: Dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._tool, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        wrapped = self._wrapped.get(attr)
+        if wrapped is None:
+            wrapped = self._wrapped[attr] = self._wrap(attr, value)
+        return wrapped
+
+    def _wrap(self, method: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        histogram = self._histogram
+        tool = self._name
+        tracer = self._tracer
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            outcome = "ok"
+            try:
+                deadline = current_deadline()
+                if deadline is not None:
+                    deadline.check(f"{tool}.{method}")
+                if tracer is None:
+                    return func(*args, **kwargs)
+                with tracer.span(f"{tool}.{method}", kind="tool", tool=tool):
+                    return func(*args, **kwargs)
+            except DeadlineExceeded:
+                outcome = "deadline"
+                raise
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                histogram.labels(tool=tool, method=method, outcome=outcome).observe(
+                    time.perf_counter() - start
+                )
+
+        return wrapper
@@ -5,26 +5,43 @@ Orchestrates the Community Climate Action Concierge pipeline.
 from __future__ import annotations
 
 import json
+import logging
+import random
+import threading
+import time
 import uuid
-from dataclasses import dataclass
+import warnings
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
+from . import deadline as deadlines
 from .agents import (
     ActionPlannerAgent,
     AgentContext,
-    AgentResult,
     CommunicationsCoachAgent,
     CommunityLiaisonAgent,
     FundingScoutAgent,
     PolicyResearcherAgent,
 )
-from .config import ConciergeConfig, DATA_DIR, load_config
+from .config import ConciergeConfig, DATA_DIR, GenerationProfile, load_config
+from .deadline import Deadline, DeadlineExceeded, current_deadline
 from .evaluation import EvaluatorAgent
+from .llm_batcher import MicroBatcher
+from .llm_cassette import Cassette
 from .memory import LongTermMemory, SessionStore
+from .memory.plan_store import PlanStore
+from .memory.policy_cache import PolicySummaryCache
+from .memory.session_backends import build_session_backend
+from .observability import token_usage
 from .observability.logger import get_logger, log_event
-from .observability.metrics import MetricsRegistry
-from .observability.tracer import TraceRecorder
+from .observability.metrics import LATENCY_BUCKETS, InstrumentedTool, MetricsRegistry
+from .observability.metrics_server import MetricsFileExporter, MetricsServer
+from .observability.profiling import RunProfiler
+from .observability.sampling import Sampler
+from .observability.token_usage import TokenUsage, UsageLedger, current_ledger, usage_cost
+from .observability.tracer import Span, TraceRecorder
+from .run_dedup import RunDeduplicator, request_fingerprint
 from .tools import (
     CalendarTool,
     CivicDataTool,
@@ -33,48 +50,313 @@ from .tools import (
     TimelineBuilderTool,
 )
 
+if TYPE_CHECKING:  # numpy-backed; imported only when plan reuse is enabled
+    from .memory.plan_index import PlanIndex, PlanMatch
+
 
 class LLMClient:
     """
     Thin adapter for Gemini or stubbed LLM responses.
+
+    Each agent's calls use its ``GenerationProfile`` (model, temperature,
+    output cap, stop sequences). One ``GenerativeModel`` is created per
+    distinct profile and reused. ``backend`` replaces the Gemini models with
+    any object exposing ``generate_content(prompt, **kwargs)`` (e.g.
+    ``FakeGenerativeModel``); it receives the profile as ``generation_config``.
+    Prompts of the agents in ``ModelConfig.batch_agents`` go through a
+    ``MicroBatcher``, which merges concurrent runs' prompts into one request.
     """
 
-    def __init__(self, config: ConciergeConfig, logger) -> None:
+    def __init__(
+        self,
+        config: ConciergeConfig,
+        logger: logging.Logger,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[TraceRecorder] = None,
+        backend: Any = None,
+    ) -> None:
         self.config = config
         self.logger = logger
-        self._client = None
-        if config.gemini_api_key:
+        self.metrics = metrics
+        self.tracer = tracer
+        self._backend = backend
+        self._genai: Any = None
+        self._models: Dict[GenerationProfile, Any] = {}
+        self._profiles: Dict[str, GenerationProfile] = {}
+        self.cassette: Optional[Cassette] = None
+        if config.model.cassette_mode != "off":
+            self.cassette = Cassette(
+                config.model.cassette_path,
+                config.model.cassette_mode,
+                latency=config.model.cassette_latency,
+                latency_scale=config.model.cassette_latency_scale,
+                strict=config.model.cassette_strict,
+            )
+        replaying = self.cassette is not None and self.cassette.replaying
+        self.batcher: Optional[MicroBatcher[Tuple[str, GenerationProfile]]] = None
+        if config.model.batch_agents and not replaying:
+            self.batcher = MicroBatcher(
+                self._send_batch,
+                window_seconds=config.model.batch_window_ms / 1000,
+                max_items=config.model.batch_max_items,
+                on_batch=self._record_batch,
+            )
+        needs_gemini = backend is None and not replaying
+        if needs_gemini and not config.gemini_api_key and not config.allow_stub_llm:
+            raise EnvironmentError(
+                "No LLM available. Set GEMINI_API_KEY or ALLOW_STUB_LLM=true."
+            )
+        # The Gemini SDK is slow to import; it is loaded on the first call (or warmup()).
+        self._client_ready = not (needs_gemini and config.gemini_api_key)
+        self._client_lock = threading.Lock()
+        self._local = threading.local()
+
+    def warmup(self) -> None:
+        """Import and configure the Gemini SDK now rather than on the first call."""
+        if self._client_ready:
+            return
+        with self._client_lock:
+            if self._client_ready:
+                return
             try:
                 import google.generativeai as genai  # type: ignore
 
-                genai.configure(api_key=config.gemini_api_key)
-                self._client = genai.GenerativeModel(config.model.model_name)
+                genai.configure(api_key=self.config.gemini_api_key)
+                self._genai = genai
+                for agent in self.config.model.agent_profiles:
+                    self._model_for(self.profile_for(agent))
             except Exception as exc:  # pragma: no cover - best effort
                 log_event(
-                    logger,
+                    self.logger,
                     "Falling back to stub LLM due to Gemini init failure",
                     level="warning",
                     context={"error": str(exc)},
                 )
-                self._client = None
-        elif not config.allow_stub_llm:
-            raise EnvironmentError(
-                "No LLM available. Set GEMINI_API_KEY or ALLOW_STUB_LLM=true."
+                self._genai = None
+                self._models.clear()
+            self._client_ready = True
+
+    def profile_for(self, agent: str) -> GenerationProfile:
+        profile = self._profiles.get(agent)
+        if profile is None:
+            profile = self._profiles[agent] = self.config.model.profile_for(agent)
+        return profile
+
+    def _model_for(self, profile: GenerationProfile) -> Any:
+        model = self._models.get(profile)
+        if model is None:
+            model = self._models.setdefault(
+                profile,
+                self._genai.GenerativeModel(
+                    profile.model_name, generation_config=profile.generation_config()
+                ),
             )
+        return model
 
     def generate(self, prompt: str, *, agent: str) -> str:
-        if self._client:
-            try:
-                response = self._client.generate_content(prompt, safety_settings=None)
-                return response.text if hasattr(response, "text") else str(response)
-            except Exception as exc:  # pragma: no cover
-                log_event(
-                    self.logger,
-                    "Gemini generation failed; falling back to stub",
-                    level="warning",
-                    context={"error": str(exc), "agent": agent},
-                )
-        return self._stub_response(prompt, agent)
+        self.warmup()
+        profile = self.profile_for(agent)
+        model_name = profile.model_name or self.config.model.model_name
+        if self.cassette is not None and self.cassette.replaying:
+            model = "replay"
+        elif self._backend is not None:
+            model = getattr(self._backend, "model_name", model_name)
+        else:
+            model = model_name if self._genai is not None else "stub"
+        if self.tracer is None:
+            return self._generate(prompt, agent, model, profile)[0]
+        with self.tracer.span("llm.generate", kind="llm", agent=agent, model=model) as span:
+            text, usage = self._generate(prompt, agent, model, profile)
+            span.set_attribute("max_output_tokens", profile.max_output_tokens)
+            span.set_attribute("prompt_chars", len(prompt))
+            span.set_attribute("response_chars", len(text))
+            span.set_attribute("prompt_tokens", usage.prompt_tokens)
+            span.set_attribute("output_tokens", usage.output_tokens)
+            span.set_attribute("tokens_estimated", usage.estimated)
+            return text
+
+    def _generate(
+        self, prompt: str, agent: str, model: str, profile: GenerationProfile
+    ) -> Tuple[str, TokenUsage]:
+        start = time.perf_counter()
+        outcome = "ok"
+        usage = TokenUsage(0, 0, estimated=True)
+        ledger = current_ledger()
+        deadline = current_deadline()
+        timeout = self.config.model.llm_timeout_seconds
+        if deadline is not None:
+            timeout = deadline.timeout_for(timeout)
+        try:
+            if ledger is not None:
+                outcome = "budget"  # also when allows() raises under the abort policy
+                if not ledger.allows(prompt, agent=agent):
+                    return self._stub_response(prompt, agent), usage
+                outcome = "ok"
+            if deadline is not None and deadline.expired:
+                outcome = "deadline"
+                deadline.mark_degraded(agent)
+                return self._stub_response(prompt, agent), usage
+            if model == "replay":
+                try:
+                    entry = self.cassette.replay(  # type: ignore[union-attr]
+                        agent, prompt, timeout=timeout
+                    )
+                except TimeoutError:
+                    outcome = "deadline"
+                    if deadline is not None:
+                        deadline.mark_degraded(agent)
+                    return self._stub_response(prompt, agent), usage
+                usage = TokenUsage(entry.prompt_tokens, entry.output_tokens, entry.tokens_estimated)
+                return entry.response, usage
+            if model != "stub":
+                if self.batcher is not None and agent in self.config.model.batch_agents:
+                    batched = self.batcher.submit((agent, profile), prompt, timeout)
+                    if batched is not None:
+                        text, usage = batched
+                        elapsed = time.perf_counter() - start
+                        self._record_cassette(agent, prompt, text, elapsed, usage)
+                        return text, usage
+                    if deadline is not None:
+                        timeout = deadline.timeout_for(self.config.model.llm_timeout_seconds)
+                options: Dict[str, Any] = {}
+                if timeout is not None:
+                    options["request_options"] = {"timeout": timeout}
+                if self._backend is not None:
+                    client = self._backend
+                    options["generation_config"] = profile.generation_config()
+                else:
+                    client = self._model_for(profile)
+                try:
+                    response = client.generate_content(prompt, safety_settings=None, **options)
+                    text = response.text if hasattr(response, "text") else str(response)
+                    usage = TokenUsage.from_response(response, prompt, text)
+                    self._record_cassette(agent, prompt, text, time.perf_counter() - start, usage)
+                    return text, usage
+                except Exception as exc:  # pragma: no cover
+                    outcome = "fallback"
+                    if deadline is not None and deadline.expired:
+                        # The call used up the run's remaining time; don't retry, degrade.
+                        outcome = "deadline"
+                        deadline.mark_degraded(agent)
+                        return self._stub_response(prompt, agent), usage
+                    log_event(
+                        self.logger,
+                        "Gemini generation failed; falling back to stub",
+                        level="warning",
+                        context={"error": str(exc), "agent": agent},
+                    )
+            if model == "stub":
+                outcome = "stub"
+            text = self._stub_response(prompt, agent)
+            usage = TokenUsage.estimate(prompt, text)
+            self._record_cassette(agent, prompt, text, time.perf_counter() - start, usage)
+            return text, usage
+        finally:
+            self._local.outcome = outcome
+            if ledger is not None and outcome not in ("budget", "deadline"):
+                ledger.record(agent, usage)
+            self._record_call(agent, model, outcome, time.perf_counter() - start, usage)
+
+    def last_outcome(self) -> Optional[str]:
+        """
+        Outcome (``ok``, ``stub``, ``fallback``, ``budget``, ``deadline``) of
+        this thread's last call. Only ``ok`` is a real model response.
+        """
+        return getattr(self._local, "outcome", None)
+
+    def _send_batch(
+        self, key: Tuple[str, GenerationProfile], prompt: str, count: int, timeout: Optional[float]
+    ) -> Optional[Tuple[str, TokenUsage]]:
+        agent, profile = key
+        # Room for every item's answer, and ask for the JSON object the batch prompt describes.
+        per_item = profile.max_output_tokens or self.config.model.max_output_tokens
+        batch_profile = replace(profile, max_output_tokens=per_item * count)
+        generation_config = batch_profile.generation_config()
+        generation_config["response_mime_type"] = "application/json"
+        options: Dict[str, Any] = {"generation_config": generation_config}
+        if timeout is not None:
+            options["request_options"] = {"timeout": timeout}
+        client = self._backend if self._backend is not None else self._model_for(profile)
+        try:
+            response = client.generate_content(prompt, safety_settings=None, **options)
+        except Exception as exc:  # noqa: BLE001 - every item falls back to its own call
+            log_event(
+                self.logger,
+                "Batched generation failed; items fall back to single calls",
+                level="warning",
+                context={"error": str(exc), "agent": agent, "items": count},
+            )
+            return None
+        text = response.text if hasattr(response, "text") else str(response)
+        return text, TokenUsage.from_response(response, prompt, text)
+
+    def _record_batch(self, key: Tuple[str, GenerationProfile], size: int, answered: int) -> None:
+        if self.metrics is None:
+            return
+        agent = key[0]
+        self.metrics.histogram(
+            "llm_batch_size",
+            "Prompts per batched LLM request",
+            _BATCH_SIZE_BUCKETS,
+            labelnames=("agent",),
+        ).labels(agent=agent).observe(size)
+        items = self.metrics.counter(
+            "llm_batch_items_total", "Batched prompts by outcome", labelnames=("agent", "outcome")
+        )
+        items.labels(agent=agent, outcome="answered").inc(answered)
+        if size > answered:
+            items.labels(agent=agent, outcome="fallback").inc(size - answered)
+
+    def _record_cassette(
+        self, agent: str, prompt: str, text: str, elapsed: float, usage: TokenUsage
+    ) -> None:
+        if self.cassette is None or self.cassette.replaying:
+            return
+        self.cassette.record(
+            agent,
+            prompt,
+            text,
+            elapsed,
+            usage.prompt_tokens,
+            usage.output_tokens,
+            tokens_estimated=usage.estimated,
+        )
+
+    def close(self) -> None:
+        """Write the cassette when recording."""
+        if self.cassette is not None:
+            self.cassette.save()
+
+    def _record_call(
+        self, agent: str, model: str, outcome: str, elapsed: float, usage: TokenUsage
+    ) -> None:
+        if self.metrics is None:
+            return
+        labels = {"agent": agent, "model": model, "outcome": outcome}
+        self.metrics.histogram(
+            "llm_call_seconds",
+            "LLM call latency in seconds",
+            LATENCY_BUCKETS,
+            labelnames=tuple(labels),
+        ).labels(**labels).observe(elapsed)
+        self.metrics.counter(
+            "llm_calls_total", "Number of LLM calls", labelnames=tuple(labels)
+        ).labels(**labels).inc()
+        tokens = self.metrics.counter(
+            "llm_tokens_total",
+            "LLM tokens by direction",
+            labelnames=("agent", "model", "direction"),
+        )
+        tokens.labels(agent=agent, model=model, direction="prompt").inc(usage.prompt_tokens)
+        tokens.labels(agent=agent, model=model, direction="output").inc(usage.output_tokens)
+        cost = usage_cost(
+            usage,
+            self.config.model.input_cost_per_million_tokens,
+            self.config.model.output_cost_per_million_tokens,
+        )
+        self.metrics.counter(
+            "llm_cost_usd_total", "Estimated LLM spend in USD", labelnames=("agent", "model")
+        ).labels(agent=agent, model=model).inc(cost)
 
     def _stub_response(self, prompt: str, agent: str) -> str:
         # Simple deterministic heuristics
@@ -120,50 +402,235 @@ class LLMClient:
         return "Summary not available in stub mode."
 
 
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+_RUN_TOKEN_BUCKETS = (250, 500, 1_000, 2_000, 4_000, 8_000, 16_000, 32_000, 64_000, 128_000)
+
+_REQUEST_FIELDS = ("organizer", "city", "state", "initiative", "scale", "community_profile")
+
+# Plan fields holding each agent's raw LLM response, replayed on plan reuse.
+_REUSABLE_RESPONSES = {
+    "policy-researcher": "policy_response",
+    "funding-scout": "funding_summary",
+    "action-planner": "plan_text",
+    "communications-coach": "outreach_copy",
+    "plan-evaluator": "raw_response",
+}
+
+
+class _PlanReuseLLM:
+    """
+    Serves the LLM responses of a similar prior plan, so agents still run their
+    tools and memory updates but skip the model call.
+    """
+
+    def __init__(self, llm: LLMClient, responses: Dict[str, str]) -> None:
+        self.llm = llm
+        self.responses = responses
+        self._local = threading.local()
+
+    def generate(self, prompt: str, *, agent: str) -> str:
+        cached = self.responses.get(agent)
+        self._local.replayed = cached is not None
+        if cached is not None:
+            return cached
+        return self.llm.generate(prompt, agent=agent)
+
+    def last_outcome(self) -> Optional[str]:
+        """``reuse`` when this thread's last call was served from the prior plan."""
+        if getattr(self._local, "replayed", False):
+            return "reuse"
+        return self.llm.last_outcome()
+
+
 @dataclass
 class ConciergeResult:
     run_id: str
     plan: Dict
-    artifact_path: Path
+    plan_store_path: Path  # the plan is stored there under run_id
+
+    @property
+    def artifact_path(self) -> Path:
+        """Deprecated alias of ``plan_store_path``; plans are no longer per-run files."""
+        warnings.warn(
+            "ConciergeResult.artifact_path is deprecated; use plan_store_path",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.plan_store_path
+
+
+def _dataset_paths(config: ConciergeConfig) -> Tuple[Path, Path]:
+    civic_path = config.tools.civic_data_path
+    if not civic_path.exists():
+        civic_path = DATA_DIR / "city_emissions_sample.csv"
+    grant_path = config.tools.grant_catalog_path
+    if not grant_path.exists():
+        grant_path = DATA_DIR / "grants_catalog_sample.json"
+    return civic_path, grant_path
+
+
+@dataclass
+class SharedResources:
+    """
+    Read-mostly state that several orchestrators can share: the loaded
+    datasets, the memory bank, the policy summary cache and the plan index.
+    The pre-fork server builds it once in the master so that workers inherit
+    it copy-on-write.
+    """
+
+    civic_tool: CivicDataTool
+    grant_tool: GrantFinderTool
+    long_term_memory: LongTermMemory
+    policy_cache: PolicySummaryCache
+    plan_index: Optional["PlanIndex"] = None
+
+    @classmethod
+    def load(cls, config: ConciergeConfig, *, eager: bool = True) -> "SharedResources":
+        """Without ``eager`` the datasets are read on first use."""
+        civic_path, grant_path = _dataset_paths(config)
+        civic_tool, grant_tool = CivicDataTool(civic_path), GrantFinderTool(grant_path)
+        if eager:
+            civic_tool.load()
+            grant_tool.load()
+        long_term_memory = LongTermMemory(config.memory.long_term_path)
+        plan_index = None
+        if config.memory.plan_reuse:
+            from .memory.plan_index import PlanIndex
+
+            plan_index = PlanIndex.from_records(long_term_memory.list("plan_library"))
+        policy_cache = PolicySummaryCache(config.memory.policy_cache_path)
+        return cls(civic_tool, grant_tool, long_term_memory, policy_cache, plan_index)
 
 
 class ClimateConciergeOrchestrator:
-    def __init__(self, config: Optional[ConciergeConfig] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[ConciergeConfig] = None,
+        *,
+        llm_backend: Any = None,
+        shared: Optional[SharedResources] = None,
+    ) -> None:
         self.config = config or load_config()
         self.logger = get_logger(
             "climate-concierge",
             log_path=self.config.observability.logs_path / "concierge.log",
             enable_console=self.config.observability.enable_console_logs,
             level=self.config.observability.log_level,
+            async_mode=self.config.observability.async_logging,
+            queue_size=self.config.observability.log_queue_size,
+            overflow=self.config.observability.log_overflow_policy,
         )
         self.metrics = MetricsRegistry(self.config.observability.metrics_path)
-        self.tracer = TraceRecorder(self.config.observability.traces_path)
-        self.session_store = SessionStore(self.config.memory.session_ttl_minutes)
-        self.long_term_memory = LongTermMemory(self.config.memory.long_term_path)
-        self.llm_client = LLMClient(self.config, self.logger)
-        self._init_agents()
-
-    def _init_agents(self) -> None:
-        data_dir = DATA_DIR
-        civic_path = self.config.tools.civic_data_path
-        if not civic_path.exists():
-            civic_path = data_dir / "city_emissions_sample.csv"
-        grant_path = self.config.tools.grant_catalog_path
-        if not grant_path.exists():
-            grant_path = data_dir / "grants_catalog_sample.json"
-
-        self.civic_tool = CivicDataTool(civic_path)
-        self.grant_tool = GrantFinderTool(grant_path)
+        self.metrics_server: Optional[MetricsServer] = None
+        self.metrics_exporter: Optional[MetricsFileExporter] = None
+        self._start_metrics_exposition()
+        self.tracer = TraceRecorder(
+            self.config.observability.traces_path,
+            buffer_size=self.config.observability.trace_buffer_size,
+            export_interval_seconds=self.config.observability.trace_export_interval_seconds,
+            sampler=Sampler(
+                self.config.observability.trace_sample_rate,
+                slow_run_ms=self.config.observability.tail_sample_slow_run_ms,
+                max_payload_chars=self.config.observability.log_payload_max_chars,
+            ),
+        )
+        self.session_store = SessionStore(
+            self.config.memory.session_ttl_minutes,
+            max_entries=self.config.memory.session_max_entries,
+            max_bytes=self.config.memory.session_max_bytes,
+            backend=build_session_backend(
+                self.config.memory.session_backend, self.config.memory.session_backend_url
+            ),
+            metrics=self.metrics,
+        )
+        self.llm_client = LLMClient(
+            self.config, self.logger, self.metrics, self.tracer, backend=llm_backend
+        )
+        if shared is None:
+            shared = SharedResources.load(self.config, eager=False)
+        self.long_term_memory = shared.long_term_memory
+        self.policy_cache = shared.policy_cache
+        self.plan_index: Optional[PlanIndex] = shared.plan_index
+        self.run_dedup: Optional[RunDeduplicator] = None
+        if self.config.memory.run_dedup_window_seconds > 0:
+            self.run_dedup = RunDeduplicator(self.config.memory.run_dedup_window_seconds)
+        self.plan_store = PlanStore(
+            self.config.memory.plan_store_path,
+            write_behind=self.config.memory.plan_store_write_behind,
+            queue_size=self.config.memory.plan_store_queue_size,
+            logger=self.logger,
+        )
+        self._init_agents(shared)
+
+    def _start_metrics_exposition(self) -> None:
+        obs = self.config.observability
+        if obs.metrics_port is not None:
+            self.metrics_server = MetricsServer(
+                self.metrics, host=obs.metrics_host, port=obs.metrics_port
+            ).start()
+        if obs.metrics_export_interval_seconds > 0:
+            self.metrics_exporter = MetricsFileExporter(
+                self.metrics, obs.metrics_export_interval_seconds
+            ).start()
+
+    def close(self) -> None:
+        """
+        Stop background exporters and write queued plans, final metrics,
+        traces and cassettes.
+        """
+        self.plan_store.close()
+        self.llm_client.close()
+        self.tracer.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        else:
+            self.metrics.emit()
+
+    def warmup(self) -> Dict[str, float]:
+        """
+        Load everything deferred at import and construction time: the civic
+        dataset, the grant catalog and the Gemini SDK. Long-lived services
+        call this before accepting traffic so the first request doesn't pay
+        for it. Returns seconds spent per component.
+        """
+        timings: Dict[str, float] = {}
+        for name, load in (
+            ("civic_data", self.civic_tool.load),
+            ("grant_catalog", self.grant_tool.load),
+            ("llm_client", self.llm_client.warmup),
+        ):
+            start = time.perf_counter()
+            load()
+            timings[name] = round(time.perf_counter() - start, 4)
+        log_event(self.logger, "Warmup complete", context={"seconds": timings})
+        return timings
+
+    def _init_agents(self, shared: SharedResources) -> None:
+        self.civic_tool = shared.civic_tool
+        self.grant_tool = shared.grant_tool
         self.impact_tool = ImpactSimulatorTool()
         self.timeline_tool = TimelineBuilderTool()
         self.calendar_tool = CalendarTool()
 
+        def timed(tool: Any, name: str) -> InstrumentedTool:
+            return InstrumentedTool(tool, self.metrics, name, tracer=self.tracer)
+
         self.agents = {
             "liaison": CommunityLiaisonAgent(),
-            "policy": PolicyResearcherAgent(self.civic_tool),
-            "funding": FundingScoutAgent(self.grant_tool),
-            "planner": ActionPlannerAgent(self.impact_tool, self.timeline_tool),
-            "comms": CommunicationsCoachAgent(self.calendar_tool),
+            "policy": PolicyResearcherAgent(
+                timed(self.civic_tool, "civic-data"), shared.policy_cache
+            ),
+            "funding": FundingScoutAgent(timed(self.grant_tool, "grant-finder")),
+            "planner": ActionPlannerAgent(
+                timed(self.impact_tool, "impact-simulator"),
+                timed(self.timeline_tool, "timeline-builder"),
+            ),
+            "comms": CommunicationsCoachAgent(timed(self.calendar_tool, "calendar")),
             "evaluator": EvaluatorAgent(),
         }
 
@@ -177,8 +644,178 @@ class ClimateConciergeOrchestrator:
         scale: str,
         community_profile: str,
         session_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        profile: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> ConciergeResult:
+        """
+        Run the agent pipeline and persist the resulting plan.
+
+        Identical requests (or requests sharing ``idempotency_key``) within
+        ``run_dedup_window_seconds`` return the stored result; concurrent
+        duplicates wait for the run already in progress, and raise
+        ``RunInProgress`` if their deadline passes first.
+
+        ``profile=True`` forces a fresh, profiled run; ``None`` profiles a
+        ``profile_sample_rate`` fraction of runs.
+
+        ``timeout`` (default ``run_timeout_seconds``) bounds the run, or pass
+        a ``deadline`` to be able to cancel it from another thread. Agents not
+        started by then are skipped, LLM calls past it return stub output, and
+        the plan is returned with a ``partial`` section. Partial results are
+        never served to duplicates.
+        """
+
+        inputs: Dict[str, Any] = dict(
+            organizer=organizer,
+            city=city,
+            state=state,
+            initiative=initiative,
+            scale=scale,
+            community_profile=community_profile,
+            session_id=session_id,
+        )
+        if deadline is None and timeout is not None:
+            deadline = Deadline(timeout)
+        if self.run_dedup is None or profile:
+            return self._run_pipeline(**inputs, profile=profile, deadline=deadline)
+        result, duplicate = self.run_dedup.run(
+            request_fingerprint(**inputs),
+            lambda: self._run_pipeline(**inputs, profile=profile, deadline=deadline),
+            idempotency_key=idempotency_key,
+            cacheable=lambda result: "partial" not in result.plan,
+            wait_timeout=None if deadline is None else deadline.remaining(),
+        )
+        if duplicate:
+            self.metrics.counter("run_dedup_hits_total", "Runs served from a stored result").inc()
+            log_event(
+                self.logger,
+                "Returning stored result for duplicate run",
+                context={"run_id": result.run_id},
+            )
+        return result
+
+    def replan(self, session_id: str, **changes: str) -> ConciergeResult:
+        """
+        Re-run the session's last request with ``changes`` applied.
+
+        Agents whose fingerprinted inputs are unchanged reuse their cached
+        output from the session, so only dependents of the changed fields are
+        recomputed; their names are listed under ``recomputed_agents``.
+        """
+
+        unknown = set(changes) - set(_REQUEST_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown replan fields: {', '.join(sorted(unknown))}")
+        session = self.session_store.get_session(session_id)
+        previous = session.get("last_request")
+        if not previous:
+            raise KeyError(f"No previous run recorded for session {session_id}")
+        return self._run_pipeline(**{**previous, **changes}, session_id=session_id, use_cache=True)
+
+    def _run_pipeline(
+        self,
+        *,
+        organizer: str,
+        city: str,
+        state: str,
+        initiative: str,
+        scale: str,
+        community_profile: str,
+        session_id: Optional[str],
+        use_cache: bool = False,
+        profile: Optional[bool] = None,
+        deadline: Optional[Deadline] = None,
     ) -> ConciergeResult:
         run_id = uuid.uuid4().hex[:12]
+        if deadline is None:
+            deadline = Deadline(self.config.model.run_timeout_seconds)
+        request = {
+            "organizer": organizer,
+            "city": city,
+            "state": state,
+            "initiative": initiative,
+            "scale": scale,
+            "community_profile": community_profile,
+        }
+        profiler = self._start_profiler(run_id, profile)
+        model = self.config.model
+        ledger = UsageLedger(
+            budget=model.run_token_budget,
+            policy=model.token_budget_policy,
+            input_cost_per_million=model.input_cost_per_million_tokens,
+            output_cost_per_million=model.output_cost_per_million_tokens,
+        )
+        ledger_token = token_usage.activate(ledger)
+        deadline_token = deadlines.activate(deadline)
+        try:
+            with self.tracer.span(
+                "concierge.run", kind="run", run_id=run_id, city=city, scale=scale
+            ) as span:
+                if profiler is not None:
+                    span.set_attribute("profile.dir", str(profiler.out_dir))
+                try:
+                    return self._execute(
+                        run_id,
+                        request,
+                        session_id=session_id,
+                        use_cache=use_cache,
+                        profiler=profiler,
+                        ledger=ledger,
+                        deadline=deadline,
+                    )
+                finally:
+                    if profiler is not None:
+                        profiler.close()
+                    self._record_usage(span, ledger)
+                    if deadline.reason is not None:
+                        span.set_attribute("deadline.reason", deadline.reason)
+        finally:
+            deadlines.reset(deadline_token)
+            token_usage.reset(ledger_token)
+
+    def _record_usage(self, span: Span, ledger: UsageLedger) -> None:
+        total = ledger.total_tokens
+        span.set_attribute("tokens.total", total)
+        span.set_attribute("tokens.budget_exceeded", ledger.budget_exceeded)
+        self.metrics.histogram(
+            "run_tokens", "LLM tokens spent per run", _RUN_TOKEN_BUCKETS
+        ).observe(total)
+        if ledger.budget_exceeded:
+            self.metrics.counter(
+                "token_budget_exceeded_total", "Runs that exhausted their token budget"
+            ).inc()
+
+    def _start_profiler(self, run_id: str, profile: Optional[bool]) -> Optional[RunProfiler]:
+        obs = self.config.observability
+        if profile is None:
+            profile = obs.profile_sample_rate > 0 and random.random() < obs.profile_sample_rate
+        if not profile or not (obs.profile_cpu or obs.profile_memory):
+            return None
+        self.metrics.counter("profiled_runs_total", "Runs captured with the profiler").inc()
+        # Lazy loading would otherwise import pandas and the SDK under tracemalloc, which is
+        # very slow and profiles the one-time load rather than the run.
+        self.warmup()
+        return RunProfiler(
+            obs.logs_path.parent / "profiles" / run_id,
+            cpu=obs.profile_cpu,
+            memory=obs.profile_memory,
+            top_n=obs.profile_top_n,
+        )
+
+    def _execute(
+        self,
+        run_id: str,
+        request: Dict[str, str],
+        *,
+        session_id: Optional[str],
+        use_cache: bool,
+        profiler: Optional[RunProfiler] = None,
+        ledger: Optional[UsageLedger] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> ConciergeResult:
+        deadline = deadline or Deadline()
         session = self.session_store.get_session(session_id or run_id)
         ctx = AgentContext(
             session=session,
@@ -188,44 +825,138 @@ class ClimateConciergeOrchestrator:
             tracer=self.tracer,
             logger=self.logger,
             llm=self.llm_client,
+            profiler=profiler,
+            deadline=deadline,
         )
-        state: Dict[str, Dict] = {
-            "organizer": organizer,
-            "city": city,
-            "state": state,
-            "initiative": initiative,
-            "scale": scale,
-            "community_profile": community_profile,
-        }
-        plan_state: Dict[str, Dict] = {}
+        state: Dict[str, Any] = dict(request)
+        plan_state: Dict[str, Any] = {}
+
+        cache: Dict[str, Dict[str, Any]] = session.get("agent_cache") or {}
+        recomputed = []
+        skipped = []
+
+        def skip(agent_name: str) -> None:
+            skipped.append(agent_name)
+            self.metrics.counter(
+                "agents_skipped_total",
+                "Agents skipped at the run deadline",
+                labelnames=("agent", "reason"),
+            ).labels(agent=agent_name, reason=deadline.reason or "deadline").inc()
+            self.tracer.record(agent_name, "Skipped at run deadline", {"run_id": run_id})
 
-        def update_state(result: AgentResult) -> None:
-            plan_state.update(result.payload)
-            self.metrics.counter("agent_runs_total", "Number of agent runs").inc()
+        def run_agent(key: str) -> None:
+            agent = self.agents[key]
+            fingerprint = agent.input_fingerprint(state)
+            cached = cache.get(agent.name)
+            if use_cache and fingerprint and cached and cached["fingerprint"] == fingerprint:
+                plan_state.update(cached["payload"])
+                self.metrics.counter(
+                    "agent_cache_hits_total", "Agent outputs reused on replan"
+                ).inc()
+                self.tracer.record(agent.name, "Reused cached output", {"run_id": run_id})
+            else:
+                if deadline.expired:
+                    skip(agent.name)
+                    return
+                try:
+                    result = agent.run(ctx, state)
+                except DeadlineExceeded:
+                    skip(agent.name)
+                    return
+                plan_state.update(result.payload)
+                recomputed.append(agent.name)
+                if fingerprint:
+                    cache[agent.name] = {"fingerprint": fingerprint, "payload": result.payload}
+            state.update(plan_state)
 
         log_event(self.logger, "Starting concierge run", context={"run_id": run_id})
 
-        update_state(self.agents["liaison"].run(ctx, state))
-        state.update(plan_state)
-        update_state(self.agents["policy"].run(ctx, state))
-        state.update(plan_state)
-        update_state(self.agents["funding"].run(ctx, state))
-        state.update(plan_state)
-        update_state(self.agents["planner"].run(ctx, state))
-        state.update(plan_state)
-        update_state(self.agents["comms"].run(ctx, state))
-        state.update(plan_state)
-        update_state(self.agents["evaluator"].run(ctx, state))
+        run_agent("liaison")
+        reuse = self._match_prior_plan(plan_state["persona"]) if "persona" in plan_state else None
+        if reuse is not None:
+            ctx.llm = _PlanReuseLLM(self.llm_client, reuse.record["responses"])
+            log_event(
+                self.logger,
+                "Reusing similar prior plan",
+                context={"run_id": run_id, "source_run_id": reuse.record.get("run_id")},
+            )
+        for key in ("policy", "funding", "planner", "comms", "evaluator"):
+            run_agent(key)
+        if session_id:
+            session.set("last_request", request)
+            session.set("agent_cache", cache)
+        if use_cache:
+            plan_state["recomputed_agents"] = recomputed
+        self.session_store.save_session(session)
+        if reuse is not None:
+            plan_state["plan_reuse"] = {
+                "source_run_id": reuse.record.get("run_id"),
+                "similarity": round(reuse.similarity, 3),
+            }
+        if skipped or deadline.degraded_agents:
+            plan_state["partial"] = {
+                "reason": deadline.reason,
+                "skipped_agents": skipped,
+                "degraded_agents": list(deadline.degraded_agents),
+            }
+            self.metrics.counter(
+                "partial_runs_total", "Runs cut short by their deadline", labelnames=("reason",)
+            ).labels(reason=deadline.reason or "deadline").inc()
+            log_event(
+                self.logger,
+                "Run hit its deadline; returning a partial plan",
+                level="warning",
+                context={"run_id": run_id, **plan_state["partial"]},
+            )
+        elif reuse is None and self.plan_index is not None:
+            self._remember_plan(run_id, plan_state)
+        if profiler is not None:
+            plan_state["profile"] = profiler.close()
+        if ledger is not None:
+            plan_state["token_usage"] = ledger.summary()
+            if ledger.budget_exceeded:
+                log_event(
+                    self.logger,
+                    "Run exceeded its token budget; later agents used stub responses",
+                    level="warning",
+                    context={"run_id": run_id, "degraded_calls": ledger.degraded_calls},
+                )
 
-        self.metrics.emit()
-        self.tracer.flush()
+        plan_store_path = self._persist_plan(run_id, plan_state)
+        return ConciergeResult(run_id=run_id, plan=plan_state, plan_store_path=plan_store_path)
 
-        artifact_path = self._persist_plan(run_id, plan_state)
-        return ConciergeResult(run_id=run_id, plan=plan_state, artifact_path=artifact_path)
+    def _match_prior_plan(self, persona: Dict[str, Any]) -> Optional[PlanMatch]:
+        if self.plan_index is None:
+            return None
+        match = self.plan_index.best_reusable(
+            persona,
+            min_similarity=self.config.memory.plan_reuse_similarity,
+            min_score=self.config.memory.plan_reuse_min_score,
+        )
+        lookups = self.metrics.counter("plan_reuse_lookups_total", "Plan reuse lookups")
+        hits = self.metrics.counter("plan_reuse_hits_total", "Runs served from a prior plan")
+        lookups.inc()
+        if match is not None:
+            hits.inc()
+        self.metrics.gauge("plan_reuse_rate", "Share of runs served from a prior plan").set(
+            round(hits.value / lookups.value, 4)
+        )
+        return match
+
+    def _remember_plan(self, run_id: str, plan: Dict[str, Any]) -> None:
+        record = {
+            "run_id": run_id,
+            "persona": plan["persona"],
+            "average_score": plan.get("average_score", 0),
+            "responses": {agent: plan.get(key, "") for agent, key in _REUSABLE_RESPONSES.items()},
+        }
+        self.long_term_memory.append_to_list("plan_library", record)
+        self.plan_index.add(record)  # type: ignore[union-attr]
 
     def _persist_plan(self, run_id: str, plan: Dict) -> Path:
-        path = self.config.observability.logs_path.parent / "plans" / f"{run_id}.json"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
-        return path
+        self.plan_store.put(run_id, plan)
+        self.metrics.gauge("plan_store_pending", "Plans queued for the plan store").set(
+            self.plan_store.pending
+        )
+        return self.plan_store.path
 
@@ -0,0 +1,129 @@
+"""
+Local similarity index over past plans stored in long-term memory.
+
+Persona text is embedded with the hashing trick (signed unigram and bigram
+features, log term frequency, L2-normalized) into a fixed-width NumPy matrix,
+so top-k cosine search is a single matrix-vector product with no external
+service or fitted vocabulary.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class PlanMatch:
+    similarity: float
+    record: Dict[str, Any]
+
+
+def persona_text(persona: Dict[str, Any]) -> str:
+    return " ".join(
+        str(persona.get(field, ""))
+        for field in ("city", "state", "initiative", "scale", "community_profile")
+    )
+
+
+def embed(text: str, dim: int) -> np.ndarray:
+    """Hashing-trick embedding; stable across processes unlike ``hash()``."""
+    vector = np.zeros(dim, dtype=np.float32)
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if digest & 0x80000000 else -1.0
+        vector[digest % dim] += sign
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+class PlanIndex:
+    """
+    Append-only cosine-similarity index of plan records keyed by persona text.
+    """
+
+    def __init__(self, dim: int = 1024) -> None:
+        self.dim = dim
+        self._matrix = np.zeros((64, dim), dtype=np.float32)
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], dim: int = 1024) -> "PlanIndex":
+        index = cls(dim)
+        for record in records:
+            index.add(record)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        vector = embed(persona_text(record.get("persona", {})), self.dim)
+        with self._lock:
+            size = len(self._records)
+            if size == self._matrix.shape[0]:
+                grown = np.zeros((size * 2, self.dim), dtype=np.float32)
+                grown[:size] = self._matrix
+                self._matrix = grown
+            self._matrix[size] = vector
+            self._records.append(record)
+
+    def search(self, persona: Dict[str, Any], k: int = 5) -> List[PlanMatch]:
+        query = embed(persona_text(persona), self.dim)
+        with self._lock:
+            size = len(self._records)
+            if not size:
+                return []
+            scores = self._matrix[:size] @ query
+            records = self._records[:size]
+        k = min(k, size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [PlanMatch(similarity=float(scores[i]), record=records[i]) for i in top]
+
+    def best_reusable(
+        self,
+        persona: Dict[str, Any],
+        *,
+        min_similarity: float,
+        min_score: float,
+        k: int = 5,
+    ) -> Optional[PlanMatch]:
+        """
+        Return the closest well-scored plan for the same city, state and scale.
+
+        Geography and scale must match exactly because the civic data, grants
+        and impact numbers quoted in a plan depend on them.
+        """
+
+        wanted = _reuse_key(persona)
+        for match in self.search(persona, k=k):
+            if match.similarity < min_similarity:
+                break
+            record = match.record
+            if record.get("average_score", 0) < min_score:
+                continue
+            if _reuse_key(record.get("persona", {})) == wanted:
+                return match
+        return None
+
+
+def _reuse_key(persona: Dict[str, Any]) -> tuple:
+    return (
+        str(persona.get("city", "")).strip().lower(),
+        str(persona.get("state", "")).strip().upper(),
+        str(persona.get("scale", "")).strip().lower(),
+    )
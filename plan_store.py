@@ -0,0 +1,336 @@
+"""
+Indexed, compressed store for run plans.
+
+Every plan is one row of a SQLite database: the plan as zlib-compressed
+compact JSON, next to the columns it is looked up by. Those are ``run_id``,
+city and state, initiative category (``impact_simulator.initiative_category``)
+and creation time. WAL mode lets several worker processes write the same
+file while readers query it.
+
+With ``write_behind`` (the default), ``put`` only queues the plan. A writer
+thread commits queued plans in batches, so persistence leaves the request
+path. ``get`` still sees queued plans. ``query`` and ``export`` flush the
+queue first. A full queue blocks ``put`` rather than growing without bound.
+
+Query or export from the command line, or import the per-run JSON files
+written by older versions::
+
+    python -m projects.climate_concierge.src.memory.plan_store query \
+        --city Fresno --since 2026-09-01
+    python -m projects.climate_concierge.src.memory.plan_store export \
+        plans.jsonl.gz --category solar
+    python -m projects.climate_concierge.src.memory.plan_store import run_artifacts/plans
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import load_config
+from ..observability.logger import log_event
+from ..tools.impact_simulator import initiative_category
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS plans (
+        run_id TEXT PRIMARY KEY,
+        created_at REAL NOT NULL,
+        city TEXT COLLATE NOCASE,
+        state TEXT COLLATE NOCASE,
+        category TEXT,
+        average_score REAL,
+        plan BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS plans_by_city ON plans (city, state, created_at)",
+    "CREATE INDEX IF NOT EXISTS plans_by_category ON plans (category, created_at)",
+    "CREATE INDEX IF NOT EXISTS plans_by_time ON plans (created_at)",
+)
+_COLUMNS = ("run_id", "created_at", "city", "state", "category", "average_score")
+_WRITE_BATCH = 64  # plans per commit
+
+# run_id, created_at, city, state, category, average_score, compressed plan
+Row = Tuple[str, float, Optional[str], Optional[str], str, Optional[float], bytes]
+
+
+def encode_plan(plan: Dict[str, Any]) -> bytes:
+    text = json.dumps(plan, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decode_plan(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class PlanStore:
+    """Plans by ``run_id`` in one SQLite file, indexed for ``query``."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        write_behind: bool = True,
+        queue_size: int = 1000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.path = path
+        self.write_behind = write_behind
+        self.logger = logger
+        self.failed = 0  # plans the writer could not commit
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._connect()
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        self._conn_lock = threading.Lock()
+        self._pending: Dict[str, Row] = {}
+        self._pending_lock = threading.Lock()
+        # Orders enqueues against close(). Separate from _pending_lock, which the
+        # writer needs while a put may be blocked on a full queue.
+        self._enqueue_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Plans queued but not yet committed."""
+        return len(self._pending)
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._conn_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+
+    def put(
+        self, run_id: str, plan: Dict[str, Any], *, created_at: Optional[float] = None
+    ) -> None:
+        row = self._row(run_id, plan, time.time() if created_at is None else created_at)
+        if not self.write_behind:
+            self._check_open()
+            self._write([row])
+            return
+        with self._enqueue_lock:
+            self._check_open()  # no writer would ever commit it
+            with self._pending_lock:
+                self._pending[run_id] = row
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._drain, name="plan-store-writer", daemon=True
+                )
+                self._writer.start()
+            self._queue.put(run_id)  # ahead of close()'s sentinel
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        row = self._pending.get(run_id)
+        if row is not None:
+            return decode_plan(row[-1])
+        with self._conn_lock:
+            found = self._conn.execute(
+                "SELECT plan FROM plans WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return decode_plan(found[0]) if found else None
+
+    def query(
+        self,
+        *,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+        include_plan: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Index columns (and the plan with ``include_plan``) of matching runs,
+        newest first. ``since``/``until`` are epoch seconds, ``until`` exclusive.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("city", city), ("state", state), ("category", category)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        sql = f"SELECT {', '.join(_COLUMNS)}{', plan' if include_plan else ''} FROM plans"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        self.flush()
+        # A connection of its own, so a long export doesn't hold up the writer.
+        conn = self._connect()
+        try:
+            for row in conn.execute(sql, params):
+                entry = dict(zip(_COLUMNS, row))
+                if include_plan:
+                    entry["plan"] = decode_plan(row[-1])
+                yield entry
+        finally:
+            conn.close()
+
+    def export(self, output: Path, **filters: Any) -> int:
+        """Write matching runs, plan included, as gzipped JSON lines; returns the count."""
+        output.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with gzip.open(output, "wt", encoding="utf-8") as sink:
+            for entry in self.query(include_plan=True, **filters):
+                sink.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_files(self, plans_dir: Path) -> int:
+        """Load per-run ``<run_id>.json`` files, dated by mtime; runs already stored are kept."""
+        rows = (
+            self._row(path.stem, json.loads(path.read_text(encoding="utf-8")), path.stat().st_mtime)
+            for path in sorted(plans_dir.glob("*.json"))
+        )
+        with self._conn_lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO plans VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._conn.total_changes - before
+
+    def flush(self) -> None:
+        """Block until every queued plan is committed (or has failed)."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Commit queued plans and close; a later ``put`` raises ``RuntimeError``."""
+        with self._enqueue_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._conn_lock:
+            self._conn.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError(f"Plan store {self.path} is closed")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _row(run_id: str, plan: Dict[str, Any], created_at: float) -> Row:
+        persona = plan.get("persona") or {}
+        return (
+            run_id,
+            created_at,
+            persona.get("city"),
+            persona.get("state"),
+            initiative_category(persona.get("initiative") or ""),
+            plan.get("average_score"),
+            encode_plan(plan),
+        )
+
+    def _write(self, rows: List[Row]) -> None:
+        with self._conn_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def _drain(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            # A run_id put twice is queued twice; its latest row goes out with the first.
+            queued = ((run_id, self._pending.get(run_id)) for run_id in batch if run_id is not None)
+            rows = {run_id: row for run_id, row in queued if row is not None}
+            try:
+                if rows:
+                    self._write(list(rows.values()))
+            except Exception as exc:  # noqa: BLE001 - keep draining so flush() returns
+                self.failed += len(rows)
+                if self.logger is not None:
+                    log_event(
+                        self.logger,
+                        "Failed to store plans",
+                        level="error",
+                        context={"run_ids": list(rows), "error": str(exc)},
+                    )
+            finally:
+                with self._pending_lock:
+                    for run_id, row in rows.items():
+                        if self._pending.get(run_id) is row:  # not replaced meanwhile
+                            del self._pending[run_id]
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query, export or import stored plans")
+    parser.add_argument("--store", type=Path, help="Plan store (default PLAN_STORE_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("query", "List matching runs"),
+        ("export", "Write matching plans as .jsonl.gz"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        if name == "export":
+            command.add_argument("output", type=Path)
+        command.add_argument("--city")
+        command.add_argument("--state")
+        command.add_argument("--category", help="solar | tree_canopy | mobility | general")
+        command.add_argument("--since", type=_timestamp, help="ISO date or time, inclusive")
+        command.add_argument("--until", type=_timestamp, help="ISO date or time, exclusive")
+        command.add_argument("--limit", type=int)
+    legacy = commands.add_parser("import", help="Load per-run JSON files from a plans directory")
+    legacy.add_argument("plans_dir", type=Path)
+    args = parser.parse_args()
+
+    store = PlanStore(args.store or load_config().memory.plan_store_path, write_behind=False)
+    try:
+        if args.command == "import":
+            imported = store.import_files(args.plans_dir)
+            print(json.dumps({"imported": imported, "stored": len(store)}))
+            return
+        keys = ("city", "state", "category", "since", "until", "limit")
+        filters = {key: getattr(args, key) for key in keys}
+        if args.command == "export":
+            exported = store.export(args.output, **filters)
+            print(json.dumps({"exported": exported, "output": str(args.output)}))
+            return
+        for entry in store.query(**filters):
+            print(json.dumps(entry))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
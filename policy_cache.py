@@ -0,0 +1,92 @@
+"""
+Precomputed per-city policy summaries, keyed by civic dataset version.
+
+The metrics half of the policy researcher's prompt depends only on the city
+and the dataset, so ``policy_warmup`` generates it once per (city, state)
+ahead of traffic and stores it here. Entries are keyed by
+``CivicDataTool.dataset_version``; a new dataset simply misses until the
+warmup job has run against it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+
+class PolicySummaryCache:
+    """
+    JSON-file cache shared by every orchestrator in the process. Reads pick up
+    a file rewritten by a warmup job running elsewhere, checking its mtime at
+    most every ``reload_interval`` seconds. Writes are held in memory until
+    ``save`` and survive reloads in the meantime.
+    """
+
+    def __init__(self, path: Path, *, reload_interval: float = 5.0) -> None:
+        self.path = path
+        self.reload_interval = reload_interval
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._unsaved: Set[str] = set()
+        self._mtime: Optional[float] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._reload()
+
+    @staticmethod
+    def key(version: str, city: str, state: str) -> str:
+        return f"{version}:{city.strip().lower()}|{state.strip().upper()}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, version: str, city: str, state: str) -> Optional[str]:
+        self._reload()
+        entry = self._entries.get(self.key(version, city, state))
+        return entry["summary"] if entry else None
+
+    def put(self, version: str, city: str, state: str, summary: str) -> None:
+        key = self.key(version, city, state)
+        with self._lock:
+            self._entries[key] = {"summary": summary, "generated_at": time.time()}
+            self._unsaved.add(key)
+
+    def prune(self, version: str) -> int:
+        """Drop entries for other dataset versions; returns how many."""
+        with self._lock:
+            stale = [key for key in self._entries if not key.startswith(f"{version}:")]
+            for key in stale:
+                del self._entries[key]
+                self._unsaved.discard(key)
+        return len(stale)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps(self._entries, ensure_ascii=False)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.path)  # readers never see a half-written file
+            self._mtime = self.path.stat().st_mtime
+            self._unsaved.clear()
+
+    def _reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        loaded = json.loads(self.path.read_text(encoding="utf-8"))
+        with self._lock:
+            unsaved = {key: self._entries[key] for key in self._unsaved if key in self._entries}
+            self._entries.update(loaded)
+            self._entries.update(unsaved)
+            self._mtime = mtime
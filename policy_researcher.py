@@ -4,17 +4,39 @@ Policy researcher agent uses civic data and LLM summarization.
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 from .base import AgentContext, AgentResult, BaseAgent
+from ..memory.policy_cache import PolicySummaryCache
 from ..tools import CivicDataTool
 
 
+def metrics_text(profile: Dict[str, Any]) -> str:
+    return "\n".join(
+        f"- {m['sector'].title()} {m['metric'].replace('_', ' ')}: "
+        f"{m['value']} {m['unit']} ({m['year']})"
+        for m in profile.get("metrics", [])
+    ) or "No local metrics available."
+
+
+def city_summary_prompt(profile: Dict[str, Any]) -> str:
+    """The community-independent half of the summary, precomputed by ``policy_warmup``."""
+    return (
+        f"Summarize the following civic climate metrics for {profile['city']}, {profile['state']} "
+        "and suggest two policy considerations.\n"
+        f"{metrics_text(profile)}"
+    )
+
+
 class PolicyResearcherAgent(BaseAgent):
     name = "policy-researcher"
+    inputs = ("persona.city", "persona.state", "persona.community_profile")
 
-    def __init__(self, civic_tool: CivicDataTool):
+    def __init__(
+        self, civic_tool: CivicDataTool, summary_cache: Optional[PolicySummaryCache] = None
+    ) -> None:
         self.civic_tool = civic_tool
+        self.summary_cache = summary_cache
 
     def run(self, context: AgentContext, state: Dict[str, Any]) -> AgentResult:
         persona = state["persona"]
@@ -23,25 +45,44 @@ class PolicyResearcherAgent(BaseAgent):
         self._log(context, "Fetching civic data", city=city, state=state_code)
         profile = self.civic_tool.city_profile(city, state_code)
 
-        metrics_text = "\n".join(
-            f"- {m['sector'].title()} {m['metric'].replace('_', ' ')}: {m['value']} {m['unit']} ({m['year']})"
-            for m in profile.get("metrics", [])
-        )
-        prompt = (
-            "Summarize the following civic climate metrics and suggest two policy considerations.\n"
-            f"{metrics_text or 'No local metrics available.'}\n"
-            f"Community notes: {persona['community_profile']}"
-        )
-        summary = context.llm.generate(prompt, agent=self.name)
-        recommendations = self._extract_recommendations(summary)
+        city_summary = self._cached_summary(context, city, state_code)
+        if city_summary is None:
+            prompt = (
+                "Summarize the following civic climate metrics and suggest two policy "
+                "considerations.\n"
+                f"{metrics_text(profile)}\n"
+                f"Community notes: {persona['community_profile']}"
+            )
+            response = summary = context.llm.generate(prompt, agent=self.name)
+            recommendations = self._extract_recommendations(summary)
+        else:
+            prompt = (
+                "Suggest one or two policy considerations, as '-' bullets, for a climate "
+                f"initiative in {city}, {state_code} specific to this community.\n"
+                f"Community notes: {persona['community_profile']}"
+            )
+            response = context.llm.generate(prompt, agent=self.name)
+            summary = f"{city_summary}\n\nCommunity considerations:\n{response}"
+            # Community-specific bullets first, then the city-wide ones.
+            recommendations = self._extract_recommendations(f"{response}\n{city_summary}")
 
         payload = {
             "civic_profile": profile,
             "policy_summary": summary,
             "policy_recommendations": recommendations,
+            "policy_response": response,
         }
         return AgentResult(agent=self.name, payload=payload)
 
+    def _cached_summary(self, context: AgentContext, city: str, state_code: str) -> Optional[str]:
+        if self.summary_cache is None:
+            return None
+        summary = self.summary_cache.get(self.civic_tool.dataset_version, city, state_code)
+        context.metrics.counter(
+            "policy_summary_cache_total", "Policy summary cache lookups", labelnames=("result",)
+        ).labels(result="miss" if summary is None else "hit").inc()
+        return summary
+
     @staticmethod
     def _extract_recommendations(summary: str) -> List[str]:
         bullet_points = []
@@ -0,0 +1,86 @@
+"""
+Warm the per-city policy summary cache ahead of traffic.
+
+Generates ``city_summary_prompt`` for every (city, state) in the civic
+dataset, at most ``--concurrency`` LLM calls at a time, and stores each
+summary under the current ``CivicDataTool.dataset_version``. Cities already
+cached for this version are skipped, so re-running after an interruption
+or a partial failure only fills the gaps; ``--refresh`` regenerates all.
+Entries for older dataset versions are dropped::
+
+    python -m projects.climate_concierge.src.policy_warmup --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Set
+
+from .agents.policy_researcher import PolicyResearcherAgent, city_summary_prompt
+from .config import load_config
+from .orchestrator import ClimateConciergeOrchestrator
+
+_SAVE_EVERY = 100  # summaries between cache saves, so an interrupted run keeps its progress
+
+
+def warm_policy_cache(
+    orchestrator: ClimateConciergeOrchestrator, *, concurrency: int = 8, refresh: bool = False
+) -> Dict[str, Any]:
+    """Returns the dataset version and generated/cached/failed counts."""
+    civic_tool = orchestrator.civic_tool
+    cache = orchestrator.policy_cache
+    llm = orchestrator.llm_client
+    version = civic_tool.dataset_version
+    cache.prune(version)
+    counts = {"generated": 0, "cached": 0, "failed": 0}
+
+    def generate(profile: Dict[str, Any]) -> bool:
+        summary = llm.generate(city_summary_prompt(profile), agent=PolicyResearcherAgent.name)
+        if llm.last_outcome() != "ok":
+            return False  # don't cache a stub fallback
+        cache.put(version, profile["city"], profile["state"], summary)
+        return True
+
+    def collect(finished: Set[Future]) -> None:
+        for future in finished:
+            if future.result():
+                counts["generated"] += 1
+                if counts["generated"] % _SAVE_EVERY == 0:
+                    cache.save()
+            else:
+                counts["failed"] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="policy-warmup") as pool:
+        pending: Set[Future] = set()
+        for profile in civic_tool.city_profiles():
+            if not refresh and cache.get(version, profile["city"], profile["state"]) is not None:
+                counts["cached"] += 1
+                continue
+            if len(pending) >= concurrency * 2:  # stream: keep only a small window in flight
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+            pending.add(pool.submit(generate, profile))
+        collect(wait(pending).done)
+    cache.save()
+    return {"dataset_version": version, **counts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute per-city policy summaries")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM calls in flight")
+    parser.add_argument("--refresh", action="store_true", help="Regenerate cities already cached")
+    args = parser.parse_args()
+
+    orchestrator = ClimateConciergeOrchestrator(load_config())
+    try:
+        report = warm_policy_cache(orchestrator, concurrency=args.concurrency, refresh=args.refresh)
+    finally:
+        orchestrator.close()
+    cache_path = orchestrator.config.memory.policy_cache_path
+    print(json.dumps({"cache": str(cache_path), **report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Pre-fork HTTP server for the Climate Concierge.
+
+The master process loads the configuration, the civic dataset, the grant
+catalog, the memory bank and the plan index once (``SharedResources``). It
+then calls ``gc.freeze()`` and forks the workers. Workers inherit that state
+copy-on-write. Each one builds its own orchestrator around it, with its own
+logger, metrics, tracer, ``SessionStore`` and LLM client, because threads,
+locks and network clients do not survive ``fork()``. All workers accept
+connections from one listening socket that the master binds. A worker that
+dies is respawned. Each worker writes to the memory bank under a file lock
+and merges what the other workers have flushed (see ``LongTermMemory``), so
+no worker's evaluations or plan library entries are overwritten.
+
+Following the ``gc`` documentation, the master disables collection while it
+loads, so freed objects don't leave holes in pages that are about to be
+shared. ``gc.freeze()`` moves every live object into the permanent
+generation, so collections in a worker never write to the inherited objects'
+GC headers. Workers re-enable the collector. Reference counting still
+dirties the pages of Python objects that a worker touches (the grant catalog
+dicts, for example). The civic DataFrame's column buffers are never
+refcounted and stay shared.
+
+Each worker runs a ``server.ConciergeService`` (admission control,
+deadlines, ``/healthz`` and ``/readyz``); limits such as ``max_in_flight``
+apply per worker::
+
+    python -m projects.climate_concierge.src.prefork --workers 4 --port 8080
+
+Per-worker memory comes from ``process_memory``; see
+``benchmarks/bench_prefork.py`` for a preload vs. no-preload comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from dataclasses import replace
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .config import ConciergeConfig, load_config
+from .observability.logger import get_logger, log_event
+from .orchestrator import ClimateConciergeOrchestrator, SharedResources
+from .server import ConciergeService, build_http_server, serve
+
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    Resident memory of ``pid`` in kB from ``/proc/<pid>/smaps_rollup``:
+    ``Rss``, ``Pss`` (shared pages split between their sharers), and the
+    shared/private clean/dirty split. Empty where the file is unavailable
+    (non-Linux).
+    """
+    try:
+        lines = Path(f"/proc/{pid}/smaps_rollup").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    usage = {}
+    for line in lines:
+        key, _, rest = line.partition(":")
+        if key in _SMAPS_FIELDS:
+            usage[key] = int(rest.split()[0])
+    return usage
+
+
+def worker_config(config: ConciergeConfig, index: int) -> ConciergeConfig:
+    """
+    Give each worker its own log directory, trace and metrics files, and
+    metrics port (offset by ``index``), so workers don't interleave writes.
+    """
+    obs = config.observability
+
+    def tagged(path: Path) -> Path:
+        return path.with_name(f"{path.stem}.worker{index}{path.suffix}")
+
+    observability = replace(
+        obs,
+        logs_path=obs.logs_path / f"worker{index}",
+        traces_path=tagged(obs.traces_path),
+        metrics_path=tagged(obs.metrics_path),
+        metrics_port=None if obs.metrics_port is None else obs.metrics_port + index,
+    )
+    return replace(config, observability=observability)
+
+
+class PreforkServer:
+    """
+    Master process for ``workers`` forked HTTP workers. ``preload=False``
+    skips loading in the master, so each worker reads its own copy of the
+    datasets (the baseline for memory comparisons). ``llm_backend`` is passed
+    to every worker's orchestrator.
+    """
+
+    def __init__(
+        self,
+        config: Optional[ConciergeConfig] = None,
+        *,
+        workers: Optional[int] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        preload: Optional[bool] = None,
+        llm_backend: Any = None,
+    ) -> None:
+        self.config = config or load_config()
+        server = self.config.server
+        self.workers = workers if workers is not None else server.workers
+        self.host = host if host is not None else server.host
+        self.port = port if port is not None else server.port
+        self.preload = server.preload if preload is None else preload
+        self.llm_backend = llm_backend
+        self.shared: Optional[SharedResources] = None
+        self.logger = get_logger(
+            "concierge-prefork",
+            log_path=self.config.observability.logs_path / "prefork.log",
+            enable_console=self.config.observability.enable_console_logs,
+            level=self.config.observability.log_level,
+        )
+        self._socket: Optional[socket.socket] = None
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._stopping = False
+
+    @property
+    def address(self) -> tuple:
+        if self._socket is None:
+            return (self.host, self.port)
+        return self._socket.getsockname()[:2]
+
+    @property
+    def worker_pids(self) -> List[int]:
+        return sorted(self._children)
+
+    def start(self) -> "PreforkServer":
+        """Load shared state, bind the socket and fork the workers; returns immediately."""
+        gc.disable()
+        started = time.perf_counter()
+        if self.preload:
+            self.shared = SharedResources.load(self.config)
+            self._preload_llm_sdk()
+        self._socket = socket.create_server((self.host, self.port), backlog=128)
+        # Idle workers must not block in accept() after another worker won the connection.
+        self._socket.setblocking(False)
+        gc.freeze()
+        for index in range(self.workers):
+            self._spawn(index)
+        gc.enable()
+        log_event(
+            self.logger,
+            "Pre-fork master started",
+            context={
+                "address": "%s:%s" % self.address,
+                "workers": self.workers,
+                "preload": self.preload,
+                "frozen_objects": gc.get_freeze_count(),
+                "load_seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+        return self
+
+    def serve_forever(self) -> None:
+        """Run the master until SIGTERM/SIGINT, respawning workers that exit."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: self.stop())
+        self.start()
+        while not self._stopping:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            log_event(
+                self.logger,
+                "Worker exited; respawning",
+                level="warning",
+                context={"pid": pid, "worker": index, "status": status},
+            )
+            self._spawn(index)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Terminate the workers (SIGKILL after ``timeout``) and close the socket."""
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
+        deadline = time.monotonic() + timeout
+        while self._children:
+            for pid in list(self._children):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    self._children.pop(pid, None)
+                elif time.monotonic() > deadline:
+                    os.kill(pid, signal.SIGKILL)
+            time.sleep(0.05)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        gc.unfreeze()
+
+    def worker_memory(self) -> Dict[int, Dict[str, int]]:
+        return {pid: process_memory(pid) for pid in self.worker_pids}
+
+    def _preload_llm_sdk(self) -> None:
+        # Import (not configure) the SDK: its modules are shared, while its
+        # gRPC channels are created after the fork, in each worker.
+        if self.llm_backend is not None or not self.config.gemini_api_key:
+            return
+        try:
+            import_module("google.generativeai")
+        except ImportError:  # pragma: no cover - workers fall back to the stub
+            pass
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+        code = 0
+        try:
+            self._run_worker(index)
+        except BaseException:  # noqa: BLE001 - a worker must never return into the master's stack
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _run_worker(self, index: int) -> None:
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        gc.enable()
+        orchestrator = ClimateConciergeOrchestrator(
+            worker_config(self.config, index), llm_backend=self.llm_backend, shared=self.shared
+        )
+        service = ConciergeService(orchestrator, self.config.server)
+        serve(service, build_http_server(service, self.address, sock=self._socket))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the Climate Concierge with pre-forked workers"
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes (default CONCIERGE_WORKERS)")
+    parser.add_argument("--host", help="Bind address (default CONCIERGE_HOST)")
+    parser.add_argument("--port", type=int, help="Bind port (default PORT)")
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Load datasets in each worker instead of once in the master",
+    )
+    args = parser.parse_args()
+    if sys.platform == "win32":  # pragma: no cover
+        parser.error("pre-fork serving needs os.fork()")
+    PreforkServer(
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        preload=False if args.no_preload else None,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
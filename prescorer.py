@@ -0,0 +1,190 @@
+"""
+Heuristic pre-scorer for the evaluation rubric.
+
+Much of the rubric follows from structured plan state: impact estimates,
+grant amounts and match requirements, timeline owners, and which sections
+the plan text covers. ``plan_features`` turns that state into a fixed
+feature vector. Every evaluation stores it next to its scores, in the
+``evaluations`` memory list. ``PreScorer.calibrate`` fits one ridge
+regression per rubric dimension to the LLM-scored history.
+``PreScorer.predict`` returns the predicted scores and, per dimension, the
+expected error of that prediction. That is the leave-one-out RMSE of the fit,
+widened for plans far from the calibration data. ``EvaluatorAgent`` skips
+the LLM call when every expected error is within
+``EvaluationConfig.prescore_max_error``.
+
+Calibrate offline with ``evaluation/calibrate.py`` once enough runs have
+been scored by the LLM.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+RUBRIC = ("feasibility", "equity", "impact", "readiness")
+FEATURES = (
+    "co2_tonnes_log",
+    "households_log",
+    "equity_rating",
+    "frontline_focus",
+    "grant_count",
+    "grant_funding_log",
+    "grant_match_requirement",
+    "timeline_milestones",
+    "timeline_owner_coverage",
+    "plan_sections",
+    "civic_metrics",
+)
+MEMORY_KEY = "evaluation_prescorer"
+
+_EQUITY_RATINGS = {"high": 1.0, "medium": 0.5, "low": 0.0}
+_FRONTLINE_TERMS = (
+    "frontline",
+    "low-income",
+    "low income",
+    "disadvantaged",
+    "energy burden",
+    "environmental justice",
+)
+_PLAN_SECTIONS = ("goals", "workstreams", "risks", "metrics")
+
+
+def plan_features(state: Dict[str, Any]) -> Dict[str, float]:
+    """Rubric features of a plan, from the state the evaluator receives."""
+    impact = state.get("impact") or {}
+    grants = state.get("grants") or []
+    timeline = state.get("timeline") or []
+    plan_text = (state.get("plan_text") or "").lower()
+    profile = ((state.get("persona") or {}).get("community_profile") or "").lower()
+    civic = state.get("civic_profile") or {}
+    return {
+        "co2_tonnes_log": math.log1p(float(impact.get("co2_reduction_tonnes") or 0)),
+        "households_log": math.log1p(float(impact.get("households_benefiting") or 0)),
+        "equity_rating": _EQUITY_RATINGS.get(str(impact.get("equity_score", "")).lower(), 0.0),
+        "frontline_focus": float(any(term in profile for term in _FRONTLINE_TERMS)),
+        "grant_count": float(len(grants)),
+        "grant_funding_log": math.log1p(sum(float(grant.get("amount") or 0) for grant in grants)),
+        "grant_match_requirement": (
+            sum(float(grant.get("match_requirement") or 0) for grant in grants) / len(grants)
+            if grants
+            else 0.0
+        ),
+        "timeline_milestones": float(len(timeline)),
+        "timeline_owner_coverage": (
+            sum(1 for milestone in timeline if milestone.get("owner")) / len(timeline)
+            if timeline
+            else 0.0
+        ),
+        "plan_sections": (
+            sum(section in plan_text for section in _PLAN_SECTIONS) / len(_PLAN_SECTIONS)
+        ),
+        "civic_metrics": float(len(civic.get("metrics") or [])),
+    }
+
+
+@dataclass
+class Prediction:
+    scores: Dict[str, float]  # clipped to the 1-5 rubric scale
+    errors: Dict[str, float]  # expected absolute error per dimension
+
+    @property
+    def max_error(self) -> float:
+        return max(self.errors.values())
+
+    def rounded(self) -> Dict[str, int]:
+        return {dimension: int(round(score)) for dimension, score in self.scores.items()}
+
+
+@dataclass
+class PreScorer:
+    """
+    Per-dimension ridge regression over standardized ``FEATURES``. Plain
+    lists keep it JSON-serializable; ``predict`` needs no numpy.
+    """
+
+    features: List[str]
+    mean: List[float]
+    scale: List[float]
+    weights: Dict[str, List[float]]  # intercept first
+    covariance: List[List[float]]  # (Z'Z + ridge)^-1, for prediction errors
+    rmse: Dict[str, float]  # leave-one-out
+    samples: int
+
+    @classmethod
+    def calibrate(cls, records: Sequence[Dict[str, Any]], *, ridge: float = 1.0) -> "PreScorer":
+        """
+        Fit to ``evaluations`` entries that were scored by the LLM and carry
+        features; older entries without features are ignored.
+        """
+        import numpy as np
+
+        rows = calibration_records(records)
+        if len(rows) < 2:
+            raise ValueError(
+                f"need at least 2 LLM-scored evaluations with features, found {len(rows)}"
+            )
+        x = np.array([[float(row["features"][name]) for name in FEATURES] for row in rows])
+        y = np.array([[float(row["scores"][dimension]) for dimension in RUBRIC] for row in rows])
+        mean = x.mean(axis=0)
+        scale = x.std(axis=0)
+        scale[scale == 0] = 1.0
+        z = np.hstack([np.ones((len(rows), 1)), (x - mean) / scale])
+        penalty = ridge * np.eye(z.shape[1])
+        penalty[0, 0] = 0.0  # leave the intercept unpenalized
+        covariance = np.linalg.pinv(z.T @ z + penalty)
+        weights = covariance @ z.T @ y
+        leverage = np.einsum("ij,jk,ik->i", z, covariance, z)
+        residuals = (y - z @ weights) / np.clip(1 - leverage, 1e-6, None)[:, None]
+        rmse = np.sqrt((residuals**2).mean(axis=0))
+        return cls(
+            features=list(FEATURES),
+            mean=mean.tolist(),
+            scale=scale.tolist(),
+            weights={dimension: weights[:, i].tolist() for i, dimension in enumerate(RUBRIC)},
+            covariance=covariance.tolist(),
+            rmse={dimension: float(rmse[i]) for i, dimension in enumerate(RUBRIC)},
+            samples=len(rows),
+        )
+
+    def predict(self, features: Dict[str, float]) -> Prediction:
+        z = [1.0] + [
+            (float(features.get(name, 0.0)) - mean) / scale
+            for name, mean, scale in zip(self.features, self.mean, self.scale)
+        ]
+        leverage = sum(
+            z[i] * c * z[j] for i, row in enumerate(self.covariance) for j, c in enumerate(row)
+        )
+        widen = math.sqrt(1 + max(0.0, leverage))
+        scores, errors = {}, {}
+        for dimension in RUBRIC:
+            raw = sum(w * v for w, v in zip(self.weights[dimension], z))
+            scores[dimension] = min(5.0, max(1.0, raw))
+            errors[dimension] = self.rmse[dimension] * widen
+        return Prediction(scores, errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["PreScorer"]:
+        """``None`` for an empty or outdated (different feature set) calibration."""
+        if not data or data.get("features") != list(FEATURES):
+            return None
+        return cls(**data)
+
+
+def calibration_records(records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The LLM-scored ``evaluations`` entries that carry a full feature vector."""
+
+    def usable(record: Dict[str, Any]) -> bool:
+        features, scores = record.get("features"), record.get("scores") or {}
+        return (
+            record.get("source", "llm") == "llm"
+            and isinstance(features, dict)
+            and all(name in features for name in FEATURES)
+            and all(dimension in scores for dimension in RUBRIC)
+        )
+
+    return [record for record in records if usable(record)]
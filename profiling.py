@@ -0,0 +1,262 @@
+"""
+Opt-in cProfile and tracemalloc capture for individual concierge runs.
+
+A ``RunProfiler`` is created for each profiled run. Every agent call is
+profiled as a section, and the tool calls an agent makes show up inside that
+agent's profile. Each section writes ``<agent>.pstats``. Closing the profiler
+writes ``allocations.json``, which lists each agent's peak traced memory and
+its top-N allocation sites. It also merges the sections into ``run.pstats``.
+
+Compare two runs (profile directories or ``.pstats`` files) with::
+
+    python -m projects.climate_concierge.src.observability.profiling diff BASE HEAD
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import pstats
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .tracer import Span
+
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# tracemalloc is process-wide; concurrent profiled runs share one session and
+# only stop it when the last of them closes (and only if we started it).
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def _acquire_tracemalloc(frames: int) -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+class RunProfiler:
+    """
+    Collects per-agent CPU profiles and allocation diffs for one run.
+
+    Allocation numbers come from a process-wide tracemalloc session, so
+    concurrent runs on other threads show up in each other's diffs.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        *,
+        cpu: bool = True,
+        memory: bool = True,
+        top_n: int = 25,
+        frames: int = 1,
+    ) -> None:
+        self.out_dir = out_dir
+        self.cpu = cpu
+        self.memory = memory
+        self.top_n = top_n
+        self.artifacts: Dict[str, Dict[str, str]] = {}
+        self._allocations: Dict[str, Dict[str, Any]] = {}
+        self._pstats: List[Path] = []
+        self._summary: Optional[Dict[str, Any]] = None
+        if memory:
+            _acquire_tracemalloc(frames)
+
+    @contextmanager
+    def section(self, name: str, span: Optional[Span] = None) -> Iterator[None]:
+        """Profile the block as ``name``; artifact paths are set on ``span``."""
+        before = None
+        if self.memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+        profile: Optional[cProfile.Profile] = cProfile.Profile() if self.cpu else None
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError:  # another profiler already owns this thread
+                profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            links = self._save(name, profile, before)
+            if span is not None:
+                for key, value in links.items():
+                    span.set_attribute(f"profile.{key}", value)
+
+    def close(self) -> Dict[str, Any]:
+        """Write the merged artifacts and return their paths (idempotent)."""
+        if self._summary is not None:
+            return self._summary
+        if self.memory:
+            _release_tracemalloc()
+        summary: Dict[str, Any] = {"dir": str(self.out_dir), "sections": self.artifacts}
+        if self._pstats:
+            merged = pstats.Stats(*(str(path) for path in self._pstats))
+            path = self.out_dir / "run.pstats"
+            merged.dump_stats(str(path))
+            summary["pstats"] = str(path)
+        if self._allocations:
+            path = self.out_dir / "allocations.json"
+            path.write_text(json.dumps(self._allocations, indent=2), encoding="utf-8")
+            summary["allocations"] = str(path)
+        self._summary = summary
+        return summary
+
+    def _save(
+        self,
+        name: str,
+        profile: Optional[cProfile.Profile],
+        before: Optional[tracemalloc.Snapshot],
+    ) -> Dict[str, str]:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        links: Dict[str, str] = {}
+        if profile is not None:
+            path = self.out_dir / f"{_slug(name)}.pstats"
+            profile.dump_stats(str(path))
+            self._pstats.append(path)
+            links["pstats"] = str(path)
+        if before is not None:
+            peak = tracemalloc.get_traced_memory()[1]
+            after = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+            diff = after.compare_to(before, "lineno")
+            self._allocations[name] = {
+                "peak_traced_bytes": peak,
+                "net_bytes": sum(stat.size_diff for stat in diff),
+                "top": [
+                    {
+                        "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "size_diff": stat.size_diff,
+                        "count_diff": stat.count_diff,
+                        "size": stat.size,
+                    }
+                    for stat in diff[: self.top_n]
+                ],
+            }
+            links["allocations"] = str(self.out_dir / "allocations.json")
+        self.artifacts[name] = links
+        return links
+
+
+@dataclass
+class ProfileDelta:
+    function: str
+    calls_before: int
+    calls_after: int
+    seconds_before: float
+    seconds_after: float
+
+    @property
+    def delta(self) -> float:
+        return self.seconds_after - self.seconds_before
+
+
+_METRICS = {"tottime": 2, "cumtime": 3}
+
+
+def load_stats(path: Path) -> pstats.Stats:
+    """Load a ``.pstats`` file, or a run's profile directory."""
+    if path.is_dir():
+        merged = path / "run.pstats"
+        files = [merged] if merged.exists() else sorted(path.glob("*.pstats"))
+        if not files:
+            raise FileNotFoundError(f"No .pstats files in {path}")
+        return pstats.Stats(*(str(file) for file in files))
+    return pstats.Stats(str(path))
+
+
+def _function_label(key: Tuple[str, int, str]) -> str:
+    filename, line, func = key
+    if filename == "~":  # built-ins
+        return func
+    return f"{Path(filename).name}:{line}({func})"
+
+
+def diff_profiles(
+    base: pstats.Stats, head: pstats.Stats, *, sort: str = "tottime", limit: int = 30
+) -> List[ProfileDelta]:
+    """Functions whose ``sort`` time changed most between two profiles."""
+    index = _METRICS[sort]
+    before: Dict[Any, Any] = base.stats  # type: ignore[attr-defined]
+    after: Dict[Any, Any] = head.stats  # type: ignore[attr-defined]
+    deltas = []
+    for key in before.keys() | after.keys():
+        old = before.get(key, (0, 0, 0.0, 0.0))
+        new = after.get(key, (0, 0, 0.0, 0.0))
+        deltas.append(
+            ProfileDelta(
+                function=_function_label(key),
+                calls_before=old[1],
+                calls_after=new[1],
+                seconds_before=old[index],
+                seconds_after=new[index],
+            )
+        )
+    deltas.sort(key=lambda item: abs(item.delta), reverse=True)
+    return deltas[:limit]
+
+
+def _format_diff(base: pstats.Stats, head: pstats.Stats, deltas: List[ProfileDelta]) -> str:
+    total_before = base.total_tt  # type: ignore[attr-defined]
+    total_after = head.total_tt  # type: ignore[attr-defined]
+    change = (total_after - total_before) / total_before * 100 if total_before else 0.0
+    lines = [
+        f"total: {total_before:.4f}s -> {total_after:.4f}s ({change:+.1f}%)",
+        f"{'before':>10} {'after':>10} {'delta':>10} {'calls':>15}  function",
+    ]
+    for item in deltas:
+        calls = f"{item.calls_before}->{item.calls_after}"
+        lines.append(
+            f"{item.seconds_before:10.4f} {item.seconds_after:10.4f} {item.delta:+10.4f} "
+            f"{calls:>15}  {item.function}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect Climate Concierge run profiles")
+    commands = parser.add_subparsers(dest="command", required=True)
+    diff = commands.add_parser("diff", help="Compare two profiles (files or run directories)")
+    diff.add_argument("base", type=Path)
+    diff.add_argument("head", type=Path)
+    diff.add_argument("--sort", choices=sorted(_METRICS), default="tottime")
+    diff.add_argument("--limit", type=int, default=30)
+    args = parser.parse_args()
+
+    base, head = load_stats(args.base), load_stats(args.head)
+    print(_format_diff(base, head, diff_profiles(base, head, sort=args.sort, limit=args.limit)))
+
+
+if __name__ == "__main__":
+    main()
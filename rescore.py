@@ -0,0 +1,321 @@
+"""
+Offline re-scoring of stored plans after the rubric or ``EVALUATOR_PROMPT`` changes.
+
+Plans are streamed from the plan store, then from the ``evaluations``
+memory list. A memory entry whose plan text already came from the store
+is skipped. Each plan is scored by ``EvaluatorAgent``
+through the configured LLM, on ``--workers`` threads, with LLM calls paced
+to ``--max-qps``. The pre-scorer is bypassed: the evaluator sees an empty
+scratch memory, which also keeps re-scored evaluations out of the memory
+bank.
+
+Every scored plan is appended to a JSONL checkpoint. An interrupted run
+resumes where it stopped, and plans whose LLM call failed are retried on the
+next run. The results are then written as a compressed columnar ``.npz``
+(one array per column, loadable with ``numpy.load`` or into a DataFrame).
+The report compares score distributions between the stored rubric and the
+current one, or between two result files (``--baseline``)::
+
+    python -m projects.climate_concierge.src.evaluation.rescore --workers 8 --max-qps 5 \\
+        --output rescore/v2.npz --baseline rescore/v1.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, cast
+
+import numpy as np
+
+from ..agents.base import AgentContext
+from ..config import ConciergeConfig, load_config
+from ..memory import LongTermMemory, SessionMemory
+from ..memory.plan_store import PlanStore
+from ..orchestrator import ClimateConciergeOrchestrator, LLMClient
+from .evaluator import EvaluatorAgent
+from .prescorer import RUBRIC
+from .prompts import EVALUATOR_PROMPT
+
+RUBRIC_VERSION = hashlib.sha256(EVALUATOR_PROMPT.encode("utf-8")).hexdigest()[:12]
+_TEXT_KEY_CHARS = 5000  # evaluations memory keeps this much plan text
+
+
+@dataclass
+class PlanRecord:
+    plan_id: str  # run id, or "evaluations:<index>" for memory-only plans
+    source: str  # store | memory
+    state: Dict[str, Any]  # evaluator input
+    scores: Dict[str, Any]  # as stored, under the rubric of the time
+
+
+def _text_key(plan_text: str) -> str:
+    return hashlib.sha256(plan_text[:_TEXT_KEY_CHARS].encode("utf-8")).hexdigest()
+
+
+def iter_plans(store: PlanStore, memory: LongTermMemory) -> Iterator[PlanRecord]:
+    """Scored plans from the plan store, then the memory-only remainder."""
+    seen: Set[str] = set()
+    for entry in store.query(include_plan=True):
+        plan = entry["plan"]
+        if not plan.get("plan_text") or not plan.get("scores"):
+            continue  # partial runs that never reached the evaluator
+        seen.add(_text_key(plan["plan_text"]))
+        yield PlanRecord(entry["run_id"], "store", plan, plan["scores"])
+    for index, item in enumerate(memory.list("evaluations")):
+        plan_text = item.get("plan_text")
+        if not plan_text or _text_key(plan_text) in seen:
+            continue
+        seen.add(_text_key(plan_text))
+        yield PlanRecord(
+            f"evaluations:{index}", "memory", {"plan_text": plan_text}, item.get("scores", {})
+        )
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _RateLimitedLLM:
+    def __init__(self, llm: LLMClient, limiter: Optional[RateLimiter]) -> None:
+        self.llm = llm
+        self.limiter = limiter
+
+    def generate(self, prompt: str, *, agent: str) -> str:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return self.llm.generate(prompt, agent=agent)
+
+    def last_outcome(self) -> Optional[str]:
+        return self.llm.last_outcome()
+
+
+class _ScratchMemory(LongTermMemory):
+    """Empty, write-nothing memory: no pre-scorer calibration, no new evaluations."""
+
+    def __post_init__(self) -> None:
+        return
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        return
+
+    def append_to_list(self, key: str, value: Dict[str, Any]) -> None:
+        return
+
+    def _flush(self) -> None:
+        return
+
+
+class Rescorer:
+    """Scores ``PlanRecord``s with ``EvaluatorAgent`` and checkpoints each result."""
+
+    def __init__(
+        self,
+        config: ConciergeConfig,
+        *,
+        workers: int = 4,
+        max_qps: Optional[float] = None,
+        llm_backend: Any = None,
+    ) -> None:
+        self.orchestrator = ClimateConciergeOrchestrator(config, llm_backend=llm_backend)
+        self.workers = workers
+        self.evaluator = EvaluatorAgent()
+        self.llm = _RateLimitedLLM(
+            self.orchestrator.llm_client, RateLimiter(max_qps) if max_qps else None
+        )
+        self.memory = _ScratchMemory(Path("rescore-scratch.json"))
+
+    def run(self, records: Iterable[PlanRecord], checkpoint: Path) -> Dict[str, int]:
+        """Score every record not yet in ``checkpoint``; returns scored/resumed/failed counts."""
+        done = {row["plan_id"] for row in read_checkpoint(checkpoint)}
+        counts = {"scored": 0, "resumed": 0, "failed": 0}
+        checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        with checkpoint.open("a", encoding="utf-8") as sink, ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="rescore"
+        ) as pool:
+
+            # Results are collected on this thread only, so checkpoint writes don't interleave.
+            def collect(finished: Iterable[Future]) -> None:
+                for future in finished:
+                    row = future.result()
+                    if row is None:
+                        counts["failed"] += 1
+                        continue
+                    sink.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    sink.flush()
+                    counts["scored"] += 1
+
+            pending: Set[Future] = set()
+            for record in records:
+                if record.plan_id in done:
+                    counts["resumed"] += 1
+                    continue
+                if len(pending) >= self.workers * 2:  # stream: keep only a small window in flight
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending.add(pool.submit(self._score, record))
+            collect(wait(pending).done)
+        return counts
+
+    def close(self) -> None:
+        self.orchestrator.close()
+
+    def _score(self, record: PlanRecord) -> Optional[Dict[str, Any]]:
+        context = AgentContext(
+            session=SessionMemory(session_id=f"rescore-{record.plan_id}"),
+            long_term_memory=self.memory,
+            config=self.orchestrator.config,
+            metrics=self.orchestrator.metrics,
+            tracer=self.orchestrator.tracer,
+            logger=self.orchestrator.logger,
+            llm=self.llm,
+        )
+        scores = self.evaluator.run(context, record.state).payload["scores"]
+        if self.orchestrator.llm_client.last_outcome() != "ok":
+            return None  # stub output: retry on the next run rather than record it
+        return {
+            "plan_id": record.plan_id,
+            "source": record.source,
+            "rubric_version": RUBRIC_VERSION,
+            "old": {dimension: record.scores.get(dimension) for dimension in RUBRIC},
+            "new": {dimension: scores[dimension] for dimension in RUBRIC},
+        }
+
+
+def read_checkpoint(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # a line cut short by an interrupted write
+    return rows
+
+
+def write_results(rows: List[Dict[str, Any]], output: Path) -> Dict[str, np.ndarray]:
+    """
+    Columns ``plan_id``, ``source``, ``rubric_version``, and ``old_<dimension>``
+    / ``new_<dimension>`` as int8, with 0 where a stored score is missing.
+    """
+    columns: Dict[str, np.ndarray] = {
+        name: np.array([row[name] for row in rows], dtype=str)
+        for name in ("plan_id", "source", "rubric_version")
+    }
+    for side in ("old", "new"):
+        for dimension in RUBRIC:
+            columns[f"{side}_{dimension}"] = np.array(
+                [int(row[side].get(dimension) or 0) for row in rows], dtype=np.int8
+            )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("wb") as handle:
+        np.savez_compressed(handle, **cast(Dict[str, Any], columns))
+    return columns
+
+
+def load_results(path: Path) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _histogram(scores: np.ndarray) -> List[int]:
+    """How many scores fell on each of 1-5."""
+    return np.bincount(scores.astype(int).clip(0, 5), minlength=6)[1:6].tolist()
+
+
+def compare(
+    columns: Dict[str, np.ndarray], baseline: Optional[Dict[str, np.ndarray]] = None
+) -> Dict[str, Any]:
+    """
+    Score distributions before and after, per dimension. "Before" is the
+    stored score, or ``baseline``'s new score for the same plan when given.
+    Plans with no before score are left out.
+    """
+    if baseline is not None:
+        before_index = {plan_id: i for i, plan_id in enumerate(baseline["plan_id"])}
+        rows = [before_index.get(plan_id) for plan_id in columns["plan_id"]]
+    report: Dict[str, Any] = {"plans": int(len(columns["plan_id"]))}
+    for dimension in RUBRIC:
+        after = columns[f"new_{dimension}"].astype(float)
+        if baseline is None:
+            before = columns[f"old_{dimension}"].astype(float)
+        else:
+            scored = baseline[f"new_{dimension}"]
+            before = np.array([0 if row is None else scored[row] for row in rows], dtype=float)
+        known = before > 0
+        before, after = before[known], after[known]
+        if not known.any():
+            report[dimension] = {"compared": 0}
+            continue
+        report[dimension] = {
+            "compared": int(known.sum()),
+            "before_mean": round(float(before.mean()), 3),
+            "after_mean": round(float(after.mean()), 3),
+            "mean_shift": round(float((after - before).mean()), 3),
+            "changed": round(float((after != before).mean()), 3),
+            "within_one": round(float((np.abs(after - before) <= 1).mean()), 3),
+            "before_histogram": _histogram(before),
+            "after_histogram": _histogram(after),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score stored plans with the current rubric")
+    parser.add_argument("--workers", type=int, default=4, help="Plans scored concurrently")
+    parser.add_argument("--max-qps", type=float, help="LLM calls per second across workers")
+    parser.add_argument("--plan-store", type=Path, help="Plan store (default PLAN_STORE_PATH)")
+    parser.add_argument(
+        "--output", type=Path, help="Results .npz (default <artifacts>/rescore/<rubric>.npz)"
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, help="Progress file (default <output>.checkpoint.jsonl)"
+    )
+    parser.add_argument("--baseline", type=Path, help="Earlier results .npz to compare against")
+    args = parser.parse_args()
+
+    config = load_config()
+    artifacts = config.observability.logs_path.parent
+    output = args.output or artifacts / "rescore" / f"{RUBRIC_VERSION}.npz"
+    checkpoint = args.checkpoint or output.with_suffix(".checkpoint.jsonl")
+    store = PlanStore(args.plan_store or config.memory.plan_store_path, write_behind=False)
+    plans = iter_plans(store, LongTermMemory(config.memory.long_term_path))
+    rescorer = Rescorer(config, workers=args.workers, max_qps=args.max_qps)
+    try:
+        counts = rescorer.run(plans, checkpoint)
+    finally:
+        rescorer.close()
+        store.close()
+    columns = write_results(read_checkpoint(checkpoint), output)
+    baseline = load_results(args.baseline) if args.baseline else None
+    report = {
+        "rubric_version": RUBRIC_VERSION,
+        "output": str(output),
+        **counts,
+        "comparison": compare(columns, baseline),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
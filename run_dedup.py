@@ -0,0 +1,156 @@
+"""
+Idempotent run deduplication for the orchestrator.
+
+Retries of the same request (matched by a fingerprint of the normalized
+inputs, or by a client-supplied idempotency key) within a configurable window
+return the stored result, and concurrent duplicates wait for the run already
+in progress instead of starting their own. A duplicate that runs out of time
+while waiting raises ``RunInProgress`` rather than starting a second run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RunInProgress(RuntimeError):
+    """A duplicate gave up waiting for the identical run still in progress."""
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    return value
+
+
+def request_fingerprint(**inputs: Any) -> str:
+    """Stable hash of run inputs, insensitive to case and whitespace."""
+    normalized = {key: _normalize(value) for key, value in sorted(inputs.items())}
+    payload = json.dumps(normalized, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    failed: bool = False
+    completed_at: Optional[float] = None
+
+
+class RunDeduplicator:
+    """
+    Single-flight cache of run results keyed by fingerprint or idempotency key.
+
+    Failed runs are never cached: waiters on a failed run retry, and one of
+    them becomes the new leader.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10_000) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def run(
+        self,
+        fingerprint: str,
+        func: Callable[[], T],
+        *,
+        idempotency_key: Optional[str] = None,
+        cacheable: Optional[Callable[[T], bool]] = None,
+        wait_timeout: Optional[float] = None,
+    ) -> Tuple[T, bool]:
+        """
+        Execute ``func`` once per key within the window.
+
+        Returns the result and whether it was served from a previous or
+        in-flight run. Results rejected by ``cacheable`` are returned to the
+        caller only; waiters retry as if the run had failed. A duplicate that
+        has waited ``wait_timeout`` seconds for the in-flight run raises
+        ``RunInProgress``.
+        """
+
+        key = f"key:{idempotency_key}" if idempotency_key else f"fp:{fingerprint}"
+        while True:
+            entry, leader = self._claim(key, fingerprint)
+            if leader:
+                break
+            if not entry.done.wait(wait_timeout):
+                raise RunInProgress(f"Run {key} is still in progress")
+            if not entry.failed:
+                with self._lock:
+                    self.hits += 1
+                return entry.result, True
+
+        try:
+            result = func()
+        except BaseException:
+            self._discard(key, entry)
+            raise
+        if cacheable is not None and not cacheable(result):
+            self._discard(key, entry)
+            return result, False
+        entry.result = result
+        entry.completed_at = time.monotonic()
+        entry.done.set()
+        return result, False
+
+    def _discard(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            entry.failed = True
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+    def _claim(self, key: str, fingerprint: str) -> Tuple[_Entry, bool]:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                del self._entries[key]  # left behind by a sweep stopped at a later finisher
+                entry = None
+            if entry is not None:
+                if entry.fingerprint != fingerprint:
+                    raise ValueError("Idempotency key was reused with different run inputs")
+                return entry, False
+            entry = _Entry(fingerprint=fingerprint)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                oldest_key, oldest = next(iter(self._entries.items()))
+                if not oldest.done.is_set():
+                    break
+                del self._entries[oldest_key]
+            return entry, True
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return entry.completed_at is not None and entry.completed_at < now - self.window_seconds
+
+    def _prune(self, now: float) -> None:
+        # Entries complete roughly in insertion order, so stop at the first
+        # fresh result rather than scanning the whole window. Stale entries
+        # behind a slow run that finished late are caught by ``_claim``.
+        stale = []
+        for key, entry in self._entries.items():
+            if entry.completed_at is None:
+                continue
+            if not self._expired(entry, now):
+                break
+            stale.append(key)
+        for key in stale:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits}
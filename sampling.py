@@ -0,0 +1,74 @@
+"""
+Head- and tail-based sampling shared by tracing and structured logging.
+
+The head decision is made once when a run's root span opens and is kept in a
+``ContextVar`` for the rest of the run. Sampled-out runs skip span events and
+info/debug log calls before any formatting, so they cost close to nothing.
+Their spans are still held until the run finishes, and tail retention keeps
+them if the run turned out slow or errored. Payloads attached to logs and span
+events are capped to ``max_payload_chars`` in sampled runs.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import random
+from typing import Any, Optional, Tuple
+
+_active: contextvars.ContextVar[Optional[Tuple["Sampler", bool]]] = contextvars.ContextVar(
+    "concierge_sampling", default=None
+)
+
+
+class Sampler:
+    def __init__(
+        self,
+        rate: float = 1.0,
+        *,
+        slow_run_ms: Optional[float] = None,
+        max_payload_chars: Optional[int] = 2_000,
+    ) -> None:
+        self.rate = rate
+        self.slow_run_ms = slow_run_ms
+        self.max_payload_chars = max_payload_chars
+
+    def head(self) -> bool:
+        return self.rate >= 1.0 or random.random() < self.rate
+
+    def keep_tail(self, duration_ms: float, errored: bool) -> bool:
+        if errored:
+            return True
+        return self.slow_run_ms is not None and duration_ms >= self.slow_run_ms
+
+    def activate(self, sampled: bool) -> contextvars.Token:
+        return _active.set((self, sampled))
+
+
+def reset(token: contextvars.Token) -> None:
+    _active.reset(token)
+
+
+def is_sampled() -> bool:
+    """Whether the current run keeps verbose telemetry (True outside runs)."""
+    active = _active.get()
+    return active is None or active[1]
+
+
+def cap_payload(value: Any) -> Any:
+    """Truncate long strings in ``value`` to the active sampler's cap."""
+    active = _active.get()
+    if active is None or not active[0].max_payload_chars:
+        return value
+    return _cap(value, active[0].max_payload_chars)
+
+
+def _cap(value: Any, limit: int) -> Any:
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return value[:limit] + f"...[{len(value) - limit} chars truncated]"
+    if isinstance(value, dict):
+        return {key: _cap(item, limit) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_cap(item, limit) for item in value]
+    return value
@@ -0,0 +1,353 @@
+"""
+HTTP service around one long-lived ``ClimateConciergeOrchestrator``.
+
+Admission control keeps overload predictable. At most ``max_in_flight``
+runs execute at once and up to ``max_queue`` more wait for a slot. Anything
+beyond that is shed immediately with ``429``. A queued request that cannot
+get a slot within ``queue_timeout_seconds`` (or before its own deadline) is
+shed with ``503``. Every request has a deadline: the ``X-Request-Timeout``
+header, capped at ``request_timeout_seconds``. The run receives it as a
+``Deadline`` and returns a partial plan when time runs out. A run that
+still has not returned at the deadline gets ``504`` and is cancelled; it
+keeps its slot until it stops, so the in-flight limit stays honest. A
+duplicate of a run still in progress that times out waiting for it gets
+``503``. Shed responses carry ``Retry-After``.
+
+Endpoints:
+- ``POST /generate``: JSON body of ``run`` arguments
+- ``GET /healthz``: the process is up
+- ``GET /readyz``: warmed up, not draining, and the queue has room
+
+::
+
+    python -m projects.climate_concierge.src.server --port 8080
+
+``prefork`` runs one service per worker process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from .config import ServerConfig, load_config
+from .deadline import Deadline
+from .observability.logger import log_event
+from .observability.metrics import LATENCY_BUCKETS
+from .orchestrator import ClimateConciergeOrchestrator
+from .run_dedup import RunInProgress
+
+RUN_DEFAULTS = {
+    "organizer": "Neighborhood Climate Team",
+    "scale": "Pilot",
+    "community_profile": "Frontline neighborhood seeking resilient infrastructure upgrades.",
+}
+RUN_FIELDS = (
+    "organizer",
+    "city",
+    "state",
+    "initiative",
+    "scale",
+    "community_profile",
+    "session_id",
+    "idempotency_key",
+)
+REQUIRED_FIELDS = ("city", "state", "initiative")
+TIMEOUT_HEADER = "X-Request-Timeout"
+_RESPONSE_MARGIN = 0.1  # share of the request budget kept for returning the result
+
+Response = Tuple[int, Dict[str, Any], Dict[str, str]]
+
+
+class AdmissionController:
+    """
+    Counting semaphore with a bounded wait queue. ``acquire`` returns
+    ``"admitted"``, ``"queue_full"`` (shed at once) or ``"timeout"`` (waited
+    ``timeout`` seconds without getting a slot).
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self._cond = threading.Condition()
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.max_in_flight and self.queued >= self.max_queue
+
+    def acquire(self, timeout: float) -> str:
+        with self._cond:
+            # Newcomers don't jump ahead of requests already waiting.
+            if self.in_flight < self.max_in_flight and self.queued == 0:
+                self.in_flight += 1
+                return "admitted"
+            if self.queued >= self.max_queue:
+                return "queue_full"
+            self.queued += 1
+            try:
+                if not self._cond.wait_for(lambda: self.in_flight < self.max_in_flight, timeout):
+                    return "timeout"
+                self.in_flight += 1
+                return "admitted"
+            finally:
+                self.queued -= 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.in_flight == 0 and self.queued == 0, timeout)
+
+
+class ConciergeService:
+    """Admission control, deadlines and readiness for one orchestrator."""
+
+    def __init__(self, orchestrator: ClimateConciergeOrchestrator, config: ServerConfig) -> None:
+        self.orchestrator = orchestrator
+        self.config = config
+        self.admission = AdmissionController(config.max_in_flight, config.max_queue)
+        self.ready = False
+        self.draining = False
+        # One thread per admitted run, so a request can time out while its run continues.
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.max_in_flight, thread_name_prefix="concierge-run"
+        )
+        metrics = orchestrator.metrics
+        self._requests = metrics.counter(
+            "http_requests_total",
+            "HTTP requests by route and status",
+            labelnames=("route", "status"),
+        )
+        self._latency = metrics.histogram(
+            "http_request_seconds",
+            "HTTP request latency in seconds",
+            LATENCY_BUCKETS,
+            labelnames=("route",),
+        )
+        self._queue_wait = metrics.histogram(
+            "admission_queue_wait_seconds", "Time requests waited for a run slot", LATENCY_BUCKETS
+        )
+        self._shed = metrics.counter(
+            "requests_shed_total", "Requests rejected by admission control", labelnames=("reason",)
+        )
+        self._in_flight = metrics.gauge("runs_in_flight", "Runs currently executing")
+        self._queued = metrics.gauge("runs_queued", "Requests waiting for a run slot")
+
+    def warmup(self) -> None:
+        self.orchestrator.warmup()
+        self.ready = True
+
+    def readiness(self) -> Tuple[bool, str]:
+        if self.draining:
+            return False, "draining"
+        if not self.ready:
+            return False, "warming up"
+        if self.admission.saturated:
+            return False, "saturated"
+        return True, "ok"
+
+    def generate(self, body: Any, timeout: Optional[float] = None) -> Response:
+        started = time.monotonic()
+        budget = self.config.request_timeout_seconds
+        if timeout is not None and 0 < timeout < budget:
+            budget = timeout
+        deadline = started + budget
+        if self.draining:
+            return self._shed_response("draining", 503)
+        if not isinstance(body, dict):
+            return 400, {"error": "body must be a JSON object"}, {}
+        missing = [name for name in REQUIRED_FIELDS if not body.get(name)]
+        if missing:
+            return 400, {"error": f"missing fields: {', '.join(missing)}"}, {}
+        kwargs = {**RUN_DEFAULTS, **{name: body[name] for name in RUN_FIELDS if name in body}}
+
+        decision = self.admission.acquire(min(self.config.queue_timeout_seconds, budget))
+        self._queue_wait.observe(time.monotonic() - started)
+        if decision == "queue_full":
+            return self._shed_response("queue_full", 429)
+        if decision == "timeout":
+            return self._shed_response("queue_timeout", 503)
+        self._update_gauges()
+        remaining = max(0.0, deadline - time.monotonic())
+        # The run stops a little early, so a partial plan can still make it back in time.
+        run_deadline = Deadline(remaining * (1 - _RESPONSE_MARGIN))
+        future = self._executor.submit(self.orchestrator.run, **kwargs, deadline=run_deadline)
+        future.add_done_callback(self._finished)
+        try:
+            result = future.result(timeout=remaining)
+        except FutureTimeout:
+            run_deadline.cancel("caller timed out")
+            log_event(
+                self.orchestrator.logger,
+                "Request deadline exceeded; cancelled the run",
+                level="warning",
+                context={"timeout_seconds": round(budget, 3), "city": kwargs["city"]},
+            )
+            return 504, {"error": "deadline exceeded", "timeout_seconds": round(budget, 3)}, {}
+        except RunInProgress:
+            return self._shed_response("run_in_progress", 503)
+        except Exception as exc:  # noqa: BLE001 - reported to the client; the orchestrator logs it
+            return 500, {"error": type(exc).__name__, "detail": str(exc)}, {}
+        body = {
+            "run_id": result.run_id,
+            "plan_store_path": str(result.plan_store_path),
+            "plan": result.plan,
+        }
+        return 200, body, {}
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Stop admitting requests and wait for in-flight runs to finish."""
+        self.draining = True
+        idle = self.admission.wait_idle(timeout)
+        self._executor.shutdown(wait=idle)
+        return idle
+
+    def close(self) -> None:
+        self.drain()
+        self.orchestrator.close()
+
+    def observe(self, route: str, status: int, elapsed: float) -> None:
+        self._requests.labels(route=route, status=str(status)).inc()
+        self._latency.labels(route=route).observe(elapsed)
+
+    def _finished(self, _future: Any) -> None:
+        self.admission.release()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        self._in_flight.set(self.admission.in_flight)
+        self._queued.set(self.admission.queued)
+
+    def _shed_response(self, reason: str, status: int) -> Response:
+        self._shed.labels(reason=reason).inc()
+        return status, {"error": reason}, {"Retry-After": str(self.config.retry_after_seconds)}
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    service: ConciergeService
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        route = self.path.split("?", 1)[0]
+        if route == "/healthz":
+            self._send(route, 200, {"status": "ok"})
+        elif route == "/readyz":
+            ready, reason = self.service.readiness()
+            self._send(route, 200 if ready else 503, {"status": reason})
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        route = self.path.split("?", 1)[0]
+        if route != "/generate":
+            self.send_error(404)
+            return
+        started = time.monotonic()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            raw_timeout = self.headers.get(TIMEOUT_HEADER)
+            timeout = float(raw_timeout) if raw_timeout else None
+        except ValueError as exc:
+            self._send(route, 400, {"error": f"invalid request: {exc}"}, started=started)
+            return
+        status, payload, headers = self.service.generate(body, timeout)
+        self._send(route, status, payload, headers, started=started)
+
+    def _send(
+        self,
+        route: str,
+        status: int,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        *,
+        started: Optional[float] = None,
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Worker-Pid", str(os.getpid()))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if started is not None:
+            self.service.observe(route, status, time.monotonic() - started)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        # Runs are logged by the orchestrator; access lines would only duplicate them.
+        return
+
+
+def build_http_server(
+    service: ConciergeService, address: Tuple[str, int], *, sock: Optional[socket.socket] = None
+) -> ThreadingHTTPServer:
+    """A threading HTTP server for ``service``; ``sock`` reuses an already-listening socket."""
+    handler = type("ServiceHandler", (_ServiceHandler,), {"service": service})
+    httpd = ThreadingHTTPServer(address, handler, bind_and_activate=sock is None)
+    if sock is not None:
+        httpd.socket.close()
+        httpd.socket = sock
+    httpd.daemon_threads = True
+    return httpd
+
+
+def serve(service: ConciergeService, httpd: ThreadingHTTPServer) -> None:
+    """Serve until SIGTERM/SIGINT, then drain in-flight runs and close the orchestrator."""
+
+    def stop(*_: Any) -> None:
+        # shutdown() waits for serve_forever(), which runs on this thread, so stop from another.
+        def drain_and_stop() -> None:
+            service.drain(service.config.drain_timeout_seconds)
+            httpd.shutdown()
+
+        threading.Thread(target=drain_and_stop, name="concierge-drain").start()
+
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, stop)
+    service.warmup()
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the Climate Concierge over HTTP")
+    parser.add_argument("--host", help="Bind address (default CONCIERGE_HOST)")
+    parser.add_argument("--port", type=int, help="Bind port (default PORT)")
+    args = parser.parse_args()
+    config = load_config()
+    host = args.host or config.server.host
+    port = args.port if args.port is not None else config.server.port
+    service = ConciergeService(ClimateConciergeOrchestrator(config), config.server)
+    httpd = build_http_server(service, (host, port))
+    log_event(
+        service.orchestrator.logger,
+        "Serving",
+        context={
+            "address": f"{host}:{port}",
+            "max_in_flight": config.server.max_in_flight,
+            "max_queue": config.server.max_queue,
+        },
+    )
+    serve(service, httpd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""
+Out-of-process session backends so sessions survive across worker processes.
+
+Two implementations share the Redis wire protocol (RESP2):
+
+* ``RedisSessionBackend`` talks to any Redis-compatible server over TCP
+  (``redis://[:password@]host:port/db``) or a Unix socket (``unix:///path``).
+* ``LocalSocketSessionBackend`` talks to ``LocalSessionServer``, a small
+  TTL-enforcing store listening on a Unix socket, for workers on one host.
+  The same server doubles as a local Redis stand-in for tests.
+
+Sessions are serialized compactly by ``encode_session`` and expire inside the
+backend (``SET ... PX``), so no worker has to sweep stale entries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import io
+import json
+import socket
+import socketserver
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from urllib.parse import urlparse
+
+from .session_memory import SessionMemory
+
+_KEY_PREFIX = "concierge:session:"
+_COMPRESS_THRESHOLD = 1024
+_CRLF = b"\r\n"
+
+
+class SessionBackendError(RuntimeError):
+    """Raised when a session backend returns an error reply."""
+
+
+def encode_session(session: SessionMemory) -> bytes:
+    """
+    Serialize a session as positional JSON, zlib-compressed when large.
+    Raises ``TypeError`` for state that JSON can't represent, rather than
+    storing a session that would read back differently.
+    """
+    try:
+        text = json.dumps(
+            [
+                session.session_id,
+                session.ttl_minutes,
+                session.created_at,
+                session.state,
+                session.conversation,
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    except (TypeError, ValueError) as exc:
+        raise TypeError(f"Session {session.session_id!r} is not JSON-serializable: {exc}") from exc
+    body = text.encode("utf-8")
+    if len(body) >= _COMPRESS_THRESHOLD:
+        return b"z" + zlib.compress(body, 6)
+    return b"j" + body
+
+
+def decode_session(blob: bytes) -> SessionMemory:
+    tag, body = blob[:1], blob[1:]
+    if tag == b"z":
+        body = zlib.decompress(body)
+    elif tag != b"j":
+        raise SessionBackendError(f"Unknown session encoding {tag!r}")
+    session_id, ttl_minutes, created_at, state, conversation = json.loads(body)
+    return SessionMemory(
+        session_id=session_id,
+        ttl_minutes=ttl_minutes,
+        created_at=created_at,
+        state=state,
+        conversation=conversation,
+    )
+
+
+class SessionBackend(ABC):
+    """Interface for shared session storage with backend-enforced TTLs."""
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[SessionMemory]:
+        """The stored session, or ``None`` when it is missing or expired."""
+
+    @abstractmethod
+    def save(self, session: SessionMemory, ttl_seconds: float) -> None:
+        """Store ``session``, replacing any previous copy, for ``ttl_seconds``."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove the session if it exists."""
+
+    def close(self) -> None:
+        """Release any open connections."""
+
+
+# --------------------------------------------------------------------------- #
+# RESP2 wire helpers
+# --------------------------------------------------------------------------- #
+
+
+def _encode_command(*args: Any) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def _read_reply(stream: io.BufferedIOBase) -> Any:
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Session backend closed the connection")
+    prefix, rest = line[:1], line[1:-2]
+    if prefix == b"+":
+        return rest.decode("utf-8")
+    if prefix == b"-":
+        raise SessionBackendError(rest.decode("utf-8"))
+    if prefix == b":":
+        return int(rest)
+    if prefix == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        count = int(rest)
+        if count < 0:
+            return None
+        return [_read_reply(stream) for _ in range(count)]
+    raise SessionBackendError(f"Unexpected reply prefix {prefix!r}")
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Minimal Redis-protocol client holding one connection per thread.
+
+    Only the handful of commands needed for sessions are used (GET, SET PX,
+    DEL), so any Redis-compatible server works, including
+    ``LocalSessionServer``.
+    """
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", *, timeout: float = 2.0) -> None:
+        parsed = urlparse(url)
+        self.url = url
+        self.timeout = timeout
+        self._unix_path = ""
+        self._address = ("127.0.0.1", 6379)
+        if parsed.scheme == "unix":
+            self._unix_path = parsed.path
+        elif parsed.scheme in {"redis", "tcp"}:
+            self._address = (parsed.hostname or "127.0.0.1", parsed.port or 6379)
+        else:
+            raise ValueError(f"Unsupported session backend URL: {url}")
+        self._password = parsed.password
+        db = (parsed.path or "/0").lstrip("/") if parsed.scheme != "unix" else ""
+        self._db = int(db) if db else 0
+        self._local = threading.local()
+
+    def load(self, session_id: str) -> Optional[SessionMemory]:
+        blob = self._command("GET", _KEY_PREFIX + session_id)
+        if blob is None:
+            return None
+        return decode_session(blob)
+
+    def save(self, session: SessionMemory, ttl_seconds: float) -> None:
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        key = _KEY_PREFIX + session.session_id
+        self._command("SET", key, encode_session(session), "PX", ttl_ms)
+
+    def delete(self, session_id: str) -> None:
+        self._command("DEL", _KEY_PREFIX + session_id)
+
+    def ping(self) -> bool:
+        return self._command("PING") == "PONG"
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn[0].close()
+            self._local.conn = None
+
+    def _command(self, *args: Any) -> Any:
+        payload = _encode_command(*args)
+        for attempt in (0, 1):
+            sock, stream = self._connection()
+            try:
+                sock.sendall(payload)
+                return _read_reply(stream)
+            except (ConnectionError, socket.timeout, OSError):
+                self.close()
+                if attempt:
+                    raise
+        return None  # pragma: no cover - loop always returns or raises
+
+    def _connection(self) -> Tuple[socket.socket, io.BufferedIOBase]:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if self._unix_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self._unix_path)
+        else:
+            sock = socket.create_connection(self._address, timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        stream = sock.makefile("rb")
+        handshake: List[Tuple[Any, ...]] = []
+        if self._password:
+            handshake.append(("AUTH", self._password))
+        if self._db:
+            handshake.append(("SELECT", self._db))
+        try:
+            for command in handshake:
+                sock.sendall(_encode_command(*command))
+                _read_reply(stream)
+        except BaseException:
+            sock.close()  # only an authenticated, selected connection is reused
+            raise
+        self._local.conn = (sock, stream)
+        return self._local.conn
+
+
+class LocalSocketSessionBackend(RedisSessionBackend):
+    """Client for a ``LocalSessionServer`` shared by workers on one host."""
+
+    def __init__(self, socket_path: Path, *, timeout: float = 2.0) -> None:
+        super().__init__(f"unix://{socket_path}", timeout=timeout)
+
+
+# --------------------------------------------------------------------------- #
+# Local TTL store speaking RESP
+# --------------------------------------------------------------------------- #
+
+
+class _ExpiringStore:
+    """Thread-safe byte store with per-key expiry tracked in a min-heap."""
+
+    def __init__(self) -> None:
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._heap: List[Tuple[float, bytes]] = []
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._data.get(key)
+            return entry[0] if entry else None
+
+    def set(self, key: bytes, value: bytes, ttl_ms: Optional[int]) -> None:
+        expires_at = time.monotonic() + ttl_ms / 1000 if ttl_ms else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            if expires_at is not None:
+                heapq.heappush(self._heap, (expires_at, key))
+            self._expire(time.monotonic())
+
+    def delete(self, *keys: bytes) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def pttl(self, key: bytes) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._data.get(key)
+            if entry is None:
+                return -2
+            if entry[1] is None:
+                return -1
+            return max(0, int((entry[1] - time.monotonic()) * 1000))
+
+    def size(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._heap.clear()
+
+    def _expire(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._data[key]
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        store: _ExpiringStore = self.server.store  # type: ignore[attr-defined]
+        while True:
+            try:
+                request = _read_reply(self.rfile)
+            except (ConnectionError, OSError):
+                return
+            if not isinstance(request, list) or not request:
+                self._write_error("ERR protocol error")
+                continue
+            name = request[0].decode("utf-8").upper()
+            args = request[1:]
+            if name == "QUIT":
+                self.wfile.write(b"+OK\r\n")
+                return
+            try:
+                self.wfile.write(self._dispatch(store, name, args))
+            except (ValueError, IndexError):
+                self._write_error(f"ERR wrong arguments for '{name.lower()}' command")
+
+    def _dispatch(self, store: _ExpiringStore, name: str, args: List[bytes]) -> bytes:
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name in {"AUTH", "SELECT"}:
+            return b"+OK\r\n"
+        if name == "GET":
+            value = store.get(args[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == "SET":
+            ttl_ms: Optional[int] = None
+            options = [arg.upper() for arg in args[2:]]
+            if b"PX" in options:
+                ttl_ms = int(args[2 + options.index(b"PX") + 1])
+            elif b"EX" in options:
+                ttl_ms = int(args[2 + options.index(b"EX") + 1]) * 1000
+            store.set(args[0], args[1], ttl_ms)
+            return b"+OK\r\n"
+        if name == "DEL":
+            return b":%d\r\n" % store.delete(*args)
+        if name == "EXISTS":
+            return b":%d\r\n" % sum(1 for key in args if store.get(key) is not None)
+        if name == "PTTL":
+            return b":%d\r\n" % store.pttl(args[0])
+        if name == "DBSIZE":
+            return b":%d\r\n" % store.size()
+        if name == "FLUSHDB":
+            store.flush()
+            return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % name.lower().encode("utf-8")
+
+    def _write_error(self, message: str) -> None:
+        self.wfile.write(b"-" + message.encode("utf-8") + _CRLF)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    store: _ExpiringStore
+
+
+class _TcpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    store: _ExpiringStore
+
+
+class LocalSessionServer:
+    """
+    Same-host session store served over a Unix socket (or loopback TCP).
+
+    Implements the subset of the Redis protocol used by the session backends,
+    with TTLs enforced server-side.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.socket_path = socket_path
+        if socket_path is not None:
+            socket_path = Path(socket_path)
+            socket_path.parent.mkdir(parents=True, exist_ok=True)
+            if socket_path.exists():
+                socket_path.unlink()
+            self._server: Union[_UnixServer, _TcpServer]
+            self._server = _UnixServer(str(socket_path), _RespHandler)
+        else:
+            self._server = _TcpServer((host, port), _RespHandler)
+        self._server.store = _ExpiringStore()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self.socket_path is not None:
+            return f"unix://{self.socket_path}"
+        host, port = cast(Tuple[str, int], self._server.server_address)[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "LocalSessionServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="session-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self.socket_path is not None and Path(self.socket_path).exists():
+            Path(self.socket_path).unlink()
+
+    def __enter__(self) -> "LocalSessionServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def build_session_backend(kind: str, url: Optional[str]) -> Optional[SessionBackend]:
+    """Factory used by the orchestrator; ``memory`` keeps sessions in-process."""
+    kind = kind.lower()
+    if kind == "memory":
+        return None
+    if kind == "redis":
+        return RedisSessionBackend(url or "redis://127.0.0.1:6379/0")
+    if kind == "socket":
+        if not url:
+            raise ValueError("SESSION_BACKEND_URL must point at the session server socket")
+        path = url[len("unix://"):] if url.startswith("unix://") else url
+        return LocalSocketSessionBackend(Path(path))
+    raise ValueError(f"Unknown session backend: {kind}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve shared Concierge sessions on this host")
+    parser.add_argument("--socket", type=Path, help="Unix socket path to listen on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+
+    server = LocalSessionServer(args.socket, host=args.host, port=args.port)
+    print(f"Serving sessions at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
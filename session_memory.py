@@ -1,12 +1,20 @@
 """
-Session memory implementation using in-memory dict with TTL.
+Session memory implementation using a bounded in-memory store with TTL.
 """
 
 from __future__ import annotations
 
+import heapq
+import sys
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..observability.metrics import MetricsRegistry
+    from .session_backends import SessionBackend
 
 
 @dataclass
@@ -17,6 +25,10 @@ class SessionMemory:
     state: Dict[str, Any] = field(default_factory=dict)
     conversation: List[Dict[str, str]] = field(default_factory=list)
 
+    @property
+    def expires_at(self) -> float:
+        return self.created_at + self.ttl_minutes * 60
+
     def is_expired(self) -> bool:
         return (time.time() - self.created_at) > self.ttl_minutes * 60
 
@@ -29,20 +41,232 @@ class SessionMemory:
     def append_conversation(self, role: str, content: str) -> None:
         self.conversation.append({"role": role, "content": content})
 
+    def approx_bytes(self) -> int:
+        """Rough in-memory footprint of the session payload."""
+        return _approx_size(self.state) + _approx_size(self.conversation)
+
+
+def _approx_size(value: Any) -> int:
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(_approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
 
 class SessionStore:
     """
-    Basic session store keyed by session ID.
+    Bounded session store keyed by session ID.
+
+    Sessions are kept in least-recently-used order and their expiry times are
+    tracked in a min-heap, so stale sessions are evicted on every access in
+    O(log n) instead of lingering until the same ID is requested again.
+    ``max_entries`` and ``max_bytes`` cap the store by evicting the
+    least-recently-used sessions first. Byte sizes are sampled whenever a
+    session is accessed.
+
+    The lock is short and never held across I/O or an await, so one store can
+    be shared by worker threads and asyncio tasks. When a shared
+    ``backend`` is configured the local store acts as a cache: sessions are
+    read through the backend on every lookup and written back by
+    ``save_session``, falling back to the local copy if the backend is down.
+
+    With ``metrics``, the store's size is exported as the
+    ``session_store_sessions`` and ``session_store_bytes`` gauges, and
+    lookups and evictions as ``session_lookups_total{result}`` and
+    ``session_evictions_total{reason}`` (``expired`` or ``capacity``).
     """
 
-    def __init__(self, ttl_minutes: int) -> None:
+    def __init__(
+        self,
+        ttl_minutes: int,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        backend: Optional["SessionBackend"] = None,
+        metrics: Optional["MetricsRegistry"] = None,
+    ) -> None:
         self.ttl_minutes = ttl_minutes
-        self._sessions: Dict[str, SessionMemory] = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired_evictions": 0,
+            "capacity_evictions": 0,
+            "backend_errors": 0,
+        }
+        self._metrics = metrics
+        if metrics is not None:
+            self._sessions_gauge = metrics.gauge(
+                "session_store_sessions", "Sessions held by the session store"
+            )
+            self._bytes_gauge = metrics.gauge(
+                "session_store_bytes", "Approximate bytes held by the session store"
+            )
+            self._lookups = metrics.counter(
+                "session_lookups_total", "Session store lookups", labelnames=("result",)
+            )
+            self._evictions = metrics.counter(
+                "session_evictions_total", "Sessions evicted from the store", labelnames=("reason",)
+            )
 
     def get_session(self, session_id: str) -> SessionMemory:
-        session = self._sessions.get(session_id)
-        if session is None or session.is_expired():
-            session = SessionMemory(session_id=session_id, ttl_minutes=self.ttl_minutes)
-            self._sessions[session_id] = session
-        return session
+        if self.backend is not None:
+            shared = self._load_shared(session_id)
+            if shared is not None:
+                with self._lock:
+                    self._install(shared)
+        with self._lock:
+            self._evict_expired(time.time())
+            session = self._sessions.get(session_id)
+            if session is None or session.is_expired():
+                self._count("misses")
+                if session is not None:
+                    self._remove(session_id)
+                    self._count("expired_evictions")
+                session = SessionMemory(session_id=session_id, ttl_minutes=self.ttl_minutes)
+            else:
+                self._count("hits")
+            self._put(session)
+            self._publish()
+            return session
+
+    def save_session(self, session: SessionMemory) -> None:
+        """Refresh accounting for ``session`` and write it to the shared backend."""
+        with self._lock:
+            if self._sessions.get(session.session_id) is session:
+                self._resize(session.session_id, session)
+                self._enforce_caps(keep=session.session_id)
+                self._publish()
+        if self.backend is None:
+            return
+        ttl_seconds = session.expires_at - time.time()
+        if ttl_seconds <= 0:
+            return
+        try:
+            self.backend.save(session, ttl_seconds)
+        except TypeError:
+            raise  # unencodable state is a caller bug, not a backend outage
+        except Exception:  # noqa: BLE001 - sessions degrade to worker-local
+            with self._lock:
+                self._stats["backend_errors"] += 1
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._remove(session_id)
+            self._publish()
+        if self.backend is not None:
+            try:
+                self.backend.delete(session_id)
+            except Exception:  # noqa: BLE001
+                with self._lock:
+                    self._stats["backend_errors"] += 1
+
+    def evict_expired(self) -> int:
+        """Drop every expired session; returns the number evicted."""
+        with self._lock:
+            evicted = self._evict_expired(time.time())
+            self._publish()
+            return evicted
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._total_bytes,
+                "heap_entries": len(self._expiry_heap),
+                **self._stats,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def _load_shared(self, session_id: str) -> Optional[SessionMemory]:
+        try:
+            return self.backend.load(session_id)  # type: ignore[union-attr]
+        except Exception:  # noqa: BLE001
+            with self._lock:
+                self._stats["backend_errors"] += 1
+            return None
+
+    def _install(self, session: SessionMemory) -> None:
+        if not session.is_expired():
+            self._put(session)
+
+    def _put(self, session: SessionMemory) -> None:
+        """Insert or refresh ``session`` as most recently used, with size and caps."""
+        session_id = session.session_id
+        previous = self._sessions.get(session_id)
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        if previous is None or previous.expires_at != session.expires_at:
+            heapq.heappush(self._expiry_heap, (session.expires_at, session_id))
+        self._resize(session_id, session)
+        self._enforce_caps(keep=session_id)
+
+    def _count(self, stat: str) -> None:
+        self._stats[stat] += 1
+        if self._metrics is None:
+            return
+        if stat in ("hits", "misses"):
+            self._lookups.labels(result="hit" if stat == "hits" else "miss").inc()
+        elif stat.endswith("_evictions"):
+            self._evictions.labels(reason=stat[: -len("_evictions")]).inc()
+
+    def _publish(self) -> None:
+        if self._metrics is not None:
+            self._sessions_gauge.set(len(self._sessions))
+            self._bytes_gauge.set(self._total_bytes)
+
+    def _evict_expired(self, now: float) -> int:
+        evicted = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, session_id = heapq.heappop(heap)
+            session = self._sessions.get(session_id)
+            # Entries for replaced or already-evicted sessions are skipped lazily.
+            if session is None or session.expires_at != expires_at:
+                continue
+            self._remove(session_id)
+            self._count("expired_evictions")
+            evicted += 1
+        if len(heap) > 2 * len(self._sessions) + 64:
+            self._expiry_heap = [(s.expires_at, sid) for sid, s in self._sessions.items()]
+            heapq.heapify(self._expiry_heap)
+        return evicted
+
+    def _enforce_caps(self, keep: str) -> None:
+        while self._over_capacity() and len(self._sessions) > 1:
+            oldest = next(iter(self._sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self._count("capacity_evictions")
+
+    def _over_capacity(self) -> bool:
+        if self.max_entries is not None and len(self._sessions) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._total_bytes > self.max_bytes
+
+    def _resize(self, session_id: str, session: SessionMemory) -> None:
+        size = session.approx_bytes()
+        self._total_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
 
+    def _remove(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._total_bytes -= self._sizes.pop(session_id, 0)
@@ -0,0 +1,192 @@
+"""
+Seeded generator for civic emissions datasets and grant catalogs at scale.
+
+The output uses the same schema as ``data/city_emissions_sample.csv`` and
+``data/grants_catalog_sample.json``, so the tools load it unchanged. The
+sample cities are always included, so orchestrator runs for them still hit
+data. Presets run from ``small`` to ``large``, and ``large`` is 10k cities,
+1M rows and 500k grants::
+
+    python -m projects.climate_concierge.benchmarks.synthetic_data --size large --out /tmp/civic
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    cities: int
+    rows: int
+    grants: int
+
+
+PRESETS: Dict[str, DatasetSize] = {
+    "small": DatasetSize(cities=100, rows=10_000, grants=5_000),
+    "medium": DatasetSize(cities=1_000, rows=100_000, grants=50_000),
+    "large": DatasetSize(cities=10_000, rows=1_000_000, grants=500_000),
+}
+
+STATES = (
+    "AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO "
+    "MT NE NV NH NJ NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY"
+).split()
+SAMPLE_CITIES = [
+    ("Oakland", "CA"),
+    ("San Francisco", "CA"),
+    ("San Jose", "CA"),
+    ("Fresno", "CA"),
+    ("Austin", "TX"),
+    ("Denver", "CO"),
+    ("Boston", "MA"),
+]
+_PREFIXES = (
+    "Oak River Cedar Maple Pine Spring Fair Green Lake Hill Brook Clear Red Silver Stone "
+    "Elm Ash Willow Bay North"
+).split()
+_SUFFIXES = (
+    "land ton ville field port wood dale view ford burg side haven crest mont bridge"
+).split()
+
+# (sector, metric, unit, mean, standard deviation)
+METRICS: List[Tuple[str, str, str, float, float]] = [
+    ("electricity", "per_capita_emissions", "metric_tons", 3.0, 1.0),
+    ("transportation", "per_capita_emissions", "metric_tons", 4.5, 1.2),
+    ("buildings", "per_capita_emissions", "metric_tons", 2.2, 0.6),
+    ("waste", "per_capita_emissions", "metric_tons", 0.6, 0.2),
+    ("buildings", "electricity_mix_percentage", "renewables_pct", 35.0, 15.0),
+    ("buildings", "energy_burden", "percent_income", 5.0, 2.0),
+    ("transportation", "transit_mode_share", "percent_trips", 12.0, 8.0),
+    ("land_use", "tree_canopy_cover", "percent_area", 20.0, 8.0),
+]
+
+GRANT_TAGS = [
+    "solar", "renewables", "community", "cooling", "tree canopy", "climate resilience",
+    "transportation", "EV", "equity", "energy efficiency", "weatherization", "water",
+    "workforce", "storage", "microgrid", "heat pumps", "composting", "flooding",
+]
+SPONSORS = [
+    "Department of Energy", "EPA", "Green Cities Alliance", "State Energy Office",
+    "Community Foundation", "Climate Justice Fund", "Regional Transit Authority",
+]
+_GRANT_KINDS = ["Microgrant", "Fund", "Challenge", "Accelerator", "Program", "Initiative"]
+
+
+def city_names(count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """``count`` unique (city, state) pairs, sample cities first."""
+    rng = random.Random(seed)
+    names = [f"{prefix}{suffix}" for prefix in _PREFIXES for suffix in _SUFFIXES]
+    pairs = list(SAMPLE_CITIES[:count])
+    index = 0
+    while len(pairs) < count:
+        name = names[index % len(names)]
+        state = STATES[(index // len(names)) % len(STATES)]
+        round_ = index // (len(names) * len(STATES))
+        pairs.append((f"{name} {round_ + 1}" if round_ else name, state))
+        index += 1
+    head, tail = pairs[: len(SAMPLE_CITIES)], pairs[len(SAMPLE_CITIES):]
+    rng.shuffle(tail)
+    return head + tail
+
+
+def civic_frame(cities: int, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Rows grouped by city; each city cycles through metrics, then years back from 2024."""
+    rng = np.random.default_rng(seed)
+    pairs = city_names(cities, seed)
+    per_city = -(-rows // cities)
+    index = np.arange(rows)
+    city_index = index // per_city
+    within = index % per_city
+    metric_index = within % len(METRICS)
+    means = np.array([m[3] for m in METRICS])[metric_index]
+    stds = np.array([m[4] for m in METRICS])[metric_index]
+    values = np.clip(means + stds * rng.standard_normal(rows), 0.0, None).round(1)
+    return pd.DataFrame(
+        {
+            "city": np.array([city for city, _ in pairs], dtype=object)[city_index],
+            "state": np.array([state for _, state in pairs], dtype=object)[city_index],
+            "sector": np.array([m[0] for m in METRICS], dtype=object)[metric_index],
+            "metric": np.array([m[1] for m in METRICS], dtype=object)[metric_index],
+            "unit": np.array([m[2] for m in METRICS], dtype=object)[metric_index],
+            "value": values,
+            "year": 2024 - within // len(METRICS),
+        }
+    )
+
+
+def grant_catalog(count: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    grants = []
+    for i in range(count):
+        tags = rng.sample(GRANT_TAGS, rng.randint(2, 4))
+        if rng.random() < 0.2:
+            geography = ["US"]
+        else:
+            geography = [f"US-{state}" for state in rng.sample(STATES, rng.randint(1, 5))]
+        grants.append(
+            {
+                "id": f"grant-{i + 1:06d}",
+                "title": f"{tags[0].title()} {rng.choice(_GRANT_KINDS)} {i + 1}",
+                "sponsor": rng.choice(SPONSORS),
+                "amount": int(round(rng.lognormvariate(10.5, 0.6) / 500) * 500),
+                "geography": geography,
+                "deadline": (start + timedelta(days=rng.randrange(730))).isoformat(),
+                "tags": tags,
+                "match_requirement": rng.choice([0.0, 0.05, 0.1, 0.2, 0.25]),
+                "summary": f"Supports community-led {tags[0]} and {tags[1]} projects.",
+            }
+        )
+    return grants
+
+
+def generate(out_dir: Path, size: DatasetSize, seed: int = 0) -> Tuple[Path, Path]:
+    """
+    Write ``civic.csv`` and ``grants.json`` into ``out_dir``. Files from an
+    earlier call with the same size and seed are reused.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    civic_path = out_dir / "civic.csv"
+    grants_path = out_dir / "grants.json"
+    manifest_path = out_dir / "manifest.json"
+    manifest = {"cities": size.cities, "rows": size.rows, "grants": size.grants, "seed": seed}
+    if manifest_path.exists() and civic_path.exists() and grants_path.exists():
+        if json.loads(manifest_path.read_text(encoding="utf-8")) == manifest:
+            return civic_path, grants_path
+    civic_frame(size.cities, size.rows, seed).to_csv(civic_path, index=False)
+    grants_path.write_text(json.dumps(grant_catalog(size.grants, seed)), encoding="utf-8")
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    return civic_path, grants_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic civic data and grant catalogs")
+    parser.add_argument("--size", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--cities", type=int, help="Override the preset's city count")
+    parser.add_argument("--rows", type=int, help="Override the preset's civic row count")
+    parser.add_argument("--grants", type=int, help="Override the preset's grant count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args()
+    preset = PRESETS[args.size]
+    size = DatasetSize(
+        cities=args.cities or preset.cities,
+        rows=args.rows or preset.rows,
+        grants=args.grants or preset.grants,
+    )
+    civic_path, grants_path = generate(args.out, size, args.seed)
+    print(f"Wrote {civic_path} and {grants_path}")
+
+
+if __name__ == "__main__":
+    main()
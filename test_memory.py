@@ -0,0 +1,253 @@
+import gzip
+import json
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from projects.climate_concierge.src.memory import LongTermMemory, SessionMemory, SessionStore
+from projects.climate_concierge.src.memory.plan_store import PlanStore
+from projects.climate_concierge.src.memory.policy_cache import PolicySummaryCache
+from projects.climate_concierge.src.memory.session_backends import (
+    LocalSessionServer,
+    LocalSocketSessionBackend,
+    RedisSessionBackend,
+    SessionBackend,
+    SessionBackendError,
+    decode_session,
+    encode_session,
+)
+from projects.climate_concierge.src.observability.metrics import MetricsRegistry
+
+
+def test_session_store_evicts_least_recently_used():
+    store = SessionStore(ttl_minutes=60, max_entries=2)
+    store.get_session("a")
+    store.get_session("b")
+    store.get_session("a")
+    store.get_session("c")
+    assert "a" in store and "c" in store
+    assert "b" not in store
+    assert store.stats()["capacity_evictions"] == 1
+
+
+def test_session_store_exports_size_and_eviction_metrics(tmp_path):
+    registry = MetricsRegistry(tmp_path / "metrics.prom")
+    store = SessionStore(ttl_minutes=60, max_entries=2, metrics=registry)
+    for session_id in ("a", "b", "a", "c"):
+        store.get_session(session_id)
+    assert registry.gauges["session_store_sessions"].value == 2
+    assert registry.gauges["session_store_bytes"].value == store.stats()["bytes"]
+    assert registry.counters["session_evictions_total"].samples() == {("capacity",): 1}
+    assert registry.counters["session_lookups_total"].samples() == {("miss",): 3, ("hit",): 1}
+
+
+def test_session_store_proactively_drops_expired_sessions():
+    store = SessionStore(ttl_minutes=0)
+    store.get_session("stale")
+    time.sleep(0.01)
+    store.get_session("fresh")
+    assert "stale" not in store
+    assert store.stats()["expired_evictions"] >= 1
+
+
+def test_session_store_respects_byte_budget():
+    store = SessionStore(ttl_minutes=60, max_bytes=1_000)
+    first = store.get_session("big")
+    first.append_conversation("organizer", "x" * 2_000)
+    store.get_session("big")
+    store.get_session("small")
+    assert "big" not in store
+    assert store.stats()["bytes"] <= 1_000
+
+
+def test_session_round_trips_through_shared_backend(tmp_path):
+    with LocalSessionServer(tmp_path / "sessions.sock") as server:
+        local_backend = LocalSocketSessionBackend(tmp_path / "sessions.sock")
+        worker_a = SessionStore(ttl_minutes=60, backend=local_backend)
+        worker_b = SessionStore(ttl_minutes=60, backend=RedisSessionBackend(server.url))
+
+        session = worker_a.get_session("shared")
+        session.set("organizer_summary", "Solar on the community center " * 100)
+        session.append_conversation("organizer", "hello")
+        worker_a.save_session(session)
+
+        restored = worker_b.get_session("shared")
+        assert restored.get("organizer_summary") == session.get("organizer_summary")
+        assert restored.conversation == session.conversation
+        assert worker_b.stats()["bytes"] == session.approx_bytes()
+
+
+def test_shared_backend_enforces_ttl():
+    with LocalSessionServer() as server:
+        backend = RedisSessionBackend(server.url)
+        session = SessionMemory(session_id="short")
+        backend.save(session, ttl_seconds=0.05)
+        assert backend.load("short") is not None
+        time.sleep(0.1)
+        assert backend.load("short") is None
+        assert decode_session(encode_session(session)).session_id == "short"
+
+
+def test_unencodable_session_state_is_rejected():
+    store = SessionStore(ttl_minutes=60, backend=RedisSessionBackend("redis://127.0.0.1:1/0"))
+    session = store.get_session("odd")
+    session.set("seen", {"Fresno"})
+    with pytest.raises(TypeError, match="odd"):
+        encode_session(session)
+    with pytest.raises(TypeError):
+        store.save_session(session)
+
+
+def test_session_backend_requires_the_full_interface():
+    class LoadOnly(SessionBackend):
+        def load(self, session_id):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        LoadOnly()
+
+
+def test_rejected_handshake_does_not_cache_the_connection():
+    accepted = []
+
+    class _RejectAuth(socketserver.StreamRequestHandler):
+        def handle(self):
+            accepted.append(1)
+            while self.rfile.readline():
+                self.wfile.write(b"-ERR invalid password\r\n")
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RejectAuth)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        backend = RedisSessionBackend(f"redis://:wrong@127.0.0.1:{server.server_address[1]}/0")
+        for _ in range(2):
+            with pytest.raises(SessionBackendError):
+                backend.ping()
+        assert len(accepted) == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _plan(city, initiative, score=4.0):
+    persona = {"city": city, "state": "CA", "initiative": initiative}
+    return {"persona": persona, "average_score": score, "plan_text": f"{initiative} in {city}"}
+
+
+def test_plan_store_indexes_queries_and_exports(tmp_path):
+    store = PlanStore(tmp_path / "plans.db")
+    store.put("run-1", _plan("Fresno", "Solarize the library"), created_at=1_000.0)
+    store.put("run-2", _plan("Fresno", "Plant street trees"), created_at=2_000.0)
+    store.put("run-3", _plan("Oakland", "Community solar"), created_at=3_000.0)
+    # queued or committed
+    assert store.get("run-2")["persona"]["initiative"] == "Plant street trees"
+
+    assert [entry["run_id"] for entry in store.query(city="fresno")] == ["run-2", "run-1"]
+    assert [entry["run_id"] for entry in store.query(category="solar", since=1_500.0)] == ["run-3"]
+    assert [entry["run_id"] for entry in store.query(until=2_000.0)] == ["run-1"]
+    assert store.pending == 0
+
+    exported = tmp_path / "export.jsonl.gz"
+    assert store.export(exported, category="solar") == 2
+    with gzip.open(exported, "rt", encoding="utf-8") as handle:
+        rows = [json.loads(line) for line in handle]
+    assert rows[0]["plan"] == _plan("Oakland", "Community solar")
+    store.close()
+
+    legacy = tmp_path / "plans"
+    legacy.mkdir()
+    (legacy / "run-1.json").write_text(json.dumps(_plan("Fresno", "changed")), encoding="utf-8")
+    old_plan = json.dumps(_plan("San Jose", "E-bike library"))
+    (legacy / "run-old.json").write_text(old_plan, encoding="utf-8")
+    reopened = PlanStore(tmp_path / "plans.db", write_behind=False)
+    assert reopened.import_files(legacy) == 1, "runs already stored are kept"
+    assert reopened.get("run-1")["persona"]["initiative"] == "Solarize the library"
+    assert [entry["category"] for entry in reopened.query(city="San Jose")] == ["mobility"]
+    assert len(reopened) == 4
+    reopened.close()
+
+
+def test_plan_store_writer_survives_failures_and_rejects_late_puts(tmp_path, monkeypatch):
+    store = PlanStore(tmp_path / "plans.db")
+
+    def broken_write(rows):
+        raise ValueError("plan is not storable")
+
+    monkeypatch.setattr(store, "_write", broken_write)
+    store.put("run-1", _plan("Fresno", "Solarize the library"))
+    store.flush()
+    assert store.failed == 1 and store.pending == 0
+    store.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        store.put("run-2", _plan("Fresno", "Plant street trees"))
+
+
+def test_plan_store_commits_every_put_accepted_before_close(tmp_path):
+    store = PlanStore(tmp_path / "plans.db", queue_size=2)  # puts block on the full queue
+    accepted = []
+
+    def producer(worker):
+        for index in range(100):
+            try:
+                store.put(f"run-{worker}-{index}", _plan("Fresno", "Solarize the library"))
+            except RuntimeError:
+                return
+            accepted.append(f"run-{worker}-{index}")
+
+    threads = [threading.Thread(target=producer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    store.close()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+    reopened = PlanStore(tmp_path / "plans.db", write_behind=False)
+    assert accepted and len(reopened) == len(accepted)
+    reopened.close()
+
+
+def test_policy_cache_reload_keeps_unsaved_entries(tmp_path):
+    path = tmp_path / "policy_summaries.json"
+    server = PolicySummaryCache(path, reload_interval=0)
+    server.put("v1", "Oakland", "CA", "unsaved summary")
+    warmup = PolicySummaryCache(path)
+    warmup.put("v1", "Fresno", "CA", "warmed summary")
+    warmup.save()
+
+    assert server.get("v1", "fresno", "ca") == "warmed summary"
+    assert server.get("v1", "Oakland", "CA") == "unsaved summary"
+    throttled = PolicySummaryCache(path, reload_interval=60)
+    warmup.put("v1", "San Jose", "CA", "later summary")
+    warmup.save()
+    # The file is re-checked at most once a minute.
+    assert throttled.get("v1", "San Jose", "CA") is None
+
+
+def test_long_term_memory_keeps_concurrent_appends(tmp_path):
+    memory = LongTermMemory(tmp_path / "memory.json")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: memory.append_to_list("evaluations", {"run": i}), range(200)))
+    stored = LongTermMemory(tmp_path / "memory.json").list("evaluations")
+    assert sorted(item["run"] for item in stored) == list(range(200))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["memory.json", "memory.json.lock"]
+
+
+def test_long_term_memory_merges_writes_from_other_processes(tmp_path):
+    # Two instances on one path stand in for pre-fork workers.
+    first = LongTermMemory(tmp_path / "memory.json")
+    second = LongTermMemory(tmp_path / "memory.json")
+    first.append_to_list("evaluations", {"run": "a"})
+    second.append_to_list("evaluations", {"run": "b"})
+    second.set("plan_library", {"items": [{"run_id": "b"}]})
+    first.append_to_list("evaluations", {"run": "c"})
+
+    stored = LongTermMemory(tmp_path / "memory.json")
+    assert [item["run"] for item in stored.list("evaluations")] == ["a", "b", "c"]
+    assert stored.get("plan_library") == {"items": [{"run_id": "b"}]}
+    assert first.get("plan_library") == stored.get("plan_library")
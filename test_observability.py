@@ -0,0 +1,172 @@
+import gc
+import json
+import threading
+import urllib.request
+
+from projects.climate_concierge.src.observability.logger import (
+    get_logger,
+    log_event,
+    logging_stats,
+    stop_async_logging,
+)
+from projects.climate_concierge.src.observability.metrics import MetricsRegistry
+from projects.climate_concierge.src.observability.metrics_server import MetricsServer
+from projects.climate_concierge.src.observability.profiling import (
+    RunProfiler,
+    diff_profiles,
+    load_stats,
+)
+from projects.climate_concierge.src.observability.sampling import Sampler, is_sampled
+from projects.climate_concierge.src.observability.tracer import TraceRecorder
+
+
+def test_counter_merges_thread_shards_without_losing_increments(tmp_path):
+    registry = MetricsRegistry(tmp_path / "metrics.prom")
+    counter = registry.counter("runs_total", "Runs", labelnames=("agent",))
+
+    def work():
+        bound = counter.labels(agent="planner")
+        for _ in range(10_000):
+            bound.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.samples() == {("planner",): 80_000}
+    assert 'runs_total{agent="planner"} 80000' in registry.render()
+
+
+def test_counter_folds_exited_threads_into_retired_total(tmp_path):
+    registry = MetricsRegistry(tmp_path / "metrics.prom")
+    counter = registry.counter("requests_total", "Requests")
+
+    for _ in range(200):
+        thread = threading.Thread(target=counter.inc)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert counter.value == 200
+    assert len(counter._shards) <= 1
+
+
+def test_histogram_buckets_are_inclusive_and_track_sum(tmp_path):
+    registry = MetricsRegistry(tmp_path / "metrics.prom")
+    hist = registry.histogram("latency_seconds", "Latency", buckets=(1.0, 0.1, 0.5))
+    for value in (0.1, 0.3, 2.0):
+        hist.observe(value)
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="0.5"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_sum 2.4" in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_metrics_server_renders_on_scrape(tmp_path):
+    registry = MetricsRegistry(tmp_path / "metrics.prom")
+    registry.counter("plans_total", "Plans").inc(3)
+    server = MetricsServer(registry, port=0).start()
+    try:
+        host, port = server.address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.stop()
+    assert "plans_total 3" in body
+
+
+def test_tracer_nests_spans_and_exports_otlp_json(tmp_path):
+    tracer = TraceRecorder(tmp_path / "traces.jsonl", buffer_size=16)
+    with tracer.span("concierge.run", kind="run") as run_span:
+        with tracer.span("action-planner", kind="agent") as agent_span:
+            tracer.record("action-planner", "Composing implementation plan")
+    assert agent_span.parent_span_id == run_span.span_id
+    assert agent_span.trace_id == run_span.trace_id
+
+    assert tracer.flush() == 2
+    batch = json.loads((tmp_path / "traces.jsonl").read_text(encoding="utf-8"))
+    spans = batch["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    agent = next(span for span in spans if span["name"] == "action-planner")
+    assert agent["parentSpanId"] == run_span.span_id
+    assert int(agent["endTimeUnixNano"]) >= int(agent["startTimeUnixNano"])
+    assert agent["events"][0]["name"] == "Composing implementation plan"
+
+
+def test_tracer_ring_buffer_drops_oldest_when_full(tmp_path):
+    tracer = TraceRecorder(tmp_path / "traces.jsonl", buffer_size=2)
+    for index in range(5):
+        with tracer.span(f"span-{index}"):
+            pass
+    assert tracer.dropped == 3
+    assert tracer.flush() == 2
+
+
+def test_sampled_out_runs_are_dropped_unless_they_error(tmp_path):
+    tracer = TraceRecorder(tmp_path / "traces.jsonl", sampler=Sampler(0.0, slow_run_ms=None))
+    with tracer.span("concierge.run", kind="run"):
+        assert not is_sampled()
+        tracer.record("community-liaison", "Collecting organizer intent", {"state": "x" * 10})
+        with tracer.span("community-liaison"):
+            pass
+    assert tracer.flush() == 0
+    assert tracer.sampled_out == 1
+
+    try:
+        with tracer.span("concierge.run", kind="run"):
+            with tracer.span("action-planner"):
+                raise RuntimeError("LLM stalled")
+    except RuntimeError:
+        pass
+    assert tracer.flush() == 2
+    assert tracer.tail_kept == 1
+
+
+def test_sampler_caps_payloads_in_sampled_runs(tmp_path):
+    tracer = TraceRecorder(tmp_path / "traces.jsonl", sampler=Sampler(1.0, max_payload_chars=8))
+    with tracer.span("concierge.run", kind="run") as span:
+        tracer.record("community-liaison", "intake", {"notes": "frontline neighborhood"})
+    assert span.events[0]["attributes"]["notes"].startswith("frontlin...")
+
+
+def test_async_logger_writes_json_off_thread(tmp_path):
+    log_path = tmp_path / "async.log"
+    logger = get_logger("async-test", log_path, enable_console=False, async_mode=True)
+    context = {"run_id": "abc"}
+    log_event(logger, "Starting concierge run", context=context)
+    context["run_id"] = "changed after logging"
+    stop_async_logging()
+
+    record = json.loads(log_path.read_text(encoding="utf-8").splitlines()[0])
+    assert record["message"] == "Starting concierge run"
+    assert record["context"] == {"run_id": "abc"}
+    assert record["level"] == "INFO"
+    assert logging_stats()[f"async-test:{log_path}"] == {"queued": 1, "dropped": 0}
+
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+
+def test_run_profiler_writes_artifacts_and_diffs(tmp_path):
+    runs = {}
+    for name, n in (("base", 1_000), ("head", 200_000)):
+        profiler = RunProfiler(tmp_path / name, top_n=5)
+        with profiler.section("policy-researcher"):
+            _busy(n)
+            blob = [str(i) for i in range(5_000)]
+        runs[name] = profiler.close()
+        del blob
+
+    allocations = json.loads((tmp_path / "head" / "allocations.json").read_text())
+    assert allocations["policy-researcher"]["peak_traced_bytes"] > 0
+    assert len(allocations["policy-researcher"]["top"]) <= 5
+    assert runs["head"]["sections"]["policy-researcher"]["pstats"].endswith(".pstats")
+
+    deltas = diff_profiles(load_stats(tmp_path / "base"), load_stats(tmp_path / "head"))
+    assert any("_busy" in item.function or "<genexpr>" in item.function for item in deltas[:3])
+    assert deltas[0].delta > 0
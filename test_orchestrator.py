@@ -1,7 +1,37 @@
+import json
 import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from projects.climate_concierge.src.config import load_config
+import pytest
+
+from projects.climate_concierge.src.config import ServerConfig, load_config
+from projects.climate_concierge.src.evaluation.prescorer import MEMORY_KEY, PreScorer
+from projects.climate_concierge.src.evaluation.rescore import (
+    Rescorer,
+    compare,
+    iter_plans,
+    load_results,
+    read_checkpoint,
+    write_results,
+)
+from projects.climate_concierge.src.memory import LongTermMemory
+from projects.climate_concierge.src.memory.plan_store import PlanStore
+from projects.climate_concierge.src.fake_llm import FakeGenerativeModel
+from projects.climate_concierge.src.llm_batcher import MicroBatcher
+from projects.climate_concierge.src.observability.token_usage import TokenBudgetExceeded, TokenUsage
 from projects.climate_concierge.src.orchestrator import ClimateConciergeOrchestrator
+from projects.climate_concierge.src.policy_warmup import warm_policy_cache
+from projects.climate_concierge.src.prefork import PreforkServer
+from projects.climate_concierge.src.run_dedup import RunDeduplicator, RunInProgress
+from projects.climate_concierge.src.server import AdmissionController, ConciergeService
 
 
 def test_orchestrator_stub_run(monkeypatch, tmp_path):
@@ -14,6 +44,8 @@ def test_orchestrator_stub_run(monkeypatch, tmp_path):
     monkeypatch.setattr(config.observability, "metrics_path", tmp_path / "metrics.prom")
     monkeypatch.setattr(config.observability, "traces_path", tmp_path / "traces.jsonl")
     monkeypatch.setattr(config.memory, "long_term_path", tmp_path / "memory.json")
+    monkeypatch.setattr(config.memory, "policy_cache_path", tmp_path / "policy_summaries.json")
+    monkeypatch.setattr(config.memory, "plan_store_path", tmp_path / "plans.db")
 
     orchestrator = ClimateConciergeOrchestrator(config)
     result = orchestrator.run(
@@ -28,5 +60,524 @@ def test_orchestrator_stub_run(monkeypatch, tmp_path):
     assert result.plan["impact"]["co2_reduction_tonnes"] > 0
     assert result.plan["grants"], "Expected at least one grant"
     assert result.plan["average_score"] >= 0
-    assert result.artifact_path.exists()
+    assert result.plan_store_path.exists()
+    with pytest.deprecated_call():
+        assert result.artifact_path == result.plan_store_path
+
+
+def _stub_orchestrator(monkeypatch, tmp_path, **memory_overrides):
+    monkeypatch.setenv("ALLOW_STUB_LLM", "true")
+    monkeypatch.setenv("GEMINI_API_KEY", "")
+    config = load_config()
+    monkeypatch.setattr(config.observability, "logs_path", tmp_path / "logs")
+    monkeypatch.setattr(config.observability, "metrics_path", tmp_path / "metrics.prom")
+    monkeypatch.setattr(config.observability, "traces_path", tmp_path / "traces.jsonl")
+    monkeypatch.setattr(config.memory, "long_term_path", tmp_path / "memory.json")
+    monkeypatch.setattr(config.memory, "policy_cache_path", tmp_path / "policy_summaries.json")
+    monkeypatch.setattr(config.memory, "plan_store_path", tmp_path / "plans.db")
+    for key, value in memory_overrides.items():
+        monkeypatch.setattr(config.memory, key, value)
+    return ClimateConciergeOrchestrator(config)
+
+
+RUN_KWARGS = dict(
+    organizer="Test Org",
+    city="Oakland",
+    state="CA",
+    initiative="Solarize the community center roof",
+    scale="Pilot",
+    community_profile="Frontline neighborhood with high energy burden.",
+)
+
+
+def test_orchestrator_reuses_similar_prior_plan(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path, plan_reuse=True)
+    first = orchestrator.run(**RUN_KWARGS)
+    assert "plan_reuse" not in first.plan
+    assert first.plan["scored_by"] == "stub"
+
+    calls = []
+    original = orchestrator.llm_client.generate
+    monkeypatch.setattr(
+        orchestrator.llm_client,
+        "generate",
+        lambda prompt, *, agent: calls.append(agent) or original(prompt, agent=agent),
+    )
+    second = orchestrator.run(**{**RUN_KWARGS, "organizer": "Another Org"})
+
+    assert second.plan["plan_reuse"]["source_run_id"] == first.run_id
+    assert second.plan["plan_text"] == first.plan["plan_text"]
+    assert calls == []
+    assert second.plan["scored_by"] == "reuse"
+    sources = [entry["source"] for entry in orchestrator.long_term_memory.list("evaluations")]
+    assert sources == ["stub", "reuse"]
+    assert orchestrator.metrics.gauges["plan_reuse_rate"].value == 0.5
+
+
+def test_orchestrator_deduplicates_retried_runs(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=300.0)
+    first = orchestrator.run(**RUN_KWARGS)
+    retry = orchestrator.run(**{**RUN_KWARGS, "city": "  oakland "})
+    assert retry is first
+
+    keyed = orchestrator.run(**{**RUN_KWARGS, "scale": "Large"}, idempotency_key="abc")
+    assert orchestrator.run(**{**RUN_KWARGS, "scale": "Large"}, idempotency_key="abc") is keyed
+    assert len(orchestrator.plan_store) == 2
+
+
+def test_run_dedup_expires_results_behind_a_late_finisher():
+    dedup = RunDeduplicator(window_seconds=0.5)
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        release.wait()
+        return "slow"
+
+    def fast():
+        calls.append("fast")
+        return "fast"
+
+    leader = threading.Thread(target=dedup.run, args=("slow", slow))
+    leader.start()
+    time.sleep(0.05)  # the slow run is claimed first
+    assert dedup.run("fast", fast) == ("fast", False)
+    time.sleep(0.3)
+    release.set()  # the slow run now finishes long after the fast one
+    leader.join()
+    time.sleep(0.3)
+    stale = dedup.run("fast", fast)
+    assert stale == ("fast", False), "a result older than the window is not served"
+    assert calls == ["fast", "fast"]
+
+    # A duplicate stops waiting for an in-flight run at its own deadline without running it.
+    release.clear()
+    leader = threading.Thread(target=dedup.run, args=("in-flight", slow))
+    leader.start()
+    time.sleep(0.05)
+    with pytest.raises(RunInProgress):
+        dedup.run("in-flight", fast, wait_timeout=0.05)
+    release.set()
+    leader.join()
+    assert calls == ["fast", "fast"]
+
+
+def test_replan_recomputes_only_changed_dependents(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path)
+    first = orchestrator.run(**RUN_KWARGS, session_id="session-1")
+
+    updated = orchestrator.replan("session-1", scale="Large")
+
+    # The stub planner returns the same text, so comms stays cached; evaluation also
+    # reads the impact.
+    recomputed = ["community-liaison", "action-planner", "plan-evaluator"]
+    assert updated.plan["recomputed_agents"] == recomputed
+    assert updated.plan["grants"] == first.plan["grants"]
+    first_co2 = first.plan["impact"]["co2_reduction_tonnes"]
+    assert updated.plan["impact"]["co2_reduction_tonnes"] > first_co2
+
+
+def test_orchestrator_records_per_agent_and_llm_latency(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path)
+    orchestrator.run(**RUN_KWARGS)
+
+    agent_latency = orchestrator.metrics.histograms["agent_run_seconds"].samples()
+    assert ("action-planner", "ok") in agent_latency
+    llm_calls = orchestrator.metrics.counters["llm_calls_total"].samples()
+    assert llm_calls[("plan-evaluator", "stub", "stub")] == 1
+    assert ("civic-data", "city_profile", "ok") in orchestrator.metrics.histograms[
+        "tool_call_seconds"
+    ].samples()
+
+
+def test_orchestrator_profiles_requested_runs(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path)
+    result = orchestrator.run(**RUN_KWARGS, profile=True)
+    monkeypatch.setattr(orchestrator.config.observability, "profile_sample_rate", 1.0)
+    unprofiled = orchestrator.run(**dict(RUN_KWARGS, organizer="Other Org"), profile=False)
+    orchestrator.close()
+
+    profile = result.plan["profile"]
+    assert Path(profile["pstats"]).exists()
+    assert Path(profile["allocations"]).exists()
+    assert set(profile["sections"]) >= {"policy-researcher", "plan-evaluator"}
+    traces = (tmp_path / "traces.jsonl").read_text(encoding="utf-8")
+    assert "profile.pstats" in traces and "profile.dir" in traces
+    assert "profile" not in unprofiled.plan, "profile=False overrides the sample rate"
+
+
+def test_orchestrator_accounts_tokens_and_enforces_budget(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=0)
+    usage = orchestrator.run(**RUN_KWARGS).plan["token_usage"]
+    assert set(usage["by_agent"]) == {
+        "policy-researcher",
+        "funding-scout",
+        "action-planner",
+        "communications-coach",
+        "plan-evaluator",
+    }
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["output_tokens"] > 0
+    assert usage["estimated"] and usage["cost_usd"] > 0
+    assert orchestrator.metrics.counters["llm_tokens_total"].value == usage["total_tokens"]
+
+    monkeypatch.setattr(orchestrator.config.model, "run_token_budget", 1)
+    degraded = orchestrator.run(**RUN_KWARGS).plan
+    assert degraded["token_usage"]["budget_exceeded"]
+    assert degraded["token_usage"]["degraded_calls"] == 5
+    assert degraded["token_usage"]["total_tokens"] == 0
+    assert degraded["average_score"] > 0
+
+    monkeypatch.setattr(orchestrator.config.model, "token_budget_policy", "abort")
+    calls_before = orchestrator.metrics.counters["llm_calls_total"].samples()
+    with pytest.raises(TokenBudgetExceeded):
+        orchestrator.run(**RUN_KWARGS)
+    calls = orchestrator.metrics.counters["llm_calls_total"].samples()
+    new_calls = {key: calls[key] - calls_before.get(key, 0) for key in calls}
+    assert new_calls[("policy-researcher", "stub", "budget")] == 1
+    assert sum(count for key, count in new_calls.items() if key[2] == "ok") == 0
+
+
+def test_llm_cassette_records_then_replays_offline(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=0).config
+    monkeypatch.setattr(config.model, "cassette_mode", "record")
+    monkeypatch.setattr(config.model, "cassette_path", tmp_path / "llm.jsonl.gz")
+    recorder = ClimateConciergeOrchestrator(config)
+    recorded = recorder.run(**RUN_KWARGS)
+    recorder.close()
+    assert config.model.cassette_path.exists()
+
+    monkeypatch.setattr(config, "allow_stub_llm", False)
+    monkeypatch.setattr(config.model, "cassette_mode", "replay")
+    monkeypatch.setattr(config.model, "cassette_latency", "distribution")
+    replayer = ClimateConciergeOrchestrator(config)
+    monkeypatch.setattr(replayer.llm_client, "_stub_response", None)  # must not be reached
+    replayed = replayer.run(**RUN_KWARGS)
+
+    assert replayed.plan["plan_text"] == recorded.plan["plan_text"]
+    assert replayed.plan["scores"] == recorded.plan["scores"]
+    assert replayer.llm_client.cassette.hits == 5
+    recorded_tokens = recorded.plan["token_usage"]["total_tokens"]
+    assert replayed.plan["token_usage"]["total_tokens"] == recorded_tokens
+
+
+def test_orchestrator_runs_against_throttling_fake_llm(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path).config
+    backend = FakeGenerativeModel(median_ms=1, sigma=0.1, max_qps=2, seed=7)
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+    result = orchestrator.run(**RUN_KWARGS)
+
+    assert backend.calls == 5 and backend.throttled == 3
+    outcomes = [key[2] for key in orchestrator.metrics.counters["llm_calls_total"].samples()]
+    assert sorted(outcomes) == ["fallback"] * 3 + ["ok"] * 2
+    assert result.plan["token_usage"]["by_agent"]["policy-researcher"]["estimated"] is False
+
+
+def test_orchestrator_import_is_lazy_and_side_effect_free(monkeypatch, tmp_path):
+    root = Path(__file__).resolve().parents[3]
+    probe = (
+        "import sys, projects.climate_concierge.src.orchestrator; "
+        "print(sorted(m for m in ('pandas', 'numpy', 'google.generativeai') if m in sys.modules))"
+    )
+    artifacts = root / "projects" / "climate_concierge" / "run_artifacts"
+    existed = artifacts.exists()
+    out = subprocess.run(
+        [sys.executable, "-c", probe], cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == "[]"
+    assert artifacts.exists() == existed
+
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path)
+    assert orchestrator.civic_tool._df is None
+    timings = orchestrator.warmup()
+    assert set(timings) == {"civic_data", "grant_catalog", "llm_client"}
+    assert orchestrator.civic_tool._df is not None
+
+
+def test_prefork_workers_serve_generate_from_shared_state(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path).config
+    server = PreforkServer(config, workers=2, host="127.0.0.1", port=0).start()
+    try:
+        assert len(server.worker_pids) == 2
+        assert server.shared.civic_tool._df is not None  # loaded once, in the master
+        url = "http://%s:%s/generate" % server.address
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(RUN_KWARGS).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            body = json.loads(response.read())
+            assert int(response.headers["X-Worker-Pid"]) in server.worker_pids
+        assert body["plan"]["grants"]
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(urllib.request.Request(url, data=b"{}"), timeout=30)
+        assert excinfo.value.code == 400
+    finally:
+        server.stop()
+    assert server.worker_pids == []
+    assert (tmp_path / "logs" / "worker0" / "concierge.log").exists()
+
+
+def test_admission_controller_sheds_beyond_queue_and_times_out():
+    admission = AdmissionController(max_in_flight=1, max_queue=1)
+    assert admission.acquire(timeout=1) == "admitted"
+    assert admission.acquire(timeout=0.01) == "timeout"
+    assert AdmissionController(max_in_flight=0, max_queue=0).acquire(timeout=1) == "queue_full"
+    admission.release()
+    assert admission.acquire(timeout=0.01) == "admitted"
+
+
+class _StalledModel:
+    """A backend that ignores request timeouts, like a hung connection."""
+
+    model_name = "stalled"
+
+    def generate_content(self, prompt, **_):
+        time.sleep(0.3)
+        raise RuntimeError("stalled")
+
+
+def test_service_enforces_deadlines_and_sheds_load(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path).config
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=_StalledModel())
+    service = ConciergeService(orchestrator, ServerConfig(max_in_flight=1, max_queue=0))
+    assert service.readiness() == (False, "warming up")
+    service.warmup()
+    assert service.readiness() == (True, "ok")
+
+    status, payload, _ = service.generate(RUN_KWARGS, timeout=0.1)
+    assert status == 504 and payload["error"] == "deadline exceeded"
+    # The cancelled run still holds the only slot until its stalled call returns.
+    status, _, headers = service.generate(RUN_KWARGS)
+    assert status == 429 and headers["Retry-After"] == "2"
+
+    assert service.drain(timeout=30)
+    assert service.generate(RUN_KWARGS)[0] == 503
+    assert service.readiness() == (False, "draining")
+    shed = orchestrator.metrics.counters["requests_shed_total"].samples()
+    assert shed == {("queue_full",): 1, ("draining",): 1}
+    skipped = orchestrator.metrics.counters["agents_skipped_total"].samples()
+    assert ("plan-evaluator", "caller timed out") in skipped
+    orchestrator.close()
+
+
+def test_service_answers_503_while_duplicate_run_is_in_progress(monkeypatch, tmp_path):
+    orchestrator = _stub_orchestrator(monkeypatch, tmp_path)
+    service = ConciergeService(orchestrator, ServerConfig())
+
+    def in_progress(**_):
+        raise RunInProgress("Run fp:abc is still in progress")
+
+    monkeypatch.setattr(orchestrator, "run", in_progress)
+    status, payload, headers = service.generate(RUN_KWARGS)
+    assert status == 503 and payload == {"error": "run_in_progress"}
+    assert headers["Retry-After"] == "2"
+    service.close()
+
+
+def test_run_deadline_degrades_and_skips_agents(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path).config
+    backend = FakeGenerativeModel(median_ms=200, sigma=0.01, seed=3)
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+
+    result = orchestrator.run(**RUN_KWARGS, timeout=0.5)
+    partial = result.plan["partial"]
+    assert partial["reason"] == "deadline"
+    assert partial["degraded_agents"] == ["action-planner"]
+    assert partial["skipped_agents"] == ["communications-coach", "plan-evaluator"]
+    assert result.plan["funding_summary"] and "outreach_copy" not in result.plan
+    assert backend.calls == 3
+    outcomes = [key[2] for key in orchestrator.metrics.counters["llm_calls_total"].samples()]
+    assert "deadline" in outcomes
+    # Partial plans are not served to retries; this one runs in full.
+    assert "partial" not in orchestrator.run(**RUN_KWARGS).plan
+
+
+def test_agents_use_their_generation_profiles(monkeypatch, tmp_path):
+    monkeypatch.setenv(
+        "GEMINI_AGENT_PROFILES", json.dumps({"action-planner": {"max_output_tokens": 64}})
+    )
+    config = _stub_orchestrator(monkeypatch, tmp_path).config
+    assert config.model.profile_for("action-planner").max_output_tokens == 64
+    assert config.model.profile_for("plan-evaluator").temperature == 0.0
+    assert config.model.profile_for("communications-coach") == config.model.profile_for("")
+
+    seen = []
+
+    class RecordingModel(FakeGenerativeModel):
+        def generate_content(self, prompt, *, generation_config=None, **kwargs):
+            seen.append(generation_config)
+            return super().generate_content(prompt, generation_config=generation_config, **kwargs)
+
+    backend = RecordingModel(median_ms=1, sigma=0.1, output_tokens=400, seed=0)
+    result = ClimateConciergeOrchestrator(config, llm_backend=backend).run(**RUN_KWARGS)
+
+    assert [cfg["max_output_tokens"] for cfg in seen] == [512, 512, 64, 2048, 256]
+    assert seen[-1]["temperature"] == 0.0
+    by_agent = result.plan["token_usage"]["by_agent"]
+    assert by_agent["action-planner"]["output_tokens"] <= 64
+    assert by_agent["communications-coach"]["output_tokens"] > 64
+
+
+def test_evaluator_prompts_are_micro_batched_across_runs(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_BATCH_AGENTS", "plan-evaluator")
+    monkeypatch.setenv("LLM_BATCH_WINDOW_MS", "5000")
+    monkeypatch.setenv("LLM_BATCH_MAX_ITEMS", "4")
+    config = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=0).config
+
+    class DropsSecondItem(FakeGenerativeModel):
+        def _respond(self, prompt, max_tokens=None):
+            text = super()._respond(prompt, max_tokens)
+            if prompt.startswith("You will answer"):
+                answers = json.loads(text)
+                answers["2"] = "not json"
+                text = "```json\n" + json.dumps(answers) + "\n```"
+            return text
+
+    backend = DropsSecondItem(median_ms=1, sigma=0.1, seed=0)
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+    requests = [dict(RUN_KWARGS, organizer=f"Org {index}") for index in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda kwargs: orchestrator.run(**kwargs), requests))
+
+    # Four unbatched agents per run, one batch of four evaluations, one per-item fallback.
+    assert backend.calls == 4 * 4 + 1 + 1
+    items = orchestrator.metrics.counters["llm_batch_items_total"].samples()
+    assert items == {("plan-evaluator", "answered"): 3, ("plan-evaluator", "fallback"): 1}
+    for result in results:
+        assert result.plan["scores"]["comments"].startswith("Coordinate")
+        assert result.plan["token_usage"]["by_agent"]["plan-evaluator"]["output_tokens"] > 0
+
+
+def test_micro_batch_followers_stop_waiting_at_their_timeout():
+    release = threading.Event()
+
+    def send(key, prompt, count, timeout):
+        release.wait(5)
+        return json.dumps({"1": "first answer", "2": "second answer"}), TokenUsage(10, 10)
+
+    batcher = MicroBatcher(send, window_seconds=5, max_items=2)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(batcher.submit, "key", "first")
+        time.sleep(0.05)
+        started = time.monotonic()
+        assert batcher.submit("key", "second", timeout=0.2) is None, "falls back to its own call"
+        assert time.monotonic() - started < 1
+        release.set()
+        assert leader.result()[0] == "first answer"
+
+
+def test_prescorer_skips_llm_evaluation_when_confident(monkeypatch, tmp_path):
+    monkeypatch.setenv("EVAL_PRESCORE", "true")
+    monkeypatch.setenv("EVAL_PRESCORE_AUDIT_RATE", "0")
+    config = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=0).config
+    backend = FakeGenerativeModel(median_ms=1, sigma=0.1, seed=0)
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+    assert orchestrator.run(**RUN_KWARGS).plan["scored_by"] == "llm"
+
+    # Calibrate on a history where the LLM's impact score tracks the CO2 estimate.
+    features = orchestrator.long_term_memory.list("evaluations")[-1]["features"]
+    rng = random.Random(0)
+    history = []
+    for _ in range(40):
+        varied = dict(features, co2_tonnes_log=features["co2_tonnes_log"] + rng.uniform(-1, 1))
+        impact = 1 + varied["co2_tonnes_log"]
+        scores = {"feasibility": 4, "equity": 5, "impact": impact, "readiness": 3}
+        history.append({"features": varied, "scores": scores, "source": "llm"})
+    scorer = PreScorer.calibrate(history)
+    assert scorer.samples == 40 and scorer.rmse["impact"] < 0.1
+    orchestrator.long_term_memory.set(MEMORY_KEY, scorer.to_dict())
+
+    calls = backend.calls
+    result = orchestrator.run(**dict(RUN_KWARGS, organizer="Second Org"))
+    assert backend.calls == calls + 4, "the evaluator should not call the LLM"
+    assert result.plan["scored_by"] == "prescorer"
+    scores = result.plan["scores"]
+    assert (scores["feasibility"], scores["equity"], scores["readiness"]) == (4, 5, 3)
+    assert scores["impact"] == round(1 + features["co2_tonnes_log"])
+    assert orchestrator.long_term_memory.list("evaluations")[-1]["source"] == "prescorer"
+
+    monkeypatch.setattr(config.evaluation, "prescore_max_error", 0.0)
+    assert orchestrator.run(**dict(RUN_KWARGS, organizer="Third Org")).plan["scored_by"] == "llm"
+    decisions = orchestrator.metrics.counters["evaluator_prescore_total"].samples()
+    assert decisions == {("uncalibrated",): 1, ("skipped",): 1, ("low_confidence",): 1}
+    agreement = orchestrator.metrics.counters["evaluator_prescore_agreement_total"].samples()
+    assert sum(agreement.values()) == 1 and all(key[0] == "false" for key in agreement)
+
+
+def test_rescore_checkpoints_and_compares_rubric_versions(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=0).config
+    backend = FakeGenerativeModel(median_ms=1, seed=0)
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+    for index in range(3):
+        orchestrator.run(**dict(RUN_KWARGS, organizer=f"Org {index}"))
+    orchestrator.close()
+    memory = LongTermMemory(config.memory.long_term_path)
+    memory.append_to_list("evaluations", {"plan_text": "Memory-only plan", "scores": {"impact": 2}})
+    checkpoint, output = tmp_path / "rescore.checkpoint.jsonl", tmp_path / "rescore.npz"
+
+    def rescore(backend):
+        rescorer = Rescorer(config, workers=2, max_qps=200, llm_backend=backend)
+        try:
+            plans = iter_plans(PlanStore(config.memory.plan_store_path), memory)
+            return rescorer.run(plans, checkpoint)
+        finally:
+            rescorer.close()
+
+    # Each run's own evaluation is covered by its stored plan; the extra entry is memory-only.
+    failing = FakeGenerativeModel(median_ms=1, error_rate=1.0)
+    assert rescore(failing) == dict(scored=0, resumed=0, failed=4)
+    assert rescore(FakeGenerativeModel(median_ms=1, seed=1)) == dict(scored=4, resumed=0, failed=0)
+    assert rescore(FakeGenerativeModel(median_ms=1, seed=2)) == dict(scored=0, resumed=4, failed=0)
+    stored = LongTermMemory(config.memory.long_term_path).list("evaluations")
+    assert len(stored) == 4, "re-scoring must not add evaluations"
+
+    columns = write_results(read_checkpoint(checkpoint), output)
+    loaded = load_results(output)
+    assert sorted(loaded["source"].tolist()) == ["memory", "store", "store", "store"]
+    assert loaded["new_impact"].dtype.name == "int8" and set(loaded["new_impact"]) <= {3, 4, 5}
+    report = compare(columns)
+    assert report["plans"] == 4 and report["impact"]["compared"] == 4
+    assert report["equity"]["compared"] == 3  # the memory-only plan had no stored equity score
+    assert sum(report["impact"]["after_histogram"]) == 4
+    against_itself = compare(columns, loaded)
+    assert against_itself["feasibility"]["changed"] == 0.0
+
+
+def test_policy_warmup_precomputes_city_summaries(monkeypatch, tmp_path):
+    config = _stub_orchestrator(monkeypatch, tmp_path, run_dedup_window_seconds=0).config
+    prompts = []
+
+    class RecordingModel(FakeGenerativeModel):
+        def generate_content(self, prompt, **kwargs):
+            prompts.append(prompt)
+            return super().generate_content(prompt, **kwargs)
+
+    stub_only = ClimateConciergeOrchestrator(config)
+    cities = len(list(stub_only.civic_tool.city_profiles()))
+    assert warm_policy_cache(stub_only)["failed"] == cities, "stub text is never cached"
+    assert len(stub_only.policy_cache) == 0
+    stub_only.close()
+
+    backend = RecordingModel(median_ms=1, seed=0)
+    orchestrator = ClimateConciergeOrchestrator(config, llm_backend=backend)
+    report = warm_policy_cache(orchestrator, concurrency=2)
+    assert report["generated"] == cities > 1 and report["failed"] == 0
+    assert all("Community notes" not in prompt for prompt in prompts)
+    assert warm_policy_cache(orchestrator, concurrency=2)["cached"] == cities
+
+    prompts.clear()
+    plan = orchestrator.run(**RUN_KWARGS).plan
+    policy_prompt = prompts[0]
+    assert "Community notes" in policy_prompt and "per capita emissions" not in policy_prompt
+    assert "Community considerations" in plan["policy_summary"]
+    assert plan["civic_profile"]["metrics"], "the agent still returns the city's metrics"
 
+    # A new dataset version misses and falls back to the full prompt.
+    monkeypatch.setattr(orchestrator.civic_tool, "_version", "other")
+    prompts.clear()
+    orchestrator.run(**dict(RUN_KWARGS, organizer="Other Org"))
+    assert "per capita emissions" in prompts[0] and "Community notes" in prompts[0]
+    lookups = orchestrator.metrics.counters["policy_summary_cache_total"].samples()
+    assert lookups == {("hit",): 1, ("miss",): 1}
+    orchestrator.close()
@@ -26,3 +26,19 @@ def test_impact_simulator_scale_adjustment():
     large = tool.estimate("solar rooftop", "large")
     assert large["co2_reduction_tonnes"] > small["co2_reduction_tonnes"]
 
+
+def test_synthetic_data_loads_into_tools_and_is_seeded(tmp_path):
+    from projects.climate_concierge.benchmarks.synthetic_data import (
+        DatasetSize,
+        civic_frame,
+        generate,
+    )
+
+    size = DatasetSize(cities=20, rows=400, grants=50)
+    civic_path, grants_path = generate(tmp_path, size, seed=3)
+    civic = CivicDataTool(civic_path)
+    assert len(civic.df) == 400
+    assert civic.city_profile("Oakland", "CA")["metrics"]
+    grants = GrantFinderTool(grants_path)
+    assert len(grants.grants) == 50
+    assert civic_frame(20, 400, seed=3).equals(civic_frame(20, 400, seed=3))
@@ -0,0 +1,173 @@
+"""
+Token and cost accounting for LLM calls.
+
+``LLMClient`` records each call's prompt and output token counts into the
+``UsageLedger`` of the run that is active in the current context. Counts are
+read from Gemini's ``usage_metadata``. In stub mode, or when the metadata is
+missing, they are estimated locally. The ledger prices calls and aggregates
+them per agent, and it enforces an optional per-run token budget.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+
+_active: contextvars.ContextVar[Optional["UsageLedger"]] = contextvars.ContextVar(
+    "concierge_usage_ledger", default=None
+)
+
+
+class TokenBudgetExceeded(RuntimeError):
+    """Raised when a run with the ``abort`` policy runs out of token budget."""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate a SentencePiece token count without a tokenizer. A word costs
+    one token per four characters, and each symbol costs one token.
+    """
+    return sum((match.end() - match.start() + 3) // 4 for match in _TOKEN_PIECES.finditer(text))
+
+
+def usage_cost(usage: "TokenUsage", input_per_million: float, output_per_million: float) -> float:
+    """USD cost of ``usage`` at the given per-million-token prices."""
+    prompt_cost = usage.prompt_tokens * input_per_million
+    return (prompt_cost + usage.output_tokens * output_per_million) / 1e6
+
+
+@dataclass
+class TokenUsage:
+    prompt_tokens: int
+    output_tokens: int
+    estimated: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    @classmethod
+    def estimate(cls, prompt: str, output: str) -> "TokenUsage":
+        return cls(estimate_tokens(prompt), estimate_tokens(output), estimated=True)
+
+    @classmethod
+    def from_response(cls, response: Any, prompt: str, output: str) -> "TokenUsage":
+        """Read Gemini ``usage_metadata``, estimating whatever it lacks."""
+        metadata = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(metadata, "prompt_token_count", None)
+        output_tokens = getattr(metadata, "candidates_token_count", None)
+        if prompt_tokens is None or output_tokens is None:
+            estimate = cls.estimate(prompt, output)
+            return cls(
+                prompt_tokens if prompt_tokens is not None else estimate.prompt_tokens,
+                output_tokens if output_tokens is not None else estimate.output_tokens,
+                estimated=True,
+            )
+        return cls(int(prompt_tokens), int(output_tokens))
+
+
+class UsageLedger:
+    """
+    Per-run token and cost totals, broken down by agent.
+
+    When ``budget`` is set, ``allows`` refuses calls once the run has spent
+    its budget or the next prompt would exceed it. Under the ``degrade``
+    policy the caller serves a stub response. Under ``abort`` it raises
+    ``TokenBudgetExceeded``.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget: Optional[int] = None,
+        policy: str = "degrade",
+        input_cost_per_million: float = 0.0,
+        output_cost_per_million: float = 0.0,
+    ) -> None:
+        if policy not in {"degrade", "abort"}:
+            raise ValueError(f"Unknown token budget policy: {policy}")
+        self.budget = budget
+        self.policy = policy
+        self.input_cost_per_million = input_cost_per_million
+        self.output_cost_per_million = output_cost_per_million
+        self.budget_exceeded = False
+        self.degraded_calls = 0
+        self._agents: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def total_tokens(self) -> int:
+        with self._lock:
+            return sum(a["prompt_tokens"] + a["output_tokens"] for a in self._agents.values())
+
+    def allows(self, prompt: str, *, agent: str) -> bool:
+        if self.budget is None:
+            return True
+        if self.total_tokens + estimate_tokens(prompt) <= self.budget:
+            return True
+        self.budget_exceeded = True
+        if self.policy == "abort":
+            raise TokenBudgetExceeded(
+                f"Run token budget of {self.budget} exhausted before {agent} could call the LLM"
+            )
+        with self._lock:
+            self.degraded_calls += 1
+        return False
+
+    def record(self, agent: str, usage: TokenUsage) -> float:
+        """Add a call to the ledger and return its cost in USD."""
+        cost = usage_cost(usage, self.input_cost_per_million, self.output_cost_per_million)
+        with self._lock:
+            entry = self._agents.setdefault(
+                agent,
+                {
+                    "calls": 0,
+                    "prompt_tokens": 0,
+                    "output_tokens": 0,
+                    "cost_usd": 0.0,
+                    "estimated": False,
+                },
+            )
+            entry["calls"] += 1
+            entry["prompt_tokens"] += usage.prompt_tokens
+            entry["output_tokens"] += usage.output_tokens
+            entry["cost_usd"] += cost
+            entry["estimated"] = entry["estimated"] or usage.estimated
+        return cost
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            by_agent = {
+                agent: {**entry, "cost_usd": round(entry["cost_usd"], 6)}
+                for agent, entry in self._agents.items()
+            }
+        prompt_tokens = sum(entry["prompt_tokens"] for entry in by_agent.values())
+        output_tokens = sum(entry["output_tokens"] for entry in by_agent.values())
+        return {
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens,
+            "cost_usd": round(sum(entry["cost_usd"] for entry in by_agent.values()), 6),
+            "estimated": any(entry["estimated"] for entry in by_agent.values()),
+            "budget": self.budget,
+            "budget_exceeded": self.budget_exceeded,
+            "degraded_calls": self.degraded_calls,
+            "by_agent": by_agent,
+        }
+
+
+def activate(ledger: UsageLedger) -> contextvars.Token:
+    return _active.set(ledger)
+
+
+def reset(token: contextvars.Token) -> None:
+    _active.reset(token)
+
+
+def current_ledger() -> Optional[UsageLedger]:
+    return _active.get()
@@ -1,45 +1,274 @@
 """
-Simple trace recorder for agent transitions.
+Span-based trace recorder for runs, agents, tools and LLM calls.
+
+Spans carry trace/span IDs, parent links and start/end times. The active span
+lives in a ``contextvars.ContextVar`` so nesting follows asyncio tasks
+automatically; use ``bind_context`` to carry it into worker threads. Finished
+spans go into a bounded ring buffer that a background thread drains to
+``sink_path`` as OTLP/JSON ``resourceSpans`` batches, one per line.
+
+With a ``Sampler`` the root span makes the head sampling decision; spans of
+sampled-out runs are held per trace and exported only if tail retention keeps
+the run (slow or errored).
 """
 
 from __future__ import annotations
 
+import contextvars
 import json
+import random
+import threading
 import time
-from dataclasses import dataclass, asdict
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from . import sampling
+from .sampling import Sampler
+
+T = TypeVar("T")
+
+# OTLP span kinds: INTERNAL for pipeline steps, CLIENT for outbound calls.
+_SPAN_KINDS = {"run": 1, "agent": 1, "tool": 1, "llm": 3}
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "concierge_current_span", default=None
+)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
 
 
 @dataclass
-class TraceEvent:
-    timestamp: float
-    agent: str
-    event: str
-    detail: Dict[str, Any]
+class _TraceBatch:
+    head_sampled: bool
+    errored: bool = False
+    pending: List["Span"] = field(default_factory=list)
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    batch: Optional[_TraceBatch] = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        event = {"name": name, "time_ns": time.time_ns(), "attributes": attributes or {}}
+        self.events.append(event)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _SPAN_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes({"concierge.span_kind": self.kind, **self.attributes}),
+            "events": [
+                {
+                    "timeUnixNano": str(event["time_ns"]),
+                    "name": event["name"],
+                    "attributes": _otlp_attributes(event["attributes"]),
+                }
+                for event in self.events
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            payload["parentSpanId"] = self.parent_span_id
+        return payload
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, ensure_ascii=False, default=str)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def bind_context(func: Callable[..., T]) -> Callable[..., T]:
+    """Capture the caller's trace context for ``func`` run on another thread."""
+    ctx = contextvars.copy_context()
+
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        return ctx.run(func, *args, **kwargs)
+
+    return wrapper
 
 
 class TraceRecorder:
-    def __init__(self, sink_path: Path) -> None:
+    def __init__(
+        self,
+        sink_path: Path,
+        *,
+        buffer_size: int = 10_000,
+        export_interval_seconds: float = 0.0,
+        service_name: str = "climate-concierge",
+        sampler: Optional[Sampler] = None,
+    ) -> None:
         self.sink_path = sink_path
-        self.events: List[TraceEvent] = []
-
-    def record(self, agent: str, event: str, detail: Optional[Dict[str, Any]] = None) -> None:
-        self.events.append(
-            TraceEvent(
-                timestamp=time.time(),
-                agent=agent,
-                event=event,
-                detail=detail or {},
+        self.service_name = service_name
+        self.sampler = sampler
+        self.dropped = 0
+        self.sampled_out = 0
+        self.tail_kept = 0
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._exporter: Optional[threading.Thread] = None
+        if export_interval_seconds > 0:
+            self._exporter = threading.Thread(
+                target=self._export_loop,
+                args=(export_interval_seconds,),
+                name="trace-exporter",
+                daemon=True,
             )
+            self._exporter.start()
+
+    @contextmanager
+    def span(self, name: str, kind: str = "agent", **attributes: Any) -> Iterator[Span]:
+        """Open a child of the current span (or a new trace) for the block."""
+        parent = _current_span.get()
+        batch = parent.batch if parent else None
+        sampling_token = None
+        if parent is None and self.sampler is not None:
+            head_sampled = self.sampler.head()
+            batch = _TraceBatch(head_sampled=head_sampled)
+            sampling_token = self.sampler.activate(head_sampled)
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id if parent else _new_id(128),
+            span_id=_new_id(64),
+            parent_span_id=parent.span_id if parent else None,
+            attributes=attributes,
+            batch=batch,
         )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _current_span.reset(token)
+            if sampling_token is not None:
+                sampling.reset(sampling_token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def record(self, agent: str, event: str, detail: Optional[Dict[str, Any]] = None) -> None:
+        """Attach a point-in-time event to the current span."""
+        if not sampling.is_sampled():
+            return
+        span = _current_span.get()
+        if span is not None:
+            span.add_event(event, sampling.cap_payload({"agent": agent, **(detail or {})}))
+            return
+        with self.span(agent, kind="agent") as orphan:
+            orphan.add_event(event, detail)
+
+    def flush(self) -> int:
+        """Drain buffered spans to ``sink_path``; returns the number written."""
+        spans: List[Span] = []
+        while True:
+            try:
+                spans.append(self._buffer.popleft())
+            except IndexError:
+                break
+        if not spans:
+            return 0
+        batch = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "climate_concierge.tracer"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(batch, ensure_ascii=False, default=str) + "\n"
+        with self._write_lock:
+            self.sink_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.sink_path.open("a", encoding="utf-8") as fp:
+                fp.write(line)
+        return len(spans)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._exporter is not None:
+            self._exporter.join(timeout=5)
+            self._exporter = None
+        self.flush()
+
+    def _finish(self, span: Span) -> None:
+        batch = span.batch
+        if batch is None or batch.head_sampled:
+            self._enqueue(span)
+            return
+        batch.pending.append(span)
+        if span.error:
+            batch.errored = True
+        if span.parent_span_id is not None:
+            return
+        # The root span closes the trace: apply tail retention.
+        if self.sampler is not None and self.sampler.keep_tail(span.duration_ms, batch.errored):
+            self.tail_kept += 1
+            for pending in batch.pending:
+                self._enqueue(pending)
+        else:
+            self.sampled_out += 1
+        batch.pending = []
 
-    def flush(self) -> None:
-        self.sink_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.sink_path.open("a", encoding="utf-8") as fp:
-            for event in self.events:
-                payload = asdict(event)
-                payload["timestamp_iso"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(event.timestamp))
-                fp.write(json.dumps(payload, ensure_ascii=False) + "\n")
-        self.events.clear()
+    def _enqueue(self, span: Span) -> None:
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(span)
 
+    def _export_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except OSError:  # pragma: no cover - keep exporting after disk hiccups
+                continue